@@ -0,0 +1,320 @@
+"""
+Read-only JSON API over HTTP for parents and the mobile app.
+
+One asyncio event loop serves every connection (HTTP/1.1 keep-alive),
+so a read costs a cached lookup in the services layer rather than a
+Streamlit script rerun. Routes (GET only):
+
+    /api/health                      no login needed
+    /api/me                          the logged-in user's profile
+    /api/timetable?student=<name>    same data as "View Time Table"
+    /api/attendance?student=<name>   same data as "View My Attendance"
+    /api/assessments?student=<name>  same data as "View My Assessment"
+    /api/users?role=&stage=&search=  admins only: the "Manage Users" filters
+
+Requests log in with HTTP Basic auth using their app username and
+password (users.json or the SQLite users table). Students only see
+themselves and may leave out ?student=; teachers see their own students,
+admins everyone.
+
+Every response carries an ETag built from the version of the store it
+was read from; a request whose If-None-Match still matches gets an
+empty 304 without the body being rebuilt.
+
+Run from the app folder (stdlib only):
+    python -m api.server --port 8600
+"""
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import os
+import threading
+import traceback
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from services.accounts import authenticate, filter_users, profile
+from services.assessment import get_assessments, student_assessments
+from services.attendance import get_attendance, student_attendance
+from services.schedule import get_timetable, student_timetable
+from storage import versions
+from storage.user_store import load_users, students_of
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024  # GET bodies are read and thrown away, so keep them small
+IDLE_SECONDS = 30  # keep-alive connections are closed after this long without a request
+
+STATUS_TEXT = {
+    200: "OK", 304: "Not Modified", 400: "Bad Request", 401: "Unauthorized",
+    403: "Forbidden", 404: "Not Found", 405: "Method Not Allowed", 431: "Request Header Fields Too Large",
+    500: "Internal Server Error",
+}
+
+# (username, password digest) -> (full name, role), all checked against one
+# users version. Checking a password needs the user store, so each login is
+# verified once per version; the dict starts over when the version moves on.
+_logins = {"version": None, "users": {}}
+_logins_lock = threading.Lock()
+_LOGIN_KEY = os.urandom(16)  # the digests never leave the process, so a per-run key will do
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message, headers=None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+# --- Payloads (run in a worker thread; the services cache the parsed stores) ---
+def _timetable(student):
+    return {"student": student, "slots": student_timetable(student)}
+
+
+def _attendance(student):
+    records = student_attendance(student)
+    return {
+        "student": student,
+        "records": [{"date": day, "status": status} for day, status in records],
+        "present": sum(status == "Present" for _, status in records),
+        "total": len(records),
+    }
+
+
+def _assessments(student):
+    rows, overall = student_assessments(student)
+    return {"student": student, "rows": rows, "average": overall}
+
+
+def _users(filters):
+    return {"users": filter_users(*filters)}
+
+
+# path -> (store its ETag follows, payload builder)
+ROUTES = {
+    "/api/timetable": ("timetable", _timetable),
+    "/api/attendance": ("attendance", _attendance),
+    "/api/assessments": ("assessments", _assessments),
+}
+
+
+# --- Auth ---
+def _credentials(header):
+    """(username, password) from a Basic auth header."""
+    try:
+        scheme, token = header.split(" ", 1)
+        username, password = base64.b64decode(token.strip(), validate=True).decode("utf-8").split(":", 1)
+    except ValueError:  # also bad base64 (binascii.Error) and bad UTF-8
+        raise HTTPError(401, "Malformed Authorization header")
+    if scheme.lower() != "basic":
+        raise HTTPError(401, "Use HTTP Basic auth")
+    return username, password
+
+
+def _cached_login(key, users_version, login=None):
+    """Look up (or with `login`, store) a verified login for this users version."""
+    with _logins_lock:
+        if _logins["version"] != users_version:
+            _logins["version"], _logins["users"] = users_version, {}
+        if login:
+            _logins["users"][key] = login
+        return _logins["users"].get(key)
+
+
+def _check_login(username, password, key):
+    """Verify credentials against the user store; returns (full name, role)."""
+    users_version = versions.version("users")
+    result = authenticate(username, password)
+    if result is None:
+        raise HTTPError(401, "Invalid username or password")
+    full_name, details = result
+    return _cached_login(key, users_version, (full_name, details.role))
+
+
+async def _login(headers):
+    header = headers.get("authorization")
+    if not header:
+        raise HTTPError(401, "Login required")
+    username, password = _credentials(header)
+    key = (username, hashlib.blake2b(password.encode("utf-8"), key=_LOGIN_KEY).digest())
+    cached = _cached_login(key, versions.version("users"))
+    if cached:
+        return cached
+    # A miss may re-read the user store; keep that off the event loop
+    return await asyncio.get_running_loop().run_in_executor(None, _check_login, username, password, key)
+
+
+def _student_for(name, role, query):
+    """
+    The student a request is about, after checking the caller may see them.
+
+    Runs in a worker thread: a teacher's roster may re-read the user store.
+    """
+    student = query.get("student", [None])[0]
+    if role == "Student":
+        if student not in (None, name):
+            raise HTTPError(403, "Students can only see their own records")
+        return name
+    if not student:
+        raise HTTPError(400, "Add ?student=<full name>")
+    if role == "Admin":
+        return student
+    if role == "Teacher" and student in students_of(name):
+        return student
+    raise HTTPError(403, f"{student} is not one of your students")
+
+
+def _etag(*parts):
+    return '"' + hashlib.blake2b(repr(parts).encode("utf-8"), digest_size=12).hexdigest() + '"'
+
+
+def _matches(if_none_match, etag):
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+# --- Requests ---
+async def respond(method, target, headers):
+    """Return (status, extra headers, payload or None) for one request."""
+    try:
+        url = urlsplit(target)
+        query = parse_qs(url.query)
+    except ValueError:  # e.g. "//[" (an unclosed IPv6 host)
+        raise HTTPError(400, "Malformed URL")
+    path = unquote(url.path).rstrip("/") or "/"
+    if path == "/api/health":
+        return 200, {}, {"status": "ok"}
+    if path not in ("/api/me", "/api/users") and path not in ROUTES:
+        raise HTTPError(404, "Unknown endpoint")
+    if method not in ("GET", "HEAD"):
+        raise HTTPError(405, "Only GET is supported", {"Allow": "GET, HEAD"})
+
+    name, role = await _login(headers)
+    loop = asyncio.get_running_loop()
+    if path == "/api/me":
+        store, subject, build = "users", name, profile
+    elif path == "/api/users":
+        if role != "Admin":
+            raise HTTPError(403, "Only admins can list users")
+        filters = tuple(query.get(key, [default])[0] for key, default in (("role", "All"), ("stage", "All"), ("search", "")))
+        store, subject, build = "users", filters, _users
+    else:
+        store, build = ROUTES[path]
+        subject = await loop.run_in_executor(None, _student_for, name, role, query)
+
+    etag = _etag(path, subject, versions.version(store))
+    extra = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _matches(headers.get("if-none-match"), etag):
+        return 304, extra, None
+    payload = await loop.run_in_executor(None, build, subject)
+    return 200, extra, payload
+
+
+async def _read_request(reader):
+    """Return (method, target, version, headers) or None when the client is done."""
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), IDLE_SECONDS)
+    except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+        return None
+    except asyncio.LimitOverrunError:
+        raise HTTPError(431, "Request headers too large")
+
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            key, value = line.split(":", 1)
+            headers[key.strip().lower()] = value.strip()
+
+    try:
+        length = int(headers.get("content-length") or 0)
+    except ValueError:
+        raise HTTPError(400, "Bad Content-Length")
+    if not 0 <= length <= MAX_BODY_BYTES:
+        raise HTTPError(400, "Bad Content-Length")
+    if length:
+        try:
+            await asyncio.wait_for(reader.readexactly(length), IDLE_SECONDS)  # GET bodies are ignored
+        except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+            return None
+    return method, target, version, headers
+
+
+def _encode(status, headers, payload, keep_alive, head_only=False):
+    body = b"" if payload is None else json.dumps(payload).encode("utf-8")
+    lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}"]
+    if status != 304:
+        lines.append("Content-Type: application/json; charset=utf-8")
+        lines.append(f"Content-Length: {len(body)}")
+    lines.extend(f"{key}: {value}" for key, value in headers.items())
+    lines.append("Connection: keep-alive" if keep_alive else "Connection: close")
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (b"" if head_only or status == 304 else body)
+
+
+async def handle(reader, writer):
+    try:
+        while True:
+            method, keep_alive = "GET", False
+            try:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, target, version, headers = request
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+                status, extra, payload = await respond(method, target, headers)
+            except HTTPError as e:
+                status, extra, payload = e.status, e.headers, {"error": str(e)}
+                if e.status == 401:
+                    extra = dict(extra, **{"WWW-Authenticate": 'Basic realm="RSS", charset="UTF-8"'})
+            except Exception:
+                # A bug in one request must not drop the connection without an answer
+                traceback.print_exc()
+                status, extra, payload, keep_alive = 500, {}, {"error": "Internal server error"}, False
+            writer.write(_encode(status, extra, payload, keep_alive, head_only=method == "HEAD"))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+def warm_up():
+    """Parse every store once so the first requests don't pay for it."""
+    load_users()
+    get_timetable()
+    get_attendance()
+    get_assessments()
+
+
+async def serve(host, port):
+    server = await asyncio.start_server(handle, host, port, limit=MAX_HEADER_BYTES, backlog=1024)
+    addresses = ", ".join(f"http://{sock.getsockname()[0]}:{sock.getsockname()[1]}" for sock in server.sockets)
+    print(f"✅ Serving the JSON API on {addresses}")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve timetables, attendance and grades as JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8600)
+    args = parser.parse_args()
+
+    warm_up()
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
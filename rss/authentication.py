@@ -1,37 +1,14 @@
-import json
-import os
 import streamlit as st
 from users.student import Student
 from users.teacher import Teacher
 from users.admin import Admin
 from ciper import caesar_encrypt,caesar_decrypt
-
-SHIFT = 3
-# File to store users
-USER_FILE = "users.json"
-
-# Initialize file if not exists
-def init_user_file():
-    if not os.path.exists(USER_FILE):
-        with open(USER_FILE, "w") as f:
-            json.dump({}, f)
-
-def load_users():
-    init_user_file()
-    with open(USER_FILE, "r") as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return {}  # fallback if file is empty/corrupt
-    
-
-def save_users(users):
-    with open(USER_FILE, "w") as f:
-        json.dump(users, f, indent=4)
+from services.accounts import SHIFT, stage_for_age
+from storage.user_records import Role, label
+from storage.user_store import load_users, save_users, update_users, find_full_names
 
 def reset_users():
-    with open(USER_FILE, "w") as f:
-        json.dump({}, f)
+    save_users({})
     print("✅ User file reset to empty.")        
 
 
@@ -58,14 +35,7 @@ def signup():
                 age = st.number_input("Enter your age", min_value=5, max_value=18, step=1)
 
                 # Auto-assign stage based on age bracket
-                if 5 <= age <= 7:
-                    stage = "Adventurer"
-                elif 8 <= age <= 12:
-                    stage = "Creator"
-                elif 12 <= age <= 18:
-                    stage = "Innovator"
-                else:
-                    stage = "Unassigned"
+                stage = stage_for_age(age)
 
                 st.info(f"🎯 Based on your age, your stage is: **{stage}**")
 
@@ -82,7 +52,7 @@ def signup():
             else:
                 encrypted_pw = caesar_encrypt(password, SHIFT)
 
-                users[full_name] = {   # ✅ Key is full name
+                record = {   # ✅ Key is full name
                     "username": username,   # can be shared
                     "password": encrypted_pw,
                     "role": role
@@ -90,9 +60,9 @@ def signup():
 
                 # ✅ Only save stage if student
                 if role == "Student":
-                    users[full_name]["stage"] = stage
+                    record["stage"] = stage
 
-                save_users(users)
+                update_users({full_name: record})
 
                 # ✅ Mark as signed up
                 st.session_state["signed_up"] = True
@@ -120,29 +90,29 @@ def login():
         submitted = st.form_submit_button("Login")
 
     if submitted:
-        found = False  # ✅ Start with False
-
-        for full_name, details in users.items():
-            if details["username"] == username:
-                found = True  # ✅ username exists
-                if caesar_decrypt(details["password"], SHIFT) == password:
-                    role = details["role"]
-
-                    if role == "Student":
-                        return Student(full_name, details["username"], details["stage"])
-                    elif role == "Teacher":
-                        return Teacher(details["username"])
-                    elif role == "Admin":
-                        return Admin(full_name, details["username"])
-                    else:
-                        st.error("Unknown role")
-                        return None
-                else:
-                    st.error("Incorrect password")
-                    return None
-
-        if not found:  # ✅ only show after loop finishes
+        matches = find_full_names(username)  # ✅ index lookup, no scan
+
+        if not matches:
             st.error("Username not found")
+            return None
+
+        full_name = matches[0]
+        details = users[full_name]
+        if caesar_decrypt(details.password or "", SHIFT) == password:
+            role = details.role
+
+            if role is Role.STUDENT:
+                return Student(full_name, details.username, label(details.stage))
+            elif role is Role.TEACHER:
+                return Teacher(details.username)
+            elif role is Role.ADMIN:
+                return Admin(full_name, details.username)
+            else:
+                st.error("Unknown role")
+                return None
+        else:
+            st.error("Incorrect password")
+            return None
 
     return None
 
@@ -162,11 +132,8 @@ def reset_password():
     if submitted:
         # 🔍 Find user by username + name
         matched_user = None
-        for full_name, details in users.items():
-            if (
-                details["username"] == username
-                and full_name.lower() == name.strip().title().lower()
-            ):
+        for full_name in find_full_names(username):
+            if full_name.lower() == name.strip().title().lower():
                 matched_user = full_name
                 break
 
@@ -184,7 +151,6 @@ def reset_password():
 
         # ✅ Encrypt and update password
         encrypted_pw = caesar_encrypt(new_password, SHIFT)
-        users[matched_user]["password"] = encrypted_pw
-        save_users(users)
+        update_users({matched_user: users[matched_user].replace(password=encrypted_pw)})
 
         st.success("✅ Password has been reset successfully! Please login with your new password.")
@@ -0,0 +1,64 @@
+"""
+Measure the cold-start cost of the login page.
+
+Each run starts a fresh interpreter, imports streamlit (as `streamlit run`
+already has), then imports what streamlit.py needs to draw the login page,
+and reports the time spent and which heavy modules were pulled in.
+
+Run from the app folder:
+    python benchmarks/startup_time.py [--runs 5]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["pandas", "numpy", "operations.attendance", "operations.assessment", "operations.schedule"]
+
+CHILD = """
+import json, sys, time
+# rss/streamlit.py would shadow the real package from the app folder
+sys.path = [p for p in sys.path if p not in ("", {app_dir!r})]
+t0 = time.perf_counter()
+import streamlit
+t1 = time.perf_counter()
+sys.path.insert(0, {app_dir!r})
+import authentication
+t2 = time.perf_counter()
+print(json.dumps({{
+    "streamlit": t1 - t0,
+    "app": t2 - t1,
+    "loaded": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure(runs):
+    code = CHILD.format(app_dir=APP_DIR, heavy=HEAVY_MODULES)
+    results = []
+    for _ in range(runs):
+        out = subprocess.run(
+            [sys.executable, "-c", code], cwd=APP_DIR, capture_output=True, text=True, check=True
+        ).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the imports needed to serve the login page.")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = measure(args.runs)
+    streamlit_ms = statistics.median(r["streamlit"] for r in results) * 1000
+    app_ms = statistics.median(r["app"] for r in results) * 1000
+    print(f"streamlit import : {streamlit_ms:8.1f} ms (median of {args.runs})")
+    print(f"app modules      : {app_ms:8.1f} ms")
+    print(f"heavy modules loaded before login: {', '.join(results[-1]['loaded']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
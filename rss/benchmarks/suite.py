@@ -0,0 +1,201 @@
+"""
+Headless benchmark suite for the main pages.
+
+Generates a seeded synthetic data set (benchmarks/synthetic_data.py) in a
+temporary folder, then drives each page through Streamlit's AppTest in
+this process:
+
+- login: submit the login form
+- record_attendance: save one class's attendance
+- attendance_summary, assessment_summary, view_all_schedules,
+  system_report, manage_users: render the page
+
+For every page it reports the first (cold) run, p50/p90/p99/max of the
+repeated runs, and the peak Python memory of one extra run traced with
+tracemalloc. Results are saved as JSON; pass --baseline to compare a
+previous file and exit non-zero when a page's p50 got slower than
+--threshold.
+
+Run from the app folder (Streamlit's own warnings go to stderr):
+    python benchmarks/suite.py [--students 5000] [--runs 10] [--baseline benchmarks/results/baseline.json] 2>/dev/null
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(APP_DIR, "benchmarks", "results")
+
+# Saves are timed on their own, not waiting for other sessions to join a batch
+os.environ.setdefault("RSS_WRITE_WINDOW_MS", "0")
+
+# The real package must be imported before the app folder goes on the path:
+# rss/streamlit.py would shadow it.
+sys.path = [p for p in sys.path if p not in ("", APP_DIR)]
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+sys.path.append(APP_DIR)
+from benchmarks.synthetic_data import PASSWORD, generate, teacher_name  # noqa: E402
+
+
+
+def _submit_login(at):
+    at.text_input[0].input("teacher000")
+    at.text_input[1].input(PASSWORD)
+    at.button[0].click()
+
+
+def _submit_form(at):
+    at.button[0].click()
+
+
+# Headless: parse and check a 1,000-row intake file through the services, without saving it.
+_VALIDATE_IMPORT = """
+import io
+from services.student_import import iter_rows, validate_rows
+rows = "full_name,username,age\\n" + "".join(f"New Pupil {i},newpupil{i},{5 + i % 14}\\n" for i in range(1000))
+validate_rows(iter_rows(io.BytesIO(rows.encode()), "intake.csv"))
+"""
+
+# name -> (page or service script, step run before each timed rerun)
+BENCHMARKS = {
+    "login": ("from authentication import login\nlogin()", _submit_login),
+    "record_attendance": (
+        f"from operations.attendance import record_attendance\nrecord_attendance({teacher_name(0)!r})",
+        _submit_form,
+    ),
+    "attendance_summary": ("from operations.attendance import attendance_summary\nattendance_summary()", None),
+    "assessment_summary": ("from operations.assessment import assessment_summary\nassessment_summary()", None),
+    "view_all_schedules": ("from operations.schedule import view_all_schedules\nview_all_schedules()", None),
+    "system_report": ("from operations.system_report import system_report\nsystem_report()", None),
+    "manage_users": ("from operations.manage_users import manage_users\nmanage_users()", None),
+    "filter_users": ("from services.accounts import filter_users\nfilter_users('Student', 'All', '0042')", None),
+    "validate_import": (_VALIDATE_IMPORT, None),
+}
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def _timed_run(at, prepare):
+    if prepare:
+        prepare(at)
+    start = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return elapsed * 1000
+
+
+def run_benchmark(script, prepare, runs):
+    at = AppTest.from_string(script, default_timeout=600)
+    first = _timed_run(at, None)  # cold: imports, file reads, cache fills
+    times = [_timed_run(at, prepare) for _ in range(runs)]
+
+    tracemalloc.start()
+    try:
+        _timed_run(at, prepare)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "runs": runs,
+        "first_ms": round(first, 2),
+        "p50_ms": round(percentile(times, 50), 2),
+        "p90_ms": round(percentile(times, 90), 2),
+        "p99_ms": round(percentile(times, 99), 2),
+        "max_ms": round(max(times), 2),
+        "peak_mb": round(peak / 2**20, 2),
+    }
+
+
+def compare(results, baseline, threshold, floor_ms=5.0):
+    """Return [(name, old p50, new p50, change)] for pages slower than the baseline by more than threshold."""
+    regressions = []
+    for name, new in results.items():
+        old = baseline.get("results", {}).get(name)
+        if not old:
+            continue
+        change = (new["p50_ms"] - old["p50_ms"]) / old["p50_ms"] if old["p50_ms"] else 0.0
+        if change > threshold and new["p50_ms"] - old["p50_ms"] > floor_ms:
+            regressions.append((name, old["p50_ms"], new["p50_ms"], change))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the main pages on synthetic data.")
+    parser.add_argument("--teachers", type=int, default=50)
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--assessments", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--runs", type=int, default=10, help="timed reruns per page")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="run only these pages")
+    parser.add_argument("--save", default=os.path.join(RESULTS_DIR, "latest.json"))
+    parser.add_argument("--baseline", help="earlier results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed p50 slowdown (0.25 = 25%%)")
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix="rss-bench-")
+    cwd = os.getcwd()
+    try:
+        sizes = generate(data_dir, args.teachers, args.students, args.days, args.assessments, seed=args.seed)
+        print("Data: " + ", ".join(f"{key} {value}" for key, value in sizes.items()))
+        os.chdir(data_dir)  # the stores use paths relative to the working folder
+
+        results = {}
+        print(f"{'page':<20} {'first':>9} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9} {'peak MB':>8}")
+        for name in args.only or BENCHMARKS:
+            script, prepare = BENCHMARKS[name]
+            r = results[name] = run_benchmark(script, prepare, args.runs)
+            print(
+                f"{name:<20} {r['first_ms']:>9.1f} {r['p50_ms']:>9.1f} {r['p90_ms']:>9.1f} "
+                f"{r['p99_ms']:>9.1f} {r['max_ms']:>9.1f} {r['peak_mb']:>8.1f}"
+            )
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "data": sizes,
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+    with open(args.save, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Saved {args.save}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if baseline.get("meta", {}).get("data") != sizes:
+            print("⚠️ Baseline was recorded on a different data set; comparing anyway.")
+        regressions = compare(results, baseline, args.threshold)
+        for name, old, new, change in regressions:
+            print(f"❌ {name}: p50 {old:.1f} ms -> {new:.1f} ms (+{change:.0%})")
+        if regressions:
+            sys.exit(1)
+        print("✅ No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
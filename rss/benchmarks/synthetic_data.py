@@ -0,0 +1,138 @@
+"""
+Seeded synthetic school data for benchmarks.
+
+Writes users.json, attendance.json, assessments.json and timetable.json in
+the app's current formats into a folder. The same seed and sizes always
+give the same files.
+
+Run from the app folder:
+    python benchmarks/synthetic_data.py /tmp/rss-bench --teachers 50 --students 5000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import date, datetime, time, timedelta
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if APP_DIR not in sys.path:
+    sys.path.append(APP_DIR)  # appended: rss/streamlit.py must not shadow the real package
+
+from ciper import caesar_encrypt  # noqa: E402
+from services.accounts import SHIFT, stage_for_age  # noqa: E402
+from storage.timeslots import format_slot  # noqa: E402
+
+PASSWORD = "pass123"  # every synthetic account uses this password
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+
+
+def teacher_name(i):
+    return f"Teacher {i:03d}"
+
+
+def student_name(i):
+    return f"Student {i:05d}"
+
+
+def generate(out_dir, teachers=50, students=5000, days=365, assessments=40, sessions=2, seed=0, end=None):
+    """
+    Write a synthetic data set into out_dir and return its sizes.
+
+    Args:
+        teachers, students (int): number of accounts (plus one admin)
+        days (int): calendar days of attendance ending at `end` (weekdays only are marked)
+        assessments (int): scores per student, split evenly between C.A and Exam
+        sessions (int): timetable slots per student per week
+        seed (int): random seed
+    """
+    rng = random.Random(seed)
+    end = end or date(2026, 7, 31)
+    os.makedirs(out_dir, exist_ok=True)
+    password = caesar_encrypt(PASSWORD, SHIFT)
+
+    # --- Users ---
+    users = {"School Admin": {"username": "admin", "password": password, "role": "Admin"}}
+    for t in range(teachers):
+        users[teacher_name(t)] = {"username": f"teacher{t:03d}", "password": password, "role": "Teacher"}
+    pupils = []
+    for s in range(students):
+        name = student_name(s)
+        users[name] = {
+            "username": f"student{s:05d}",
+            "password": password,
+            "role": "Student",
+            "stage": stage_for_age(rng.randint(5, 18)),
+            "teacher": teacher_name(s % teachers) if teachers else None,
+        }
+        pupils.append(name)
+    _dump(out_dir, "users.json", users)
+
+    # --- Attendance: one mark per student per school day ---
+    school_days = [
+        str(day) for day in (end - timedelta(days=n) for n in range(days - 1, -1, -1)) if day.weekday() < 5
+    ]
+    attendance = {
+        name: {day: "Present" if rng.random() < 0.9 else "Absent" for day in school_days}
+        for name in pupils
+    }
+    _dump(out_dir, "attendance.json", attendance)
+
+    # --- Assessments: typed {"scores", "at"} series, spread over the period ---
+    first = datetime.combine(end - timedelta(days=days), time(9)).timestamp()
+    span = days * 86400
+    per_kind = {"C.A": assessments - assessments // 2, "Exam": assessments // 2}
+    scores = {}
+    for name in pupils:
+        records = {}
+        for kind, count in per_kind.items():
+            stamps = sorted(int(first + rng.random() * span) for _ in range(count))
+            records[kind] = {"scores": [rng.randint(20, 100) for _ in range(count)], "at": stamps}
+        scores[name] = records
+    _dump(out_dir, "assessments.json", scores)
+
+    # --- Timetable: `sessions` one-hour slots per student with their teacher ---
+    slots = []
+    for s, name in enumerate(pupils):
+        teacher = users[name]["teacher"]
+        for k in range(sessions):
+            hour = 9 + (s // max(teachers, 1) + k) % 8
+            slots.append({
+                "id": len(slots) + 1,
+                "student": name,
+                "teacher": teacher,
+                "day": WEEKDAYS[(s + k * 2) % 5],
+                "time": format_slot(hour * 60, (hour + 1) * 60),
+            })
+    _dump(out_dir, "timetable.json", {"slots": slots, "next_id": len(slots) + 1})
+
+    return {
+        "teachers": teachers,
+        "students": students,
+        "attendance_marks": len(school_days) * students,
+        "assessments": assessments * students,
+        "timetable_slots": len(slots),
+    }
+
+
+def _dump(out_dir, name, data):
+    with open(os.path.join(out_dir, name), "w") as f:
+        json.dump(data, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a seeded synthetic data set.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--teachers", type=int, default=50)
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--assessments", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    sizes = generate(args.out_dir, args.teachers, args.students, args.days, args.assessments, seed=args.seed)
+    print("✅ " + ", ".join(f"{key}: {value}" for key, value in sizes.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+Makes the app folder importable for the tests (pytest puts this directory on sys.path).
+"""
@@ -1,36 +1,13 @@
-import json
-import os
 from datetime import date
 import streamlit as st
 import pandas as pd
 
-ATTENDANCE_FILE = "attendance.json"
-USER_FILE = "users.json"
-
-
-# --- Helpers ---
-def load_users():
-    if not os.path.exists(USER_FILE):
-        return {}
-    with open(USER_FILE, "r") as f:
-        return json.load(f)
-
-
-def init_attendance_file():
-    """Ensure the attendance file exists."""
-    if not os.path.exists(ATTENDANCE_FILE):
-        with open(ATTENDANCE_FILE, "w") as f:
-            json.dump({}, f)  # start with empty JSON
-
-def load_attendance():
-    init_attendance_file()
-    with open(ATTENDANCE_FILE, "r") as f:
-        return json.load(f)
-
-
-def save_attendance(attendance):
-    with open(ATTENDANCE_FILE, "w") as f:
-        json.dump(attendance, f, indent=4)
+from services.attendance import (
+    STATUSES, attendance_range, attendance_records_frame, attendance_summary_frame,
+    get_attendance, record_attendance_batch, student_attendance,
+)
+from services.roster import get_roster
+from storage import perf
 
 
 # --- Record Attendance (Teacher Only) ---
@@ -43,22 +20,14 @@ def record_attendance(teacher_name):
     """
     st.subheader("📌 Record Attendance")
 
-    users = load_users()  # Load all users
-
-    # Find students assigned to this teacher (strict full-name match)
-    students = [
-        student_name
-        for student_name, info in users.items()
-        if info.get("role", "").lower() == "student"
-        and info.get("teacher") == teacher_name
-    ]
+    # Students assigned to this teacher (strict full-name match)
+    students = [student["name"] for student in get_roster(teacher_name)]
 
     if not students:
         st.info("⚠️ No students assigned to you yet.")
         return
 
     today = str(date.today())
-    attendance = load_attendance()  # Load existing attendance
 
     # --- Bulk attendance form ---
     with st.form("attendance_form"):
@@ -66,7 +35,7 @@ def record_attendance(teacher_name):
         for student in students:
             status = st.radio(
                 f"{student}",
-                ["Present", "Absent"],
+                STATUSES,
                 horizontal=True,
                 key=f"{student}_{today}"
             )
@@ -75,79 +44,56 @@ def record_attendance(teacher_name):
         submitted = st.form_submit_button("✅ Save Attendance")
 
         if submitted:
-            for student, status in status_dict.items():
-                if student not in attendance:
-                    attendance[student] = {}
-                attendance[student][today] = status
-
-            save_attendance(attendance)
+            try:
+                record_attendance_batch(teacher_name, status_dict, today)
+            except ValueError as e:  # e.g. a student moved to another teacher meanwhile
+                st.error(f"⚠️ {e}")
+                return
             st.success("🎉 Attendance saved successfully!")
 
 
 def view_attendance():
     st.subheader("📂 All Attendance Records")
 
-    attendance = load_attendance()
-    
-    if not attendance:
+    if not get_attendance():
         st.info("No attendance records yet.")
         return
 
-    rows = []
-    for student, records in attendance.items():
-        for day, status in records.items():
-            rows.append({"Student": student, "Date": day, "Status": status})
-
-    df = pd.DataFrame(rows)
-    df.index = df.index + 1
-    st.dataframe(df, use_container_width=True)
+    df = attendance_records_frame()
+    st.dataframe(perf.count_rows(df), use_container_width=True)
 
 
 
 def view_my_attendance(student_fullname):
     st.subheader(f"📂 Attendance for {student_fullname}")
 
-    attendance = load_attendance()
-
     # ✅ Lookup by full name
-    records = attendance.get(student_fullname, {})
+    records = student_attendance(student_fullname)
     if not records:
         st.info("⚠️ No attendance recorded for you yet.")
         return
 
     # Display neatly
-    df = pd.DataFrame(list(records.items()), columns=["Date", "Status"])
+    df = pd.DataFrame(records, columns=["Date", "Status"])
     df.index = df.index + 1
-    st.dataframe(df, use_container_width=True)
+    st.dataframe(perf.count_rows(df), use_container_width=True)
 
 
 def attendance_summary():
     st.subheader("📊 Attendance Summary")
 
-    with open(ATTENDANCE_FILE, "r") as f:
-        attendance = json.load(f)
-
-    if not attendance:
+    # Optional date range; counts come straight from the bitmaps either way
+    start, end = None, None
+    first_day, last_day = attendance_range()
+    if first_day:
+        picked = st.date_input(
+            "Date range", value=(first_day, last_day), min_value=first_day, max_value=last_day
+        )
+        if isinstance(picked, (tuple, list)) and len(picked) == 2:
+            start, end = picked
+
+    df_summary = attendance_summary_frame(start, end)
+    if df_summary.empty:
         st.info("No attendance records found.")
         return
-
-    summary_rows = []
-    for student, records in attendance.items():
-        total_days = len(records)
-        present_days = sum(1 for s in records.values() if s == "Present")
-        absent_days = total_days - present_days
-        percentage = (present_days / total_days) * 100 if total_days > 0 else 0
-        status = "⚠️ Needs Intervention" if percentage < 75 else "✅ On Track"
-
-        summary_rows.append({
-            "Student": student,
-            "Total Days": total_days,
-            "Present": present_days,
-            "Absent": absent_days,
-            "Attendance Rate (%)": f"{percentage:.2f}",
-            "Status": status
-        })
-
-    df_summary = pd.DataFrame(summary_rows)
-    df_summary.index = df_summary.index + 1  # Start index at 1
-    st.dataframe(df_summary, use_container_width=True)
+    st.dataframe(perf.count_rows(df_summary), use_container_width=True)
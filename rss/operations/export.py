@@ -0,0 +1,53 @@
+import tempfile
+import streamlit as st
+from storage.export import COLUMNS, FORMATS, export
+from storage.user_store import students_by_stage, users_with_role
+
+
+# --- Export Data (Admin only) ---
+def export_data():
+    st.subheader("📤 Export Data")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        dataset = st.selectbox("Dataset", list(COLUMNS), format_func=str.title, key="export_dataset")
+    with col2:
+        fmt = st.selectbox("Format", FORMATS, format_func=str.upper, key="export_format")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        teacher = st.selectbox("Teacher", ["All"] + sorted(users_with_role("Teacher")), key="export_teacher")
+    with col2:
+        stage = st.selectbox("Stage", ["All"] + sorted(students_by_stage()), key="export_stage")
+
+    start = end = None
+    if dataset != "timetable":  # slots are weekly, not dated
+        if st.checkbox("Limit to a date range", key="export_use_range"):
+            picked = st.date_input("Date range", value=[], key="export_range")
+            if len(picked) == 2:
+                start, end = picked
+
+    if st.button("📦 Prepare Export"):
+        # Rows are streamed to a temporary file in chunks; only the finished
+        # file is handed to the browser.
+        with tempfile.TemporaryFile() as out:
+            try:
+                count = export(
+                    dataset, fmt, out,
+                    teacher=None if teacher == "All" else teacher,
+                    stage=None if stage == "All" else stage,
+                    start=start, end=end,
+                )
+            except ValueError as e:
+                st.error(f"⚠️ {e}")
+                return
+            out.seek(0)
+            data = out.read()
+
+        st.success(f"✅ {count} {dataset} rows ready.")
+        st.download_button(
+            f"⬇️ Download {dataset}.{fmt}",
+            data,
+            file_name=f"{dataset}.{fmt}",
+            mime="text/csv" if fmt == "csv" else "application/octet-stream",
+        )
@@ -1,23 +1,11 @@
-import json
-import os
 import streamlit as st
 import pandas as pd
+from services.accounts import filter_users
+from storage import perf
+from storage.user_store import load_users, delete_users, students_by_stage
 
-USER_FILE = "users.json"
+PAGE_SIZES = [25, 50, 100, 250]
 
-# --- Helpers ---
-def load_users():
-    if not os.path.exists(USER_FILE):
-        return {}
-    with open(USER_FILE, "r") as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return {}
-
-def save_users(users):
-    with open(USER_FILE, "w") as f:
-        json.dump(users, f, indent=4)
 
 # --- Manage Users (Admin only) ---
 def manage_users():
@@ -29,18 +17,58 @@ def manage_users():
         st.info("No users found.")
         return
 
+    if "manage_users_msg" in st.session_state:
+        st.success(st.session_state.pop("manage_users_msg"))
+
     st.write("### 📋 Users List")
 
-    # List each user with a delete button
-    for username, details in users.items():
-        col1, col2, col3 = st.columns([3, 3, 1])  # layout: name, role, delete btn
-        with col1:
-            st.write(f"{details.get('name','')} {username}")
-        with col2:
-            st.write(details.get("role", "N/A"))
-        with col3:
-            if st.button("🗑 Delete", key=f"del_{username}"):
-                del users[username]
-                save_users(users)
-                st.success(f"✅ Deleted user: {username}")
-                st.rerun()
\ No newline at end of file
+    # --- Filters (applied on the server, before anything is sent to the browser) ---
+    col1, col2, col3 = st.columns([2, 2, 3])
+    with col1:
+        role = st.selectbox("Role", ["All", "Student", "Teacher", "Admin"], key="mu_role")
+    with col2:
+        stage_options = ["All"] + sorted(students_by_stage()) if role in ("All", "Student") else ["All"]
+        stage = st.selectbox("Stage", stage_options, key="mu_stage")
+    with col3:
+        search = st.text_input("Search name or username", key="mu_search")
+
+    names = filter_users(role, stage, search)
+    if not names:
+        st.info("No users match these filters.")
+        return
+
+    # --- Pagination: only the current page is turned into rows ---
+    col1, col2 = st.columns(2)
+    with col1:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, key="mu_page_size")
+    pages = (len(names) + page_size - 1) // page_size
+    with col2:
+        # Keyed on the filters so a narrower filter starts again from page 1
+        page = st.number_input(
+            f"Page (of {pages})", min_value=1, max_value=pages, step=1,
+            key=f"mu_page_{role}_{stage}_{search}_{page_size}",
+        )
+    page_names = names[(page - 1) * page_size: page * page_size]
+
+    df = pd.DataFrame({
+        "Delete": False,
+        "Full Name": page_names,
+        "Username": [users[name].get("username", "") for name in page_names],
+        "Role": [users[name].get("role", "N/A") for name in page_names],
+        "Stage": [users[name].get("stage", "") for name in page_names],
+        "Teacher": [users[name].get("teacher", "") for name in page_names],
+    })
+    edited = st.data_editor(
+        perf.count_rows(df),
+        hide_index=True,
+        use_container_width=True,
+        disabled=["Full Name", "Username", "Role", "Stage", "Teacher"],
+        key=f"mu_grid_{role}_{stage}_{search}_{page_size}_{page}",
+    )
+    st.caption(f"Showing {len(page_names)} of {len(names)} user(s)")
+
+    selected = edited.loc[edited["Delete"], "Full Name"].tolist()
+    if st.button(f"🗑 Delete selected ({len(selected)})", disabled=not selected):
+        delete_users(selected)  # ✅ one write for the whole batch
+        st.session_state["manage_users_msg"] = f"✅ Deleted {len(selected)} user(s)"
+        st.rerun()
@@ -1,39 +1,24 @@
 import streamlit as st
-import json
-import os
-
-USER_FILE = "users.json"
-
-def init_user_file():
-    if not os.path.exists(USER_FILE):
-        with open(USER_FILE, "w") as f:
-            json.dump({}, f)
-
-def load_users():
-    init_user_file()
-    with open(USER_FILE, "r") as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return {}  # fallback if file is empty/corrupt
-
-def save_users(users):
-    with open(USER_FILE, "w") as f:
-        json.dump(users, f, indent=4)
+import pandas as pd
+from services.roster import assign_teachers, get_roster, pairing_setup, plan_pairing, teacher_of
+from storage.user_store import load_users, unassigned_students, users_with_role
 
 def assign_teacher():
     st.subheader("👩‍🏫 Assign Teacher to Student")
 
-    users = load_users()
+    if "pairing_msg" in st.session_state:
+        st.success(st.session_state.pop("pairing_msg"))
+
+    mode = st.radio("Mode", ["Manual", "Automatic"], horizontal=True, key="pairing_mode")
+    if mode == "Automatic":
+        auto_assign_teachers()
+        return
 
     # Get all teachers (FULL NAME)
-    teachers = [fullname for fullname, info in users.items() if info.get("role", "").lower() == "teacher"]
+    teachers = users_with_role("Teacher")
 
     # Get only students with no assigned teacher
-    students = [
-        fullname for fullname, info in users.items()
-        if info.get("role", "").lower() == "student" and not info.get("teacher")
-    ]
+    students = unassigned_students()
 
     if not students:
         st.info("⚠️ All students have already been assigned to teachers.")
@@ -53,24 +38,85 @@ def assign_teacher():
             st.warning("⚠️ Please select at least one student.")
             return
 
-        for student_name in selected_students:
-            # ✅ Save teacher's FULL NAME to student record
-            users[student_name]["teacher"] = teacher_name  
+        # ✅ Save teacher's FULL NAME to the student records, in one write
+        count = assign_teachers({student_name: teacher_name for student_name in selected_students})
+        st.success(f"✅ Assigned {count} student(s) to {teacher_name}")
+
+def auto_assign_teachers():
+    """Pair every unassigned student in one batch, balancing class sizes within each teacher's capacity."""
+    users = load_users()
+    teachers, students, stages, current, default_capacity = pairing_setup()
+
+    if not students:
+        st.info("⚠️ All students have already been assigned to teachers.")
+        return
+    if not teachers:
+        st.info("⚠️ No teachers available to assign.")
+        return
+
+    # --- Teacher capacity and stages ---
+
+    st.write(f"**{len(students)}** unassigned students. Set each teacher's capacity and the stages they teach:")
+    settings = st.data_editor(
+        pd.DataFrame({
+            "Teacher": teachers,
+            "Students": [current[name] for name in teachers],
+            "Capacity": [default_capacity] * len(teachers),
+            **{stage: [True] * len(teachers) for stage in stages},
+        }),
+        disabled=["Teacher", "Students"],
+        hide_index=True,
+        key="pairing_settings",
+    )
+
+    if st.button("⚙️ Preview Pairing"):
+        chosen = {
+            row["Teacher"]: (int(row["Capacity"]), [stage for stage in stages if row[stage]])
+            for row in settings.fillna({"Capacity": 0}).to_dict("records")
+        }
+        st.session_state["pairing_preview"] = plan_pairing(students, chosen)
+
+    if "pairing_preview" not in st.session_state:
+        return
+
+    assignments, unmet = st.session_state["pairing_preview"]
+    st.write(f"**{len(assignments)}** students will be assigned, **{len(unmet)}** cannot be.")
+
+    # --- Preview diff: per-teacher class sizes, then the new pairs ---
+    added = pd.Series(assignments, dtype=object).value_counts()
+    st.dataframe(
+        pd.DataFrame({
+            "Teacher": teachers,
+            "Before": [current[name] for name in teachers],
+            "Added": [int(added.get(name, 0)) for name in teachers],
+            "After": [current[name] + int(added.get(name, 0)) for name in teachers],
+        }).set_index("Teacher"),
+        use_container_width=True,
+    )
+    if unmet:
+        st.write("#### ⚠️ Not assigned")
+        st.dataframe(pd.DataFrame(unmet, columns=["Student", "Reason"]), use_container_width=True, hide_index=True)
+    if assignments:
+        pairs = pd.DataFrame(
+            [(name, users[name].get("stage", ""), teacher) for name, teacher in assignments.items()],
+            columns=["Student", "Stage", "New Teacher"],
+        )
+        pairs.index = pairs.index + 1
+        st.dataframe(pairs, use_container_width=True)
+
+        if st.button(f"💾 Save {len(assignments)} Pairings"):
+            # Anyone paired by someone else since the preview is skipped
+            count = assign_teachers(assignments)
+            del st.session_state["pairing_preview"]
+            st.session_state["pairing_msg"] = f"✅ Assigned {count} student(s)."
+            st.rerun()
 
-        save_users(users)  # ✅ Save once outside loop
-        st.success(f"✅ Assigned {len(selected_students)} student(s) to {teacher_name}")
 
 def assigned_students(teacher_name):
     st.subheader("👩‍🏫 My Students")
 
-    users = load_users()
-
     # Find all students assigned to this teacher (full name match)
-    my_students = [
-        {"name": fullname, "stage": info.get("stage", "N/A")}
-        for fullname, info in users.items()
-        if info.get("role", "").lower() == "student" and info.get("teacher") == teacher_name
-    ]
+    my_students = get_roster(teacher_name)
 
     if not my_students:
         st.info("📌 You have no students assigned yet.")
@@ -86,19 +132,17 @@ def assigned_teacher(student_name):
     """
     Display the teacher assigned to the student.
     """
-    if not os.path.exists(USER_FILE):
+    users = load_users()
+    if not users:
         st.info("No users found.")
         return
 
-    with open(USER_FILE, "r") as f:
-        users = json.load(f)
-
     student_record = users.get(student_name)
     if not student_record:
         st.warning("Your record was not found.")
         return
 
-    teacher_name = student_record.get("teacher")
+    teacher_name = teacher_of(student_name)
     if not teacher_name:
         st.info("No teacher assigned yet.")
     else:
@@ -0,0 +1,60 @@
+import streamlit as st
+import pandas as pd
+from storage import perf
+
+COLUMNS = {
+    "name": "Name",
+    "count": "Calls",
+    "p50_ms": "p50 (ms)",
+    "p95_ms": "p95 (ms)",
+    "max_ms": "Max (ms)",
+    "bytes_read": "Avg KB read",
+    "bytes_written": "Avg KB written",
+    "rows": "Avg rows",
+}
+
+
+def _frame(rows):
+    df = pd.DataFrame(rows, columns=["kind"] + list(COLUMNS)).drop(columns="kind")
+    df["bytes_read"] = df["bytes_read"] / 1024
+    df["bytes_written"] = df["bytes_written"] / 1024
+    df = df.rename(columns=COLUMNS).round(1)
+    df.index = df.index + 1
+    return df
+
+
+# --- Performance (Admin only) ---
+def performance():
+    st.subheader("⏱️ Performance")
+    st.caption(
+        f"Timings of menu actions and store loads/saves in this server process "
+        f"(last {perf.WINDOW} calls of each), slowest p95 first."
+    )
+
+    actions = perf.summary("action")
+    stores = perf.summary("store")
+    if not actions and not stores:
+        st.info("⚠️ Nothing has been timed yet. Open a few pages first.")
+        return
+
+    st.write("🧭 **Actions**")
+    st.dataframe(_frame(actions), use_container_width=True)
+    st.write("💾 **Stores**")
+    st.dataframe(_frame(stores), use_container_width=True)
+
+    # --- Latency histogram for one action/store ---
+    series = [("action", r["name"]) for r in actions] + [("store", r["name"]) for r in stores]
+    kind, name = st.selectbox(
+        "Histogram for", series, format_func=lambda s: f"{s[1]} ({s[0]})", key="perf_series"
+    )
+    buckets = pd.DataFrame(perf.histogram(kind, name), columns=["Time", "Calls"]).set_index("Time")
+    st.bar_chart(buckets, sort=False)
+
+    if perf.TRACE_FILE:
+        st.caption(f"Every call is also appended to `{perf.TRACE_FILE}`.")
+    else:
+        st.caption("Set RSS_PERF_TRACE to a file path to keep a JSON-lines trace of every call.")
+
+    if st.button("🔄 Reset timings"):
+        perf.reset()
+        st.rerun()
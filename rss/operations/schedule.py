@@ -1,49 +1,34 @@
 import streamlit as st
-import json
-import os
+from datetime import datetime, time
 import pandas as pd
-
-USER_FILE = "users.json"
-TIMETABLE_FILE = "timetable.json"
-
-# --- helpers ---
-def load_users():
-    if not os.path.exists(USER_FILE):
-        return {}
-    with open(USER_FILE, "r") as f:
-        return json.load(f)
-
-def load_timetable():
-    if not os.path.exists(TIMETABLE_FILE):
-        return {}
-    with open(TIMETABLE_FILE, "r") as f:
-        return json.load(f)
-
-def save_timetable(timetable):
-    with open(TIMETABLE_FILE, "w") as f:
-        json.dump(timetable, f, indent=4)
+from services.schedule import (
+    ScheduleConflict, add_timetable_slot, all_schedules_frame, build_availability, delete_timetable_slot,
+    free_at, generate_week, get_timetable, replace_timetable, student_timetable, teacher_schedule,
+    update_timetable_slot,
+)
+from services.roster import teacher_of
+from storage import perf
+from storage.timeslots import DAYS, format_slot, parse_slot
+from storage.user_store import students_by_stage, users_with_role
 
 
 def add_timetable_entry():
     st.subheader("🗓️ Create Schedule")
 
-    users = load_users()  # 🔹 load users to check teacher assignment
-
     with st.form("schedule_form", clear_on_submit=True):
         # --- Student input ---
         student_name = st.text_input("Enter student name:", key="student_input")
 
         # --- Auto-fill teacher name if student exists ---
-        assigned_teacher = ""
-        if student_name and student_name in users and "teacher" in users[student_name]:
-            assigned_teacher = users[student_name]["teacher"]
+        assigned_teacher = (teacher_of(student_name) or "") if student_name else ""
 
         # --- Teacher name field (auto-filled if available) ---
         teacher_name = st.text_input("Assigned Teacher", value=assigned_teacher, key="teacher_input")
 
         # --- Other inputs ---
-        day = st.selectbox("Select Day", ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"], key="day_input")
+        day = st.selectbox("Select Day", DAYS, key="day_input")
         time_slot = st.text_input("Enter Time Slot (e.g. 10:00 AM - 11:00 AM)", key="time_input")
+        allow_overlap = st.checkbox("Save even if it overlaps another booking", key="overlap_input")
 
         submitted = st.form_submit_button("Save Schedule")
 
@@ -60,121 +45,237 @@ def add_timetable_entry():
         if not time_slot.strip():
             st.error("⚠️ Please enter a valid time slot.")
             return
-        # --- Ensure timetable file exists ---
-        if not os.path.exists(TIMETABLE_FILE):
-            timetable = {"students": {}, "teachers": {}}
-        else:
-            with open(TIMETABLE_FILE, "r") as f:
-                timetable = json.load(f)
-
-        # --- Student schedule ---
-        if student_name not in timetable["students"]:
-            timetable["students"][student_name] = []
-
-        timetable["students"][student_name].append({
-            "day": day,
-            "time": time_slot,
-            "teacher": teacher_name
-        })
-
-        # --- Teacher schedule ---
-        if teacher_name not in timetable["teachers"]:
-            timetable["teachers"][teacher_name] = []
+        try:
+            add_timetable_slot(student_name, teacher_name, day, time_slot, allow_overlap)
+        except ScheduleConflict as e:
+            st.error("⚠️ This slot clashes with existing bookings:\n\n" + "\n".join(f"- {p}" for p in e.problems))
+            return
+        except ValueError as e:
+            st.error(f"⚠️ {e}")
+            return
 
-        timetable["teachers"][teacher_name].append({
-            "day": day,
-            "time": time_slot,
-            "student": student_name
-        })
+        st.success(f"✅ Added {student_name} with {teacher_name} on {day} at {format_slot(*parse_slot(time_slot))}")
+
+
+def generate_timetable():
+    """Admin page: build a whole week's timetable from the stored pairings."""
+    st.subheader("⚙️ Generate Timetable")
+    st.caption("Builds a clash-free week for every student from their assigned teacher. Saving replaces the current timetable.")
+
+    if "generate_msg" in st.session_state:
+        st.success(st.session_state.pop("generate_msg"))
+
+    teachers = sorted(users_with_role("Teacher"))
+
+    # --- Teacher availability ---
+    days = st.multiselect("School days", DAYS, default=DAYS[:5], key="gen_days")
+    col1, col2 = st.columns(2)
+    with col1:
+        default_from = st.time_input("Teachers available from", value=time(16, 0), step=900, key="gen_from")
+    with col2:
+        default_to = st.time_input("Until", value=time(19, 0), step=900, key="gen_to")
+    st.write("Different hours for some teachers (replaces the default on that day):")
+    overrides = st.data_editor(
+        pd.DataFrame({"Teacher": pd.Series(dtype=str), "Day": pd.Series(dtype=str), "Hours": pd.Series(dtype=str)}),
+        num_rows="dynamic",
+        column_config={
+            "Teacher": st.column_config.SelectboxColumn(options=teachers, required=True),
+            "Day": st.column_config.SelectboxColumn(options=DAYS, required=True),
+            "Hours": st.column_config.TextColumn(help="e.g. 9:00 AM - 12:00 PM"),
+        },
+        key="gen_overrides",
+    )
+
+    # --- Sessions per stage ---
+    stages = sorted(students_by_stage())
+    st.write("Sessions per student, by stage:")
+    per_stage = st.data_editor(
+        pd.DataFrame({"Stage": stages, "Sessions per week": [2] * len(stages), "Minutes": [60] * len(stages)}),
+        disabled=["Stage"],
+        column_config={
+            "Sessions per week": st.column_config.NumberColumn(min_value=0, step=1),
+            "Minutes": st.column_config.NumberColumn(min_value=1, step=1),
+        },
+        hide_index=True,
+        key="gen_sessions",
+    )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        group_size = st.number_input("Students per session", min_value=1, value=1, step=1, key="gen_group")
+    with col2:
+        rooms = st.number_input("Rooms (0 = no limit)", min_value=0, value=0, step=1, key="gen_rooms")
+
+    if st.button("⚙️ Generate"):
+        default_window = (default_from.hour * 60 + default_from.minute, default_to.hour * 60 + default_to.minute)
+        rows = overrides.dropna(subset=["Teacher", "Day"])[["Teacher", "Day", "Hours"]].itertuples(index=False)
+        try:
+            availability = build_availability(teachers, days, default_window, rows)
+        except ValueError as e:
+            st.error(f"⚠️ {e}")
+            return
 
-        # --- Save back ---
-        with open(TIMETABLE_FILE, "w") as f:
-            json.dump(timetable, f, indent=4)
+        counts = per_stage.fillna(0)
+        by_stage = {
+            stage: (int(count), int(minutes))
+            for stage, count, minutes in counts[["Stage", "Sessions per week", "Minutes"]].itertuples(index=False)
+        }
+
+        started = datetime.now()
+        slots, unmet = generate_week(
+            availability, by_stage,
+            group_size=int(group_size), rooms=int(rooms) or None, days=days,
+        )
+        elapsed = (datetime.now() - started).total_seconds()
+        st.session_state["generated_timetable"] = (slots, unmet, elapsed)
+
+    if "generated_timetable" not in st.session_state:
+        return
 
-        st.success(f"✅ Added {student_name} with {teacher_name} on {day} at {time_slot}")
+    slots, unmet, elapsed = st.session_state["generated_timetable"]
+    st.write(f"**{len(slots)}** sessions placed in {elapsed:.2f}s, **{len(unmet)}** requests could not be met.")
+    if unmet:
+        st.write("#### ⚠️ Not scheduled")
+        st.dataframe(
+            pd.DataFrame(unmet, columns=["Student", "Teacher", "Reason"]).fillna("—"),
+            use_container_width=True,
+        )
+    if slots:
+        preview = pd.DataFrame(slots, columns=["Student", "Teacher", "Day", "Time"])
+        preview.index = preview.index + 1
+        st.dataframe(preview, use_container_width=True)
+
+        current = len(get_timetable())
+        if st.button(f"💾 Save Timetable (replaces {current} existing slots)"):
+            replace_timetable(slots)
+            del st.session_state["generated_timetable"]
+            st.session_state["generate_msg"] = f"✅ Saved {len(slots)} sessions."
+            st.rerun()
 
 
 def view_student_timetable(student_name):
-    if not os.path.exists(TIMETABLE_FILE):
+    if not get_timetable():
         st.warning("⚠️ No timetable file found yet.")
         return
 
-    with open(TIMETABLE_FILE, "r") as f:
-        timetable = json.load(f)
-
-    student_records = timetable.get("students", {}).get(student_name, [])
+    student_records = student_timetable(student_name)
 
     if not student_records:
         st.warning(f"⚠️ No timetable found for {student_name}")
         return
 
     rows = [
-        {"Day": record.get("day", "N/A"),
-         "Time": record.get("time", "N/A"),
-         "Teacher": record.get("teacher", "N/A")}
+        {"Day": record["day"], "Time": record["time"], "Teacher": record["teacher"]}
         for record in student_records
     ]
 
     df = pd.DataFrame(rows)
     df.index = df.index + 1
     st.subheader(f"📅 Timetable for {student_name}")
-    st.dataframe(df, use_container_width=True)
+    st.dataframe(perf.count_rows(df), use_container_width=True)
 
 
 def view_teacher_schedule(teacher_name):
-    if not os.path.exists(TIMETABLE_FILE):
+    if not get_timetable():
         st.warning("⚠️ No timetable file found yet.")
         return
 
-    with open(TIMETABLE_FILE, "r") as f:
-        timetable = json.load(f)
-
-    teacher_records = timetable.get("teachers", {}).get(teacher_name, [])
+    teacher_records = teacher_schedule(teacher_name)
     if not teacher_records:
         st.warning(f"📂 No timetable found for {teacher_name}")
         return
 
     rows = [
-        {"Day": slot.get("day", ""),
-         "Time": slot.get("time", ""),
-         "Student": slot.get("student", "")}
+        {"Day": slot["day"], "Time": slot["time"], "Student": slot["student"]}
         for slot in teacher_records
     ]
 
     df = pd.DataFrame(rows)
     df.index = df.index + 1
     st.subheader(f"📅 Schedule for {teacher_name}")
-    st.dataframe(df, use_container_width=True)
+    st.dataframe(perf.count_rows(df), use_container_width=True)
 
 def view_all_schedules():
     """Admin views all schedules (students + teachers)."""
-    if not os.path.exists(TIMETABLE_FILE):
+    timetable = get_timetable()
+    if not timetable:
         st.info("No schedules found yet.")
         return
 
-    with open(TIMETABLE_FILE, "r") as f:
-        timetable = json.load(f)
-
-    rows = []
-    index = 1
-    for student, schedules in timetable.get("students", {}).items():
-        first_row = True
-        for sched in schedules:
-            rows.append({
-                "Index": index if first_row else "",
-                "Student": student if first_row else "",
-                "Day": sched["day"],
-                "Time": sched["time"],
-                "Teacher": sched["teacher"]
-            })
-            first_row = False
-        index += 1
-
-    # Convert to DataFrame
-    df = pd.DataFrame(rows)
-    if "Index" in df.columns:
-        df.set_index("Index", inplace=True)
+    df = all_schedules_frame()
 
     st.subheader("📅 All Schedules")
-    st.dataframe(df, use_container_width=True)
+    st.dataframe(perf.count_rows(df), use_container_width=True)
+
+    edit_slot(timetable)
+    who_is_free()
+
+
+def edit_slot(timetable):
+    """Move or delete one slot, picked by its Slot number."""
+    st.write("### ✏️ Edit or Delete a Slot")
+    if "edit_slot_msg" in st.session_state:
+        st.success(st.session_state.pop("edit_slot_msg"))
+    slot_id = st.number_input("Slot", min_value=1, step=1, value=None, key="edit_slot_id")
+    if slot_id is None:
+        return
+    slot = timetable.slots.get(int(slot_id))
+    if slot is None:
+        st.info(f"No slot #{slot_id}.")
+        return
+
+    st.write(f"**{slot['student']}** with **{slot['teacher']}** on {slot['day']} at {slot['time']}")
+    with st.form(f"edit_slot_{slot['id']}"):
+        # Keep a day the list does not know (old free-text entries) rather than silently picking Monday
+        days = DAYS if slot["day"] in DAYS else [slot["day"]] + DAYS
+        day = st.selectbox("Day", days, index=days.index(slot["day"]))
+        time_slot = st.text_input("Time Slot", value=slot["time"])
+        allow_overlap = st.checkbox("Save even if it overlaps another booking")
+        col1, col2 = st.columns(2)
+        with col1:
+            save = st.form_submit_button("💾 Save Changes")
+        with col2:
+            delete = st.form_submit_button("🗑️ Delete Slot")
+
+    if delete:
+        delete_timetable_slot(slot["id"])
+        st.session_state["edit_slot_msg"] = f"✅ Deleted slot #{slot['id']}"
+        st.rerun()
+    elif save:
+        try:
+            updated = update_timetable_slot(slot["id"], day=day, time_slot=time_slot, allow_overlap=allow_overlap)
+        except ScheduleConflict as e:
+            st.error("⚠️ This slot clashes with existing bookings:\n\n" + "\n".join(f"- {p}" for p in e.problems))
+            return
+        except ValueError as e:
+            st.error(f"⚠️ {e}")
+            return
+        if updated is None:  # deleted by someone else meanwhile; the rerun shows "No slot #..."
+            st.rerun()
+        st.session_state["edit_slot_msg"] = f"✅ Slot #{slot['id']} moved to {updated['day']} at {updated['time']}"
+        st.rerun()
+
+
+def who_is_free():
+    """Teachers and students with nothing booked at a given day and time."""
+    st.write("### 🔎 Who is free?")
+    col1, col2 = st.columns(2)
+    with col1:
+        day = st.selectbox("Day", DAYS, key="free_day")
+    with col2:
+        at = st.time_input("Time", value=None, step=900, key="free_time")
+    if at is None:
+        return
+
+    teachers, students, unparsed = free_at(day, at.hour * 60 + at.minute)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write(f"**Free teachers ({len(teachers)})**")
+        st.write(", ".join(teachers) or "None")
+    with col2:
+        st.write(f"**Free students ({len(students)})**")
+        st.write(", ".join(students) or "None")
+    if unparsed:
+        st.caption(f"⚠️ {unparsed} slots have times that could not be read and were ignored.")
 
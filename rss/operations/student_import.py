@@ -0,0 +1,62 @@
+"""
+Admin page for bulk student onboarding; the parsing and checks live in
+services.student_import.
+"""
+import streamlit as st
+import pandas as pd
+
+from services.student_import import OPTIONAL_COLUMNS, REQUIRED_COLUMNS, import_students, iter_rows, validate_rows
+
+
+# --- Import Students (Admin only) ---
+def student_import():
+    st.subheader("📥 Import Students")
+    st.caption(
+        "Upload a CSV or XLSX file with columns: "
+        + ", ".join(REQUIRED_COLUMNS)
+        + " (optional: " + ", ".join(OPTIONAL_COLUMNS) + "). "
+        "Rows without a password get a generated one."
+    )
+
+    if "student_import_result" in st.session_state:
+        imported, generated = st.session_state["student_import_result"]
+        st.success(f"✅ Imported {imported} students.")
+        if generated:
+            credentials = pd.DataFrame(generated, columns=["Full Name", "Username", "Password"])
+            st.download_button(
+                "⬇️ Download generated passwords",
+                credentials.to_csv(index=False),
+                file_name="student_passwords.csv",
+                mime="text/csv",
+            )
+            st.caption("The generated passwords are not kept once you click Done.")
+        # Plaintext passwords must not linger in the session for the rest of the visit
+        if st.button("✔️ Done", key="student_import_done"):
+            del st.session_state["student_import_result"]
+            st.rerun()
+        return
+
+    # A new key clears the uploader after a successful import
+    upload_key = f"student_import_file_{st.session_state.get('student_import_round', 0)}"
+    upload = st.file_uploader("Student list", type=["csv", "xlsx"], key=upload_key)
+    if upload is None:
+        return
+
+    try:
+        records, errors, generated = validate_rows(iter_rows(upload, upload.name))
+    except ValueError as e:
+        st.error(f"⚠️ {e}")
+        return
+
+    st.write(f"**{len(records)}** students ready to import, **{len(errors)}** rows with errors.")
+    if errors:
+        st.dataframe(
+            pd.DataFrame(errors, columns=["Row", "Full Name", "Error"]).set_index("Row"),
+            use_container_width=True,
+        )
+
+    if records and st.button(f"✅ Import {len(records)} students"):
+        count = import_students(records)  # one write for the whole file
+        st.session_state["student_import_result"] = (count, generated)
+        st.session_state["student_import_round"] = st.session_state.get("student_import_round", 0) + 1
+        st.rerun()
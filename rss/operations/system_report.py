@@ -1,17 +1,10 @@
 import streamlit as st
-import json
-import os
+from storage.user_store import load_users, users_with_role, students_by_stage
 
-USER_FILE = "users.json"
 
-def load_users():
-    if not os.path.exists(USER_FILE):
-        return {}
-    with open(USER_FILE, "r") as f:
-        try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return {}
+def _numbered(names):
+    """One markdown element for the whole list instead of one st.write per name."""
+    return "\n".join(f"{i}. {name}" for i, name in enumerate(names, start=1))
 
 def system_report():
     st.subheader("📊 System Report")
@@ -21,30 +14,26 @@ def system_report():
         st.info("⚠️ No users found in the system yet.")
         return
 
+    # Counts and member lists come from the aggregates kept by the user store,
+    # so this page does not scan users on each rerun.
+
     # --- Teachers ---
-    teachers = [name for name, info in users.items() if info.get("role", "").lower() == "teacher"]
+    teachers = users_with_role("Teacher")
     st.write(f"👩‍🏫 **Teachers:** {len(teachers)}")
     with st.expander("View Teachers"):
-        for i, teacher in enumerate(teachers, start=1):
-            st.write(f"{i}. {teacher}")
+        st.markdown(_numbered(teachers))
 
     # --- Students by Stage ---
-    stages = {}
-    for name, info in users.items():
-        if info.get("role", "").lower() == "student":
-            stage = info.get("stage", "Unassigned")
-            stages.setdefault(stage, []).append(name)
+    stages = students_by_stage()
 
     st.write("🎓 **Students by Stage:**")
     for stage, students in stages.items():
         st.write(f"- **{stage}**: {len(students)} student(s)")
         with st.expander(f"View {stage} Students"):
-            for i, student in enumerate(students, start=1):
-                st.write(f"{i}. {student}")
+            st.markdown(_numbered(students))
 
     # --- Admins ---
-    admins = [name for name, info in users.items() if info.get("role", "").lower() == "admin"]
+    admins = users_with_role("Admin")
     st.write(f"🛠️ **Admins:** {len(admins)}")
     with st.expander("View Admins"):
-        for i, admin in enumerate(admins, start=1):
-            st.write(f"{i}. {admin}")
+        st.markdown(_numbered(admins))
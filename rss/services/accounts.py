@@ -0,0 +1,64 @@
+"""
+Account checks and user lookups shared by the pages and the HTTP API.
+"""
+from ciper import caesar_decrypt
+from storage.user_records import label
+from storage.user_store import find_full_names, load_users, students_by_stage, users_with_role
+
+SHIFT = 3  # Caesar shift the stored passwords use
+
+
+def stage_for_age(age):
+    """Auto-assign a student's stage from their age bracket."""
+    if 5 <= age <= 7:
+        return "Adventurer"
+    elif 8 <= age <= 12:
+        return "Creator"
+    elif 12 <= age <= 18:
+        return "Innovator"
+    return "Unassigned"
+
+
+def authenticate(username, password):
+    """Return (full name, user record) for valid credentials, or None."""
+    matches = find_full_names(username)
+    if not matches:
+        return None
+    full_name = matches[0]
+    details = load_users()[full_name]
+    if caesar_decrypt(details.password or "", SHIFT) != password:
+        return None
+    return full_name, details
+
+
+def filter_users(role="All", stage="All", search=""):
+    """Return matching full names, narrowed through the store's role/stage indexes."""
+    users = load_users()
+    if stage != "All":
+        names = students_by_stage().get(stage, [])
+    elif role != "All":
+        names = users_with_role(role)
+    else:
+        names = list(users)
+
+    if search:
+        needle = search.strip().lower()
+        names = [
+            name for name in names
+            if needle in name.lower() or needle in users[name].get("username", "").lower()
+        ]
+    return names
+
+
+def profile(full_name):
+    """The public part of a user record (no password), or None for unknown users."""
+    details = load_users().get(full_name)
+    if details is None:
+        return None
+    return {
+        "name": full_name,
+        "username": details.username,
+        "role": label(details.role),
+        "stage": label(details.stage),
+        "teacher": details.teacher,
+    }
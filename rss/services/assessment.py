@@ -0,0 +1,143 @@
+"""
+Assessment service: the score store plus summaries and per-student views
+as plain data. No Streamlit here.
+"""
+import json
+import os
+from services.assessment_analytics import detail_frame, summary_frame
+from storage import perf, sqlite_store, versions
+from storage.assessment_scores import append_score, migrate, needs_migration
+from storage.coordination import atomic_write_json, file_lock, file_stamp
+from storage.user_store import students_of
+from storage.write_coalescer import WriteCoalescer
+
+ASSESSMENT_FILE = "assessments.json"
+ASSESSMENT_TYPES = ["C.A", "Exam"]
+
+
+def assessments_stamp():
+    if sqlite_store.enabled():
+        return ("sqlite", sqlite_store.data_version("assessments"))
+    return file_stamp(ASSESSMENT_FILE)
+
+
+versions.register("assessments", assessments_stamp)
+
+
+@perf.measured("store", "assessments.save")
+def save_assessments(assessments):
+    with file_lock(ASSESSMENT_FILE):
+        atomic_write_json(ASSESSMENT_FILE, assessments)
+    versions.bump("assessments")
+
+
+@perf.measured("store", "assessments.load")
+def load_assessments():
+    """
+    Return {student: {"C.A" | "Exam": {"scores": [int], "at": [timestamp]}}}.
+
+    Files still holding "77%" strings are converted once and written back.
+    """
+    if sqlite_store.enabled():
+        return sqlite_store.load_assessments()
+    if not os.path.exists(ASSESSMENT_FILE):
+        return {}
+    with open(ASSESSMENT_FILE, "r") as f:
+        perf.add_bytes_read(os.fstat(f.fileno()).st_size)
+        assessments = json.load(f)
+    if needs_migration(assessments):
+        assessments = migrate(assessments)
+        save_assessments(assessments)
+    return assessments
+
+
+@perf.measured("store", "assessments.save_batch")
+def _write_assessments(entries):
+    """Persist queued (student, type, score) entries in one write, in arrival order."""
+    if sqlite_store.enabled():
+        sqlite_store.add_assessments(entries)
+        versions.bump("assessments")
+        return
+
+    # Read-modify-write under the file lock so concurrent workers don't lose scores
+    with file_lock(ASSESSMENT_FILE):
+        assessments = load_assessments()
+        for student_name, assessment_type, score in entries:
+            append_score(assessments, student_name, assessment_type, score)
+        save_assessments(assessments)
+
+
+# Scores saved by several teachers within a few milliseconds share one rewrite.
+_assessment_writes = WriteCoalescer(_write_assessments)
+
+
+def add_assessment(student_name, assessment_type, score):
+    """Append one score (0-100) to a student's C.A or Exam list; returns once it is on disk."""
+    _assessment_writes.submit((student_name, assessment_type, score))
+
+
+# --- Reads, cached until the store version changes (shared: treat as read-only) ---
+@versions.cached("assessments")
+def get_assessments():
+    """{student: {"C.A" | "Exam": {"scores": [int], "at": [timestamp]}}} for the whole store."""
+    return load_assessments()
+
+
+@versions.cached("assessments")
+def _frames():
+    assessments = get_assessments()
+    return summary_frame(assessments), detail_frame(assessments)
+
+
+def assessment_summary_frame(search=None):
+    """Averages, 40/60 weighted final score and status per student; `search` filters names."""
+    df_summary = _frames()[0]
+    if search:
+        df_summary = df_summary[df_summary["Student"].str.contains(search, case=False, na=False, regex=False)]
+    return df_summary
+
+
+def assessment_detail_frame():
+    """The n-th C.A paired with the n-th Exam for every student."""
+    return _frames()[1]
+
+
+def student_assessments(student_name):
+    """
+    One student's scores.
+
+    Returns:
+        rows (list): [{"C.A", "Exam", "Average"}], the n-th C.A next to the n-th Exam (missing = 0)
+        overall (float | None): mean of all their scores
+    """
+    records = get_assessments().get(student_name, {})
+    ca_scores = records.get("C.A", {}).get("scores", [])
+    exam_scores = records.get("Exam", {}).get("scores", [])
+
+    rows = []
+    for i in range(max(len(ca_scores), len(exam_scores))):
+        ca = ca_scores[i] if i < len(ca_scores) else 0
+        exam = exam_scores[i] if i < len(exam_scores) else 0
+        rows.append({"C.A": ca, "Exam": exam, "Average": round((ca + exam) / 2, 2)})
+
+    all_scores = ca_scores + exam_scores
+    overall = sum(all_scores) / len(all_scores) if all_scores else None
+    return rows, overall
+
+
+# --- Writes ---
+def record_score(teacher_name, student_name, assessment_type, score):
+    """
+    Save one score for a student of this teacher.
+
+    Raises:
+        ValueError: if the student is not the teacher's, the type is unknown
+            or the score is outside 0-100
+    """
+    if student_name not in students_of(teacher_name):
+        raise ValueError(f"{student_name} is not assigned to {teacher_name}")
+    if assessment_type not in ASSESSMENT_TYPES:
+        raise ValueError(f"Unknown assessment type: {assessment_type}")
+    if not 0 <= score <= 100:
+        raise ValueError("Scores must be between 0 and 100")
+    add_assessment(student_name, assessment_type, score)
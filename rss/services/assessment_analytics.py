@@ -0,0 +1,105 @@
+"""
+Vectorized assessment analytics.
+
+All scores are flattened once into a long-form DataFrame (one row per
+score) and the per-student tables are computed with groupby/pivot and
+column arithmetic instead of Python loops over students.
+"""
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+CA_WEIGHT = 0.4
+EXAM_WEIGHT = 0.6
+PASS_MARK = 40
+
+
+def scores_frame(assessments):
+    """
+    Flatten {student: {type: {"scores": [...], "at": [...]}}} into columns
+    student, type, seq (position within that type), score and at.
+    """
+    # One Python step per (student, type) list; the per-score work is done by numpy.
+    kinds = {}
+    student_codes, type_codes, counts, score_lists, time_lists = [], [], [], [], []
+    for code, records in enumerate(assessments.values()):
+        for kind, series in records.items():
+            n = len(series["scores"])
+            student_codes.append(code)
+            type_codes.append(kinds.setdefault(kind, len(kinds)))
+            counts.append(n)
+            score_lists.append(series["scores"])
+            time_lists.append(series.get("at") or [None] * n)
+
+    counts = np.asarray(counts, dtype=np.int64)
+    total = int(counts.sum())
+    starts = np.cumsum(counts) - counts
+
+    return pd.DataFrame({
+        # Categoricals keep the file's student order and store each name once
+        "student": pd.Categorical.from_codes(
+            np.repeat(np.asarray(student_codes, dtype=np.int64), counts), categories=list(assessments)
+        ),
+        "type": pd.Categorical.from_codes(
+            np.repeat(np.asarray(type_codes, dtype=np.int64), counts), categories=list(kinds)
+        ),
+        "seq": np.arange(total) - np.repeat(starts, counts),
+        "score": np.fromiter(chain.from_iterable(score_lists), dtype=np.float64, count=total),
+        "at": np.array(list(chain.from_iterable(time_lists)), dtype=np.float64),  # None -> NaN
+    })
+
+
+def summary_frame(assessments):
+    """
+    Per-student average C.A, average Exam, 40/60 weighted final score and status.
+
+    Students with no scores keep 0 averages, an empty final score and "On Track".
+    """
+    df = scores_frame(assessments)
+    means = (
+        df.groupby(["student", "type"], observed=False)["score"].mean()
+        .unstack("type")
+        .reindex(index=list(assessments), columns=["C.A", "Exam"])
+    )
+    has_scores = means.notna().any(axis=1)
+    avg_ca = means["C.A"].fillna(0).round(2)
+    avg_exam = means["Exam"].fillna(0).round(2)
+    final = (avg_ca * CA_WEIGHT + avg_exam * EXAM_WEIGHT).round(2)
+
+    summary = pd.DataFrame({
+        "Student": means.index,
+        "Avg C.A (%)": avg_ca.to_numpy(),
+        "Avg Exam (%)": avg_exam.to_numpy(),
+        "Final Score (%)": final.where(has_scores, "").to_numpy(),
+        "Status": np.where(has_scores & (final < PASS_MARK), "⚠️ Needs Intervention", "✅ On Track"),
+    })
+    summary.index = np.arange(1, len(summary) + 1)
+    summary.index.name = "#"
+    return summary
+
+
+def detail_frame(assessments):
+    """
+    One row per (student, entry number) pairing the n-th C.A with the n-th Exam,
+    plus their average when both exist. Student name and number are shown on
+    each student's first row only.
+    """
+    df = scores_frame(assessments)
+    wide = (
+        df.pivot_table(index=["student", "seq"], columns="type", values="score", observed=True)
+        .reindex(columns=["C.A", "Exam"])
+        .reset_index()
+    )
+    final = (wide["C.A"] + wide["Exam"]) / 2
+
+    first_row = (wide["seq"] == 0).to_numpy()
+    number = wide["student"].cat.codes.to_numpy() + 1
+    detail = pd.DataFrame({
+        "#": pd.Series(number, dtype=object).where(first_row, ""),
+        "Student": np.where(first_row, wide["student"].astype(str), ""),
+        "C.A": wide["C.A"].astype("Int64").astype(object).where(wide["C.A"].notna(), ""),
+        "Exam": wide["Exam"].astype("Int64").astype(object).where(wide["Exam"].notna(), ""),
+        "Final": final.astype(object).where(final.notna(), ""),
+    })
+    return detail.set_index("#")
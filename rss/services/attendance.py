@@ -0,0 +1,210 @@
+"""
+Attendance service: the store plus the reads and writes the pages and
+other clients need, returning plain data (dicts, lists, DataFrames).
+No Streamlit here, so batch jobs and other front ends can use it too.
+"""
+import json
+import os
+import threading
+from contextlib import nullcontext
+from datetime import date
+import numpy as np
+import pandas as pd
+
+from storage import attendance_journal, perf, sqlite_store, versions
+from storage.attendance_bitmap import AttendanceBitmap
+from storage.coordination import atomic_write_json, file_lock, file_stamp
+from storage.user_store import students_of
+from storage.write_coalescer import WriteCoalescer
+
+ATTENDANCE_FILE = "attendance.json"
+STATUSES = ["Present", "Absent"]
+
+# Bitmap view of all attendance, kept across reruns and rebuilt only when the store changes.
+_bitmap_cache = {"stamp": None, "bitmap": None}
+_bitmap_lock = threading.Lock()
+
+
+# --- Helpers ---
+def init_attendance_file():
+    """Ensure the attendance file exists."""
+    if not os.path.exists(ATTENDANCE_FILE):
+        try:
+            with open(ATTENDANCE_FILE, "x") as f:  # "x": never clobber another worker's file
+                json.dump({}, f)  # start with empty JSON
+        except FileExistsError:
+            pass
+
+@perf.measured("store", "attendance.load")
+def load_attendance():
+    if sqlite_store.enabled():
+        return sqlite_store.load_attendance()
+    if attendance_journal.enabled():
+        return attendance_journal.load()
+    init_attendance_file()
+    with open(ATTENDANCE_FILE, "r") as f:
+        perf.add_bytes_read(os.fstat(f.fileno()).st_size)
+        return json.load(f)
+
+
+def attendance_stamp():
+    """Cheap fingerprint of the attendance store; changes on every write."""
+    if sqlite_store.enabled():
+        return ("sqlite", sqlite_store.data_version("attendance"))
+    if attendance_journal.enabled():
+        return ("journal",) + attendance_journal.stamp()
+    init_attendance_file()
+    return file_stamp(ATTENDANCE_FILE)
+
+
+def _write_lock():
+    """Cross-process lock for attendance writes (SQLite does its own locking)."""
+    if sqlite_store.enabled():
+        return nullcontext()
+    if attendance_journal.enabled():
+        return file_lock(attendance_journal.JOURNAL_FILE)
+    return file_lock(ATTENDANCE_FILE)
+
+
+versions.register("attendance", attendance_stamp)
+
+
+def load_attendance_bitmap():
+    """Return the AttendanceBitmap for the whole store, rebuilding it only after outside writes."""
+    with _bitmap_lock:
+        stamp = versions.version("attendance")
+        if stamp != _bitmap_cache["stamp"]:
+            _bitmap_cache["bitmap"] = AttendanceBitmap.from_records(load_attendance())
+            _bitmap_cache["stamp"] = stamp
+        return _bitmap_cache["bitmap"]
+
+
+@perf.measured("store", "attendance.save")
+def save_attendance(attendance):
+    if attendance_journal.enabled():
+        attendance_journal.write_snapshot(attendance)
+    else:
+        with file_lock(ATTENDANCE_FILE):
+            atomic_write_json(ATTENDANCE_FILE, attendance)
+    versions.bump("attendance")
+
+
+@perf.measured("store", "attendance.save_days")
+def _write_attendance_days(submissions):
+    """Persist queued (day, statuses) submissions in one write, in arrival order."""
+    # Holding the write lock means no other worker can slip a write in between
+    # the freshness check and ours, so patching the bitmap stays exact.
+    with _write_lock(), _bitmap_lock:
+        bitmap_current = _bitmap_cache["stamp"] == versions.version("attendance")
+
+        if sqlite_store.enabled():
+            before = sqlite_store.data_version("attendance")
+            sqlite_store.save_attendance_days(submissions)
+            bitmap_current = bitmap_current and sqlite_store.data_version("attendance") == before + 1
+            versions.bump("attendance")
+        elif attendance_journal.enabled():
+            attendance_journal.append_days(submissions)
+            versions.bump("attendance")
+        else:
+            attendance = load_attendance()  # fresh from disk, under the lock
+            for day, statuses in submissions:
+                for student, status in statuses.items():
+                    attendance.setdefault(student, {})[day] = status
+            save_attendance(attendance)  # bumps the version
+
+        # Apply our own write to the bitmap instead of rebuilding it. Readers
+        # use the cached bitmap without the lock, so patch a copy and swap it in.
+        if bitmap_current:
+            bitmap = _bitmap_cache["bitmap"].copy()
+            for day, statuses in submissions:
+                bitmap.set_day(day, statuses)
+            _bitmap_cache.update(bitmap=bitmap, stamp=versions.version("attendance"))
+
+
+# Teachers tend to submit at the same moment (start of class); their saves
+# are grouped into one rewrite of the store instead of one each.
+_attendance_writes = WriteCoalescer(_write_attendance_days)
+
+
+def save_attendance_day(day, statuses):
+    """
+    Save one day's attendance marks; returns once they are on disk.
+
+    Args:
+        day (str): ISO date the marks belong to
+        statuses (dict): {student full name: "Present" | "Absent"}
+    """
+    _attendance_writes.submit((day, dict(statuses)))
+
+
+# --- Reads, cached until the store version changes (shared: treat as read-only) ---
+@versions.cached("attendance")
+def get_attendance():
+    """{student: {date: status}} for the whole store."""
+    return load_attendance()
+
+
+@versions.cached("attendance")
+def attendance_records_frame():
+    """Every mark as a Student / Date / Status row."""
+    rows = []
+    for student, records in get_attendance().items():
+        for day, status in records.items():
+            rows.append({"Student": student, "Date": day, "Status": status})
+
+    df = pd.DataFrame(rows, columns=["Student", "Date", "Status"])
+    df.index = df.index + 1
+    return df
+
+
+def student_attendance(student_name):
+    """[(date, status)] recorded for one student, in the order they were saved."""
+    return list(get_attendance().get(student_name, {}).items())
+
+
+def attendance_range():
+    """(first, last) date with any marks, or (None, None)."""
+    return load_attendance_bitmap().recorded_range()
+
+
+def attendance_summary_frame(start=None, end=None):
+    """Days, presences, rate and status per student, optionally between two dates."""
+    bitmap = load_attendance_bitmap()
+    total_days, present_days = bitmap.counts(start, end)
+    percentage = bitmap.rates(start, end)
+
+    df_summary = pd.DataFrame({
+        "Student": bitmap.students,
+        "Total Days": total_days,
+        "Present": present_days,
+        "Absent": total_days - present_days,
+        "Attendance Rate (%)": np.char.mod("%.2f", percentage),
+        "Status": np.where(percentage < 75, "⚠️ Needs Intervention", "✅ On Track"),
+    })
+    df_summary.index = df_summary.index + 1  # Start index at 1
+    return df_summary
+
+
+# --- Writes ---
+def record_attendance_batch(teacher_name, statuses, day=None):
+    """
+    Save a teacher's marks for one day; returns how many were saved.
+
+    Args:
+        teacher_name (str): full name; every student must be assigned to this teacher
+        statuses (dict): {student full name: "Present" | "Absent"}
+        day (str | date): defaults to today
+
+    Raises:
+        ValueError: for students not on the teacher's roster or unknown statuses
+    """
+    roster = set(students_of(teacher_name))
+    strangers = [name for name in statuses if name not in roster]
+    if strangers:
+        raise ValueError(f"Not assigned to {teacher_name}: {', '.join(strangers)}")
+    invalid = sorted({status for status in statuses.values() if status not in STATUSES})
+    if invalid:
+        raise ValueError(f"Unknown status: {', '.join(map(str, invalid))}")
+    if statuses:
+        save_attendance_day(str(day or date.today()), statuses)
+    return len(statuses)
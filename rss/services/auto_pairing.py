@@ -0,0 +1,80 @@
+"""
+Automatic, load-balanced teacher-student pairing.
+
+Greedy with heaps: every stage has a min-heap of the teachers who take
+that stage, keyed on how full they are (students / capacity). Each student
+goes to the least-full eligible teacher; the teacher's new load is pushed
+to the heaps of all its stages and stale entries are skipped when popped.
+Stages with the least spare capacity per student are paired first, so
+teachers shared between stages are not used up by an easier stage.
+
+Pairing n students over t teachers and s stages costs O(n * s * log t).
+"""
+import heapq
+
+ANY_STAGE = None  # key for students without a stage; any teacher may take them
+
+
+def pair_students(students, teachers):
+    """
+    Assign students to teachers.
+
+    Args:
+        students (dict): {student: stage or None} to be paired
+        teachers (dict): {teacher: (capacity, stages or None for all, current student count)}
+
+    Returns:
+        assignments (dict): {student: teacher}
+        unmet (list): [(student, reason)] for students that could not be paired
+    """
+    load = {name: current for name, (_, _, current) in teachers.items()}
+    capacity = {name: cap for name, (cap, _, _) in teachers.items()}
+
+    by_stage = {}
+    for student, stage in students.items():
+        by_stage.setdefault(stage or ANY_STAGE, []).append(student)
+
+    def eligible(stage):
+        return [
+            name for name, (_, stages, _) in teachers.items()
+            if stage is ANY_STAGE or stages is None or stage in stages
+        ]
+
+    teachers_for = {stage: eligible(stage) for stage in by_stage}
+    teacher_stages = {}
+    for stage, names in teachers_for.items():
+        for name in names:
+            teacher_stages.setdefault(name, []).append(stage)
+
+    def key(name):
+        return (load[name] / capacity[name], load[name], name)
+
+    heaps = {
+        stage: [key(name) for name in names if load[name] < capacity[name]]
+        for stage, names in teachers_for.items()
+    }
+    for heap in heaps.values():
+        heapq.heapify(heap)
+
+    def spare_per_student(stage):
+        spare = sum(max(capacity[n] - load[n], 0) for n in teachers_for[stage])
+        return spare / len(by_stage[stage])
+
+    assignments, unmet = {}, []
+    for stage in sorted(by_stage, key=lambda s: (s is ANY_STAGE, spare_per_student(s))):
+        heap = heaps[stage]
+        for student in by_stage[stage]:
+            while heap and heap[0] != key(heap[0][2]):
+                heapq.heappop(heap)  # stale: the teacher's load changed since this entry
+            if not heap:
+                reason = "no teacher takes this stage" if not teachers_for[stage] else "all teachers for this stage are full"
+                unmet.append((student, reason))
+                continue
+
+            name = heapq.heappop(heap)[2]
+            assignments[student] = name
+            load[name] += 1
+            if load[name] < capacity[name]:
+                for other in teacher_stages[name]:
+                    heapq.heappush(heaps[other], key(name))
+    return assignments, unmet
@@ -0,0 +1,83 @@
+"""
+Roster service: who teaches whom, as plain data.
+"""
+import math
+
+from services.auto_pairing import pair_students
+from storage.user_records import label
+from storage.user_store import load_users, students_by_stage, students_of, unassigned_students, update_users, users_with_role
+
+STAGES = ["Adventurer", "Creator", "Innovator"]
+
+
+def get_roster(teacher_name):
+    """[{"name", "stage"}] for the students assigned to a teacher (full name)."""
+    users = load_users()
+    return [
+        {"name": name, "stage": label(users[name].stage) or "N/A"}
+        for name in students_of(teacher_name)
+    ]
+
+
+def teacher_of(student_name):
+    """The student's teacher's full name, or None (also for unknown students)."""
+    record = load_users().get(student_name)
+    return record.teacher if record else None
+
+
+def pairing_setup():
+    """
+    What the automatic pairing form starts from.
+
+    Returns:
+        teachers (list): teacher full names, sorted
+        students (list): students without a teacher
+        stages (list): STAGES plus any other stage students have
+        current (dict): {teacher: students already assigned}
+        capacity (int): a default capacity that fits everyone, evenly spread
+    """
+    teachers = sorted(users_with_role("Teacher"))
+    students = unassigned_students()
+    stages = STAGES + sorted(set(students_by_stage()) - set(STAGES))
+    current = {name: len(students_of(name)) for name in teachers}
+    total = sum(current.values()) + len(students)
+    capacity = max(math.ceil(total / len(teachers)), max(current.values())) if teachers else 0
+    return teachers, students, stages, current, capacity
+
+
+def plan_pairing(students, settings):
+    """
+    Pair students with teachers (nothing is saved).
+
+    Args:
+        students (list): full names of the students to place
+        settings (dict): {teacher: (capacity, stages taught)}
+
+    Returns:
+        assignments, unmet: as services.auto_pairing.pair_students(); save with assign_teachers()
+    """
+    users = load_users()
+    config = {
+        teacher: (capacity, set(stages), len(students_of(teacher)))
+        for teacher, (capacity, stages) in settings.items()
+    }
+    pupils = {name: users[name].get("stage") for name in students if name in users}
+    return pair_students(pupils, config)
+
+
+def assign_teachers(assignments):
+    """
+    Save {student: teacher} pairings in one write; returns how many were saved.
+
+    Students who are unknown or already have a teacher (someone else may
+    have paired them meanwhile) are skipped.
+    """
+    users = load_users()
+    changes = {
+        name: users[name].replace(teacher=teacher)
+        for name, teacher in assignments.items()
+        if name in users and not users[name].teacher
+    }
+    if changes:
+        update_users(changes)  # ✅ one save for the whole batch
+    return len(changes)
@@ -0,0 +1,338 @@
+"""
+Timetable service: the slot store, clash-checked writes and the
+per-student / per-teacher views as plain data. No Streamlit here.
+"""
+import json
+import os
+import threading
+from contextlib import nullcontext
+import pandas as pd
+from storage import perf, sqlite_store, versions
+from storage.coordination import atomic_write_json, file_lock, file_stamp
+from storage.timeslots import DAYS, TimetableIndex, format_slot, parse_slot
+from storage.timetable_slots import SlotTable, is_legacy
+from storage.user_records import label
+from storage.user_store import load_users, users_with_role
+
+TIMETABLE_FILE = "timetable.json"
+
+# Interval index over all slots, kept across reruns and rebuilt only when the store changes.
+_index_cache = {"stamp": None, "index": None}
+_index_lock = threading.Lock()
+
+
+class ScheduleConflict(ValueError):
+    """Raised when a new slot overlaps the teacher's or the student's existing bookings."""
+
+    def __init__(self, problems):
+        super().__init__("; ".join(problems))
+        self.problems = problems
+
+# --- helpers ---
+@perf.measured("store", "timetable.load")
+def load_timetable():
+    """Return the SlotTable (one record per slot); old two-view files are converted on first read."""
+    if sqlite_store.enabled():
+        return sqlite_store.load_timetable()
+    if not os.path.exists(TIMETABLE_FILE):
+        return SlotTable()
+    with open(TIMETABLE_FILE, "r") as f:
+        perf.add_bytes_read(os.fstat(f.fileno()).st_size)
+        data = json.load(f)
+    if is_legacy(data):
+        table = SlotTable.from_legacy(data)
+        save_timetable(table)
+        return table
+    return SlotTable.from_json(data)
+
+def timetable_stamp():
+    if sqlite_store.enabled():
+        return ("sqlite", sqlite_store.data_version("timetable"))
+    return file_stamp(TIMETABLE_FILE)
+
+versions.register("timetable", timetable_stamp)
+
+@perf.measured("store", "timetable.save")
+def save_timetable(table):
+    with file_lock(TIMETABLE_FILE):
+        atomic_write_json(TIMETABLE_FILE, table.to_json())
+    versions.bump("timetable")
+
+def _write_lock():
+    """Cross-process lock for timetable writes (SQLite does its own locking)."""
+    return nullcontext() if sqlite_store.enabled() else file_lock(TIMETABLE_FILE)
+
+def _current_index():
+    """The interval index for the current store version (caller holds _index_lock)."""
+    stamp = versions.version("timetable")
+    if stamp != _index_cache["stamp"]:
+        _index_cache["index"] = TimetableIndex.from_timetable(load_timetable())
+        _index_cache["stamp"] = stamp
+    return _index_cache["index"]
+
+def load_timetable_index():
+    """
+    Return the TimetableIndex for the whole store, rebuilding it only after outside writes.
+
+    Writes patch this index in place, so only use it where no write can run
+    at the same time; services here read it under _index_lock instead.
+    """
+    with _index_lock:
+        return _current_index()
+
+@perf.measured("store", "timetable.save_slot")
+def _write(write_json, write_sqlite):
+    """
+    Run one slot write and return (old slot, new slot).
+
+    JSON: a read-modify-write of the SlotTable under the file lock.
+    SQLite: a single indexed statement. The interval index is patched with
+    the change instead of rebuilt, unless another worker wrote at the same time.
+    Caller holds _write_lock() and _index_lock.
+    """
+    if sqlite_store.enabled():
+        before = sqlite_store.data_version("timetable")
+        old, new = write_sqlite()
+        if old is None and new is None:
+            return old, new
+        versions.bump("timetable")
+        own_write_only = sqlite_store.data_version("timetable") == before + 1
+    else:
+        table = load_timetable()
+        old, new = write_json(table)
+        if old is None and new is None:
+            return old, new
+        save_timetable(table)  # bumps the version
+        own_write_only = True
+
+    index = _index_cache["index"]
+    if not own_write_only or index is None:
+        _index_cache["stamp"] = None
+        return old, new
+    for slot, apply in ((old, index.remove), (new, index.add)):
+        if slot:
+            try:
+                apply(slot["student"], slot["teacher"], slot["day"], *parse_slot(slot["time"]))
+            except ValueError:  # a legacy slot the index never held
+                _index_cache["stamp"] = None
+                return old, new
+    _index_cache["stamp"] = versions.version("timetable")
+    return old, new
+
+def add_timetable_slot(student_name, teacher_name, day, time_slot, allow_overlap=False):
+    """
+    Store one slot; returns its id.
+
+    Args:
+        time_slot (str): e.g. "4:30 PM - 6:00 PM"; saved in that canonical form
+        allow_overlap (bool): save even if the teacher or student is already booked
+
+    Raises:
+        ValueError: if time_slot cannot be parsed
+        ScheduleConflict: if the slot overlaps an existing booking and allow_overlap is False
+    """
+    start, end = parse_slot(time_slot)
+    time_slot = format_slot(start, end)
+
+    # The index is checked and updated under the write lock, so no other
+    # worker can book the same interval in between.
+    with _write_lock(), _index_lock:
+        problems = _current_index().conflicts(student_name, teacher_name, day, start, end)
+        if problems and not allow_overlap:
+            raise ScheduleConflict(problems)
+
+        def add_sqlite():
+            slot_id = sqlite_store.add_timetable_slot(student_name, teacher_name, day, time_slot)
+            return None, {"id": slot_id, "student": student_name, "teacher": teacher_name, "day": day, "time": time_slot}
+
+        _, slot = _write(
+            lambda table: (None, table.add(student_name, teacher_name, day, time_slot)),
+            add_sqlite,
+        )
+        return slot["id"]
+
+@perf.measured("store", "timetable.replace")
+def replace_timetable(rows):
+    """Replace the whole timetable with (student, teacher, day, time) rows in one write."""
+    with _write_lock(), _index_lock:
+        if sqlite_store.enabled():
+            sqlite_store.replace_timetable(rows)
+            versions.bump("timetable")
+        else:
+            save_timetable(SlotTable.from_rows((i,) + tuple(row) for i, row in enumerate(rows, start=1)))
+        _index_cache["stamp"] = None  # rebuilt on next use
+
+def delete_timetable_slot(slot_id):
+    """Delete one slot by id; returns the deleted slot, or None if there was none."""
+    with _write_lock(), _index_lock:
+        _current_index()
+        old, _ = _write(
+            lambda table: (table.remove(slot_id), None) if slot_id in table.slots else (None, None),
+            lambda: (sqlite_store.delete_timetable_slot(slot_id), None),
+        )
+        return old
+
+def update_timetable_slot(slot_id, day=None, time_slot=None, teacher_name=None, allow_overlap=False):
+    """
+    Move a slot to another day/time or teacher; returns the updated slot, or None if there was none.
+
+    Raises:
+        ValueError: if time_slot cannot be parsed
+        ScheduleConflict: if the new slot overlaps another booking and allow_overlap is False
+    """
+    changes = {}
+    if day:
+        changes["day"] = day
+    if time_slot:
+        changes["time"] = format_slot(*parse_slot(time_slot))
+    if teacher_name:
+        changes["teacher"] = teacher_name
+
+    def check(current):
+        """Raise ScheduleConflict if the moved slot would clash with another booking."""
+        new = dict(current, **changes)
+        start, end = parse_slot(new["time"])
+
+        # The slot must not clash with itself, so take it out of a copy of the
+        # bookings involved; the shared index is never changed by a check.
+        local = index.subset(new["student"], new["teacher"], new["day"])
+        try:
+            local.remove(current["student"], current["teacher"], current["day"], *parse_slot(current["time"]))
+        except ValueError:  # a legacy slot the index never held
+            pass
+        problems = local.conflicts(new["student"], new["teacher"], new["day"], start, end)
+        if problems and not allow_overlap:
+            raise ScheduleConflict(problems)
+
+    # The current slot is read once: from the table _write loads anyway (JSON)
+    # or with a single-row lookup (SQLite), never by loading the whole timetable.
+    def update_json(table):
+        current = table.slots.get(slot_id)
+        if current is None:
+            return None, None
+        check(current)
+        return current, table.update(slot_id, **changes)
+
+    def update_sqlite():
+        current = sqlite_store.get_timetable_slot(slot_id)
+        if current is None:
+            return None, None
+        check(current)
+        return sqlite_store.update_timetable_slot(slot_id, **changes)
+
+    with _write_lock(), _index_lock:
+        index = _current_index()
+        _, slot = _write(update_json, update_sqlite)
+        return slot
+
+
+# --- Reads, cached until the store version changes (shared: treat as read-only) ---
+@versions.cached("timetable")
+def get_timetable():
+    """The SlotTable for the whole store."""
+    return load_timetable()
+
+def student_timetable(student_name):
+    """[{"id", "day", "time", "teacher"}] for one student, in the order they were booked."""
+    return [
+        {"id": slot["id"], "day": slot.get("day", "N/A"), "time": slot.get("time", "N/A"), "teacher": slot.get("teacher", "N/A")}
+        for slot in get_timetable().for_student(student_name)
+    ]
+
+def teacher_schedule(teacher_name):
+    """[{"id", "day", "time", "student"}] for one teacher."""
+    return [
+        {"id": slot["id"], "day": slot.get("day", ""), "time": slot.get("time", ""), "student": slot.get("student", "")}
+        for slot in get_timetable().for_teacher(teacher_name)
+    ]
+
+@versions.cached("timetable")
+def all_schedules_frame():
+    """Every slot grouped by student; name and number are shown on each student's first row."""
+    table = get_timetable()
+    rows = []
+    index = 1
+    for student in table.by_student:
+        first_row = True
+        for sched in table.for_student(student):
+            rows.append({
+                "Index": index if first_row else "",
+                "Student": student if first_row else "",
+                "Day": sched["day"],
+                "Time": sched["time"],
+                "Teacher": sched["teacher"],
+                "Slot": sched["id"]
+            })
+            first_row = False
+        index += 1
+
+    # Convert to DataFrame
+    df = pd.DataFrame(rows)
+    if "Index" in df.columns:
+        df.set_index("Index", inplace=True)
+    return df
+
+def free_at(day, minute):
+    """
+    Who has nothing booked at `minute` (minutes after midnight) on `day`.
+
+    Returns:
+        (free teachers, free students, number of slots whose time could not be read)
+    """
+    all_teachers, all_students = users_with_role("Teacher"), users_with_role("Student")
+    # Writes patch the index in place under the same lock
+    with _index_lock:
+        index = _current_index()
+        teachers = index.free(all_teachers, day, minute, role="teacher")
+        students = index.free(all_students, day, minute, role="student")
+        return teachers, students, len(index.unparsed)
+
+
+# --- Generation ---
+def build_availability(teachers, days, default_window, overrides=()):
+    """
+    {teacher: {day: [(start, end) minutes]}} for generate_week().
+
+    Args:
+        default_window (tuple): (start, end) minutes every teacher has on every day
+        overrides: (teacher, day, hours text) rows; the rows for one teacher and
+            day replace the default there and add up ("" = not available)
+
+    Raises:
+        ValueError: if the default window is empty or some hours cannot be read
+    """
+    if default_window[0] >= default_window[1]:
+        raise ValueError("The default hours end before they start.")
+    availability = {teacher: {day: [tuple(default_window)] for day in days} for teacher in teachers}
+    replaced = set()
+    for teacher, day, hours in overrides:
+        try:
+            window = parse_slot(hours) if isinstance(hours, str) and hours.strip() else None
+        except ValueError as e:
+            raise ValueError(f"{teacher}, {day}: {e}")
+        if (teacher, day) not in replaced:
+            availability.setdefault(teacher, {})[day] = []
+            replaced.add((teacher, day))
+        if window:
+            availability[teacher][day].append(window)
+    return availability
+
+
+def generate_week(availability, sessions_by_stage, group_size=1, rooms=None, days=DAYS[:5]):
+    """
+    Build a week for every student from their assigned teacher (nothing is saved).
+
+    Args:
+        availability (dict): {teacher: {day: [(start, end) minutes]}}
+        sessions_by_stage (dict): {stage or "Unassigned": (sessions per week, minutes)}
+
+    Returns:
+        slots, unmet: as services.timetable_generator.generate(); save slots with replace_timetable()
+    """
+    from services.timetable_generator import generate
+
+    users = load_users()
+    students = users_with_role("Student")
+    pairings = {name: users[name].teacher for name in students}
+    sessions = {name: sessions_by_stage.get(label(users[name].stage) or "Unassigned", (0, 0)) for name in students}
+    return generate(pairings, availability, sessions, group_size=group_size, rooms=rooms, days=days)
@@ -0,0 +1,149 @@
+"""
+Bulk student onboarding from a CSV or XLSX file, as plain data.
+
+Rows are streamed and validated in a single pass against the existing
+full-name and username sets (and against earlier rows of the same file);
+every accepted student is then saved with one import_students() call, so a
+term's intake is one write instead of one signup per student.
+"""
+import csv
+import io
+import secrets
+
+from services.accounts import SHIFT, stage_for_age
+from ciper import caesar_encrypt
+from storage.user_store import find_full_names, load_users, update_users, users_with_role
+
+REQUIRED_COLUMNS = ["full_name", "username", "age"]
+OPTIONAL_COLUMNS = ["teacher", "password"]
+
+# Header spellings accepted for each column (compared lower-cased, spaces/dashes as "_")
+_HEADER_ALIASES = {
+    "name": "full_name",
+    "fullname": "full_name",
+    "student": "full_name",
+    "student_name": "full_name",
+    "user_name": "username",
+    "assigned_teacher": "teacher",
+}
+
+MIN_AGE, MAX_AGE = 5, 18  # same range the signup form accepts
+
+
+def _column_name(header):
+    key = str(header or "").strip().lower().replace(" ", "_").replace("-", "_")
+    return _HEADER_ALIASES.get(key, key)
+
+
+def _iter_csv(file):
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    try:
+        yield from csv.reader(text)
+    finally:
+        text.detach()  # leave the upload's buffer open
+
+
+def _iter_xlsx(file):
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("Reading .xlsx files needs the openpyxl package; upload a CSV instead.")
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield ["" if cell is None else cell for cell in row]
+    finally:
+        workbook.close()
+
+
+def iter_rows(file, filename):
+    """
+    Stream {column: value} dicts from an uploaded CSV/XLSX file.
+
+    Yields:
+        (row number as shown in a spreadsheet, row dict)
+    """
+    cells = _iter_xlsx(file) if filename.lower().endswith(".xlsx") else _iter_csv(file)
+    header = [_column_name(h) for h in next(cells, [])]
+    missing = [c for c in REQUIRED_COLUMNS if c not in header]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+    for number, values in enumerate(cells, start=2):
+        if not any(str(v).strip() for v in values):
+            continue  # blank line
+        yield number, dict(zip(header, values))
+
+
+def _parse_age(value):
+    try:
+        age = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"age '{value}' is not a number")
+    if age != int(age) or not MIN_AGE <= age <= MAX_AGE:
+        raise ValueError(f"age must be a whole number from {MIN_AGE} to {MAX_AGE}")
+    return int(age)
+
+
+def validate_rows(rows):
+    """
+    Check every row and build the user records to save.
+
+    Args:
+        rows: iterable of (row number, row dict) from iter_rows()
+
+    Returns:
+        records (dict): {full name: user record} for the valid rows
+        errors (list): [(row number, full name, message)] for rejected rows
+        generated (list): [(full name, username, password)] for rows that had no password
+    """
+    users = load_users()
+    teachers = {name.lower(): name for name in users_with_role("Teacher")}
+    records, errors, generated = {}, [], []
+    seen_usernames = set()
+
+    for number, row in rows:
+        full_name = str(row.get("full_name", "")).strip().title()
+        username = str(row.get("username", "")).strip()
+        try:
+            if not full_name or not username:
+                raise ValueError("full name and username are required")
+            if full_name in users or full_name in records:
+                raise ValueError("full name already exists")
+            if find_full_names(username) or username in seen_usernames:
+                raise ValueError(f"username '{username}' is already taken")
+
+            age = _parse_age(row.get("age"))
+
+            teacher = str(row.get("teacher", "")).strip()
+            if teacher:
+                if teacher.lower() not in teachers:
+                    raise ValueError(f"teacher '{teacher}' not found")
+                teacher = teachers[teacher.lower()]
+        except ValueError as e:
+            errors.append((number, full_name, str(e)))
+            continue
+
+        password = str(row.get("password", "")).strip()
+        if not password:
+            password = secrets.token_urlsafe(6)
+            generated.append((full_name, username, password))
+
+        record = {
+            "username": username,
+            "password": caesar_encrypt(password, SHIFT),
+            "role": "Student",
+            "stage": stage_for_age(age),
+        }
+        if teacher:
+            record["teacher"] = teacher
+        records[full_name] = record
+        seen_usernames.add(username)
+
+    return records, errors, generated
+
+
+def import_students(records):
+    """Save the records validate_rows() accepted in one write; returns how many were saved."""
+    update_users(records)
+    return len(records)
@@ -0,0 +1,167 @@
+"""
+Weekly timetable generator.
+
+A greedy, most-constrained-first heuristic over a grid of GRID-minute
+ticks. Every (teacher, day) and (student, day) keeps its bookings as an
+int bitmask, so checking whether a session fits is a few AND operations.
+
+Rules:
+- a session happens inside one of the teacher's availability windows;
+- a teacher runs one session at a time, with up to `group_size` students
+  who share its day, start and length;
+- a student never has two sessions at once, and a student's sessions go
+  on different days while there are days left;
+- at most `rooms` sessions run at the same time (None = no limit).
+
+Teachers whose students need the largest share of their available time
+are scheduled first, and each round places one more session for every
+student, so a shortage is spread out instead of falling on the last
+students processed. Anything that cannot be placed is reported back
+rather than silently dropped.
+"""
+from storage.timeslots import DAYS, format_slot
+
+GRID = 15  # minutes per tick
+TICKS_PER_DAY = 24 * 60 // GRID
+
+
+def _window_mask(windows):
+    """Bits for the ticks that lie wholly inside the windows (rounded inward)."""
+    mask = 0
+    for start, end in windows:
+        first, last = -(-start // GRID), end // GRID
+        if last > first:
+            mask |= ((1 << (last - first)) - 1) << first
+    return mask
+
+
+class _Session:
+    __slots__ = ("teacher", "day", "start", "ticks", "students")
+
+    def __init__(self, teacher, day, start, ticks):
+        self.teacher, self.day, self.start, self.ticks = teacher, day, start, ticks
+        self.students = []
+
+    @property
+    def bits(self):
+        return ((1 << self.ticks) - 1) << self.start
+
+
+def generate(pairings, availability, sessions, group_size=1, rooms=None, days=DAYS[:5]):
+    """
+    Build a weekly timetable.
+
+    Args:
+        pairings (dict): {student: teacher or None}
+        availability (dict): {teacher: {day: [(start, end) minutes]}}
+        sessions (dict): {student: (sessions per week, minutes per session)}
+        group_size (int): students a teacher can take in one session
+        rooms (int): sessions that can run at the same time, or None
+        days (list): days that may be used
+
+    Returns:
+        slots (list): [(student, teacher, day, "4:00 PM - 5:00 PM")]
+        unmet (list): [(student, teacher, message)] for what could not be scheduled
+    """
+    unmet = []
+    demand = {}  # teacher -> [[student, sessions left, ticks]]
+    for student, teacher in pairings.items():
+        count, minutes = sessions.get(student, (0, 0))
+        if count <= 0:
+            continue
+        if minutes <= 0:
+            unmet.append((student, teacher, "session length must be positive"))
+        elif not teacher:
+            unmet.append((student, None, "no teacher assigned"))
+        elif not any(availability.get(teacher, {}).get(day) for day in days):
+            unmet.append((student, teacher, "teacher has no availability"))
+        else:
+            demand.setdefault(teacher, []).append([student, count, -(-minutes // GRID)])
+
+    free = {
+        (teacher, day): _window_mask(availability[teacher].get(day, []))
+        for teacher in demand for day in days
+    }
+    teacher_busy = {}
+    student_busy = {}
+    student_days = {}  # student -> days already used
+    running = [[0] * TICKS_PER_DAY for _ in days] if rooms else None
+    open_sessions = {}  # (teacher, day) -> sessions with seats left
+    day_load = {}  # (teacher, day) -> booked ticks, to spread a teacher's week
+    all_sessions = []
+
+    def capacity(teacher):
+        return sum(bin(free[(teacher, day)]).count("1") for day in days) * group_size
+
+    def needed(teacher):
+        return sum(count * ticks for _, count, ticks in demand[teacher])
+
+    # Most constrained teachers first: highest demand per available tick
+    order = sorted(demand, key=lambda t: needed(t) / max(capacity(t), 1), reverse=True)
+
+    def rooms_free(day_index, start, ticks):
+        counts = running[day_index]
+        return all(counts[i] < rooms for i in range(start, start + ticks))
+
+    def place(student, teacher, ticks):
+        used = student_days.setdefault(student, set())
+        fresh_days = [d for d in days if d not in used]
+        for day_pool in (fresh_days, [d for d in days if d in used]):
+            # 1) join a session that still has seats
+            for day in day_pool:
+                for session in open_sessions.get((teacher, day), []):
+                    if session.ticks == ticks and not student_busy.get((student, day), 0) & session.bits:
+                        return session
+            # 2) open a new one on the teacher's least-loaded day
+            for day in sorted(day_pool, key=lambda d: day_load.get((teacher, d), 0)):
+                window = free[(teacher, day)] & ~teacher_busy.get((teacher, day), 0)
+                blocked = student_busy.get((student, day), 0)
+                day_index = days.index(day)
+                need = (1 << ticks) - 1
+                start = 0
+                while window >> start:
+                    bits = need << start
+                    if window & bits == bits and not blocked & bits and (
+                        not rooms or rooms_free(day_index, start, ticks)
+                    ):
+                        session = _Session(teacher, day, start, ticks)
+                        teacher_busy[(teacher, day)] = teacher_busy.get((teacher, day), 0) | bits
+                        day_load[(teacher, day)] = day_load.get((teacher, day), 0) + ticks
+                        if rooms:
+                            for i in range(start, start + ticks):
+                                running[day_index][i] += 1
+                        all_sessions.append(session)
+                        if group_size > 1:
+                            open_sessions.setdefault((teacher, day), []).append(session)
+                        return session
+                    start += 1
+        return None
+
+    for teacher in order:
+        queue = demand[teacher]
+        round_number = 0
+        while queue:
+            round_number += 1
+            waiting = []
+            for entry in queue:
+                student, left, ticks = entry
+                session = place(student, teacher, ticks)
+                if session is None:
+                    unmet.append((student, teacher, f"no free time for {left} of {left + round_number - 1} session(s)"))
+                    continue
+                session.students.append(student)
+                if len(session.students) >= group_size and group_size > 1:
+                    open_sessions[(teacher, session.day)].remove(session)
+                student_busy[(student, session.day)] = student_busy.get((student, session.day), 0) | session.bits
+                student_days[student].add(session.day)
+                entry[1] -= 1
+                if entry[1]:
+                    waiting.append(entry)
+            queue = waiting
+
+    slots = [
+        (student, s.teacher, s.day, format_slot(s.start * GRID, (s.start + s.ticks) * GRID))
+        for s in all_sessions
+        for student in s.students
+    ]
+    return slots, unmet
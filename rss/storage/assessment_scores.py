@@ -0,0 +1,92 @@
+"""
+Typed assessment scores.
+
+assessments.json keeps, per student and assessment type, integer
+percentages with the time each one was recorded:
+
+    {"Ada Obi": {"C.A": {"scores": [77, 80], "at": [1696320000, 1696924800]}}}
+
+"at" holds Unix timestamps (null for entries migrated from the old format).
+Older files stored "77%" strings, sometimes a bare string instead of a list;
+migrate() converts those once so the views never parse strings.
+
+Convert a file by hand with:
+    python -m storage.assessment_scores [assessments.json]
+"""
+import json
+import sys
+import time
+
+from storage.coordination import atomic_write_json, file_lock
+
+
+def new_series():
+    return {"scores": [], "at": []}
+
+
+def parse_legacy_score(value):
+    """Turn an old "77%" / "77" / 77 entry into an int, or None if unreadable."""
+    try:
+        return int(round(float(str(value).replace("%", "").strip())))
+    except ValueError:
+        return None
+
+
+def is_typed(series):
+    return isinstance(series, dict) and "scores" in series
+
+
+def to_series(value):
+    """Convert one stored C.A/Exam value (any format) to a typed series."""
+    if is_typed(value):
+        return value
+    if isinstance(value, (str, int, float)):
+        value = [value]
+    series = new_series()
+    for item in value:
+        score = parse_legacy_score(item)
+        if score is not None:
+            series["scores"].append(score)
+            series["at"].append(None)
+    return series
+
+
+def needs_migration(assessments):
+    return any(
+        not is_typed(series)
+        for records in assessments.values()
+        for series in records.values()
+    )
+
+
+def migrate(assessments):
+    """Return a copy of `assessments` with every series in the typed format."""
+    return {
+        student: {kind: to_series(series) for kind, series in records.items()}
+        for student, records in assessments.items()
+    }
+
+
+def append_score(assessments, student_name, assessment_type, score, at=None):
+    """Add one integer score to a typed assessments dict in place."""
+    series = assessments.setdefault(student_name, {}).setdefault(assessment_type, new_series())
+    series["scores"].append(int(score))
+    series["at"].append(int(time.time()) if at is None else at)
+
+
+def migrate_file(path):
+    with file_lock(path):
+        with open(path, "r") as f:
+            assessments = json.load(f)
+        if not needs_migration(assessments):
+            return False
+        atomic_write_json(path, migrate(assessments))
+    return True
+
+
+if __name__ == "__main__":
+    target = sys.argv[1] if len(sys.argv) > 1 else "assessments.json"
+    if migrate_file(target):
+        print(f"✅ Converted {target} to typed scores.")
+    else:
+        print(f"{target} already uses typed scores.")
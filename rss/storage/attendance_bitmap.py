@@ -0,0 +1,157 @@
+"""
+Bitmap-backed attendance.
+
+Each student is one row of two packed bitsets over a shared day axis
+(one bit per calendar day from `start`): `recorded` marks days that have a
+mark at all, `present` marks days marked "Present". Totals, present
+counts and rates for any date range are popcounts over those rows, so a
+year of attendance for thousands of students is a few hundred KB and is
+summarized without touching individual records.
+"""
+from datetime import date, timedelta
+
+import numpy as np
+
+# Number of set bits in every possible byte, used to popcount packed rows.
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+# Extra days allocated whenever the axis grows, so daily appends rarely resize.
+_SLACK_DAYS = 64
+
+
+def _to_date(day):
+    return day if isinstance(day, date) else date.fromisoformat(day)
+
+
+class AttendanceBitmap:
+    def __init__(self, start=None, n_days=0):
+        self.start = start or date.today()
+        self.n_days = n_days
+        self.index = {}  # student full name -> row
+        self.students = []
+        self.recorded = np.zeros((0, self._row_bytes(n_days)), dtype=np.uint8)
+        self.present = np.zeros_like(self.recorded)
+
+    @staticmethod
+    def _row_bytes(n_days):
+        return (n_days + 7) // 8
+
+    @classmethod
+    def from_records(cls, attendance):
+        """Build from the {student: {"YYYY-MM-DD": "Present" | "Absent"}} dict."""
+        rows, days, present = [], [], []
+        for row, records in enumerate(attendance.values()):
+            for day, status in records.items():
+                rows.append(row)
+                days.append(day)
+                present.append(status == "Present")
+
+        ordinals = np.fromiter((date.fromisoformat(d).toordinal() for d in days), dtype=np.int64, count=len(days))
+        first = int(ordinals.min()) if len(days) else date.today().toordinal()
+        n_days = (int(ordinals.max()) - first + 1 + _SLACK_DAYS) if len(days) else _SLACK_DAYS
+
+        bitmap = cls(date.fromordinal(first), n_days)
+        bitmap.students = list(attendance)
+        bitmap.index = {name: row for row, name in enumerate(bitmap.students)}
+
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = ordinals - first
+        recorded = np.zeros((len(bitmap.students), n_days), dtype=bool)
+        recorded[rows, cols] = True
+        marked_present = np.zeros_like(recorded)
+        marked_present[rows, cols] = np.asarray(present, dtype=bool)
+        bitmap.recorded = np.packbits(recorded, axis=1)
+        bitmap.present = np.packbits(marked_present, axis=1)
+        return bitmap
+
+    def copy(self):
+        """An independent copy, for patching while readers keep using this one."""
+        bitmap = AttendanceBitmap(self.start, self.n_days)
+        bitmap.index = dict(self.index)
+        bitmap.students = list(self.students)
+        bitmap.recorded = self.recorded.copy()
+        bitmap.present = self.present.copy()
+        return bitmap
+
+    # --- Updates ---
+    def _resize(self, first, n_days):
+        """Move the axis to start at `first` and cover `n_days`, keeping existing bits."""
+        shift = (self.start - first).days
+        old = {}
+        for name in ("recorded", "present"):
+            bits = np.unpackbits(getattr(self, name), axis=1, count=self.n_days).astype(bool)
+            grown = np.zeros((bits.shape[0], n_days), dtype=bool)
+            grown[:, shift:shift + self.n_days] = bits
+            old[name] = np.packbits(grown, axis=1)
+        self.recorded, self.present = old["recorded"], old["present"]
+        self.start, self.n_days = first, n_days
+
+    def _row(self, student):
+        row = self.index.get(student)
+        if row is None:
+            row = len(self.students)
+            self.index[student] = row
+            self.students.append(student)
+            blank = np.zeros((1, self.recorded.shape[1]), dtype=np.uint8)
+            self.recorded = np.vstack([self.recorded, blank])
+            self.present = np.vstack([self.present, blank])
+        return row
+
+    def set(self, student, day, status):
+        """Record one mark, growing the student list or day axis if needed."""
+        day = _to_date(day)
+        offset = (day - self.start).days
+        if offset < 0:
+            self._resize(day, self.n_days - offset)
+            offset = 0
+        elif offset >= self.n_days:
+            self._resize(self.start, offset + 1 + _SLACK_DAYS)
+
+        row = self._row(student)
+        byte, bit = divmod(offset, 8)
+        mask = np.uint8(0x80 >> bit)  # packbits is big-endian within each byte
+        self.recorded[row, byte] |= mask
+        if status == "Present":
+            self.present[row, byte] |= mask
+        else:
+            self.present[row, byte] &= ~mask
+
+    def set_day(self, day, statuses):
+        for student, status in statuses.items():
+            self.set(student, day, status)
+
+    # --- Queries ---
+    def _range_mask(self, start=None, end=None):
+        first = 0 if start is None else max((_to_date(start) - self.start).days, 0)
+        last = self.n_days - 1 if end is None else min((_to_date(end) - self.start).days, self.n_days - 1)
+        bits = np.zeros(self.n_days, dtype=bool)
+        if first <= last:
+            bits[first:last + 1] = True
+        return np.packbits(bits)
+
+    def counts(self, start=None, end=None):
+        """Return (recorded days, present days) arrays, one entry per student, for [start, end]."""
+        if start is None and end is None:
+            return _POPCOUNT[self.recorded].sum(axis=1), _POPCOUNT[self.present].sum(axis=1)
+        mask = self._range_mask(start, end)
+        return (
+            _POPCOUNT[self.recorded & mask].sum(axis=1),
+            _POPCOUNT[self.present & mask].sum(axis=1),
+        )
+
+    def rates(self, start=None, end=None):
+        """Attendance percentage per student (0 where nothing was recorded)."""
+        total, present = self.counts(start, end)
+        return np.divide(present * 100.0, total, out=np.zeros(len(total)), where=total > 0)
+
+    def recorded_range(self):
+        """First and last day that has any mark, or (None, None)."""
+        any_mark = np.bitwise_or.reduce(self.recorded, axis=0)
+        days = np.flatnonzero(np.unpackbits(any_mark, count=self.n_days))
+        if not len(days):
+            return None, None
+        return self.start + timedelta(days=int(days[0])), self.start + timedelta(days=int(days[-1]))
+
+    @property
+    def nbytes(self):
+        return self.recorded.nbytes + self.present.nbytes
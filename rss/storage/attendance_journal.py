@@ -0,0 +1,143 @@
+"""
+Append-only journal for attendance writes.
+
+Each saved mark is appended to attendance.log as one compact line
+["student", "YYYY-MM-DD", "P" | "A"]. Reads rebuild the state from the
+attendance.json snapshot plus the log, and once the log passes
+COMPACT_BYTES it is folded into a fresh snapshot and truncated.
+
+Enable with RSS_ATTENDANCE_JOURNAL=1 (JSON backend only).
+"""
+import json
+import os
+import threading
+
+from storage import perf
+from storage.coordination import atomic_write_json, file_lock, file_stamp
+
+ENABLED = os.environ.get("RSS_ATTENDANCE_JOURNAL", "0") == "1"
+SNAPSHOT_FILE = "attendance.json"
+JOURNAL_FILE = "attendance.log"
+COMPACT_BYTES = 256 * 1024
+
+STATUS_CODES = {"Present": "P", "Absent": "A"}
+CODE_STATUSES = {code: status for status, code in STATUS_CODES.items()}
+
+# In-memory state: the snapshot it was built from and how far into the log we have read.
+# load() hands out _state["attendance"] without a lock, so it is never changed:
+# new log lines are applied to a copy that then replaces it.
+_state = {"snapshot": None, "offset": 0, "attendance": {}}
+_lock = threading.RLock()
+
+
+def enabled():
+    return ENABLED
+
+
+def stamp():
+    """Fingerprint of the journaled state: snapshot stamp plus log size."""
+    log_size = os.path.getsize(JOURNAL_FILE) if os.path.exists(JOURNAL_FILE) else 0
+    return (_snapshot_stamp(), log_size)
+
+
+def _snapshot_stamp():
+    return file_stamp(SNAPSHOT_FILE)
+
+
+def _read_snapshot():
+    if not os.path.exists(SNAPSHOT_FILE):
+        return {}
+    with open(SNAPSHOT_FILE, "r") as f:
+        perf.add_bytes_read(os.fstat(f.fileno()).st_size)
+        try:
+            return json.load(f)
+        except json.JSONDecodeError:
+            return {}
+
+
+def _replay(attendance, offset):
+    """
+    Apply log lines from byte `offset` onwards to a copy of attendance.
+
+    Only the outer dict and the students the lines touch are copied.
+    Returns (new attendance, new offset).
+    """
+    if not os.path.exists(JOURNAL_FILE):
+        return attendance, 0
+    attendance = dict(attendance)
+    copied = set()
+    with open(JOURNAL_FILE, "rb") as f:
+        start = f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # half-written tail; pick it up on the next read
+            try:
+                student, day, code = json.loads(line)
+            except ValueError:
+                offset += len(line)
+                continue
+            if student not in copied:
+                attendance[student] = dict(attendance.get(student, {}))
+                copied.add(student)
+            attendance[student][day] = CODE_STATUSES.get(code, code)
+            offset += len(line)
+        perf.add_bytes_read(f.tell() - start)
+    return attendance, offset
+
+
+def load():
+    """Return the current {student: {date: status}} state, reading only the new log tail."""
+    with _lock:
+        stamp = _snapshot_stamp()
+        log_size = os.path.getsize(JOURNAL_FILE) if os.path.exists(JOURNAL_FILE) else 0
+        if stamp != _state["snapshot"] or log_size < _state["offset"]:
+            # Snapshot replaced or log truncated (compaction): rebuild from scratch.
+            _state["attendance"] = _read_snapshot()
+            _state["snapshot"] = stamp
+            _state["offset"] = 0
+        if log_size > _state["offset"]:
+            attendance, offset = _replay(_state["attendance"], _state["offset"])
+            _state.update(attendance=attendance, offset=offset)
+        return _state["attendance"]
+
+
+def append(day, statuses):
+    """Append one submission's {student: status} marks for `day`."""
+    append_days([(day, statuses)])
+
+
+def append_days(submissions):
+    """Append several (day, {student: status}) submissions with a single fsync."""
+    lines = "".join(
+        json.dumps([student, day, STATUS_CODES.get(status, status)], separators=(",", ":")) + "\n"
+        for day, statuses in submissions
+        for student, status in statuses.items()
+    )
+    with file_lock(JOURNAL_FILE), _lock:
+        with open(JOURNAL_FILE, "a", encoding="utf-8") as f:
+            f.write(lines)
+            perf.add_bytes_written(len(lines.encode("utf-8")))
+            f.flush()
+            os.fsync(f.fileno())
+        log_size = os.path.getsize(JOURNAL_FILE)
+    if log_size >= COMPACT_BYTES:
+        compact()
+
+
+def write_snapshot(attendance):
+    """Replace the whole state: write a new snapshot and empty the log."""
+    with file_lock(JOURNAL_FILE), _lock:
+        atomic_write_json(SNAPSHOT_FILE, attendance)
+        # Replaying the log over the new snapshot is harmless, so a crash
+        # between these two steps loses nothing.
+        open(JOURNAL_FILE, "w").close()
+        _state["attendance"] = attendance
+        _state["snapshot"] = _snapshot_stamp()
+        _state["offset"] = 0
+
+
+def compact():
+    """Fold the log into a new attendance.json snapshot."""
+    # Hold the lock across read and write so no other worker appends in between
+    with file_lock(JOURNAL_FILE), _lock:
+        write_snapshot(load())
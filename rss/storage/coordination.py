@@ -0,0 +1,80 @@
+"""
+Coordination between several app processes sharing the same JSON files.
+
+- file_lock(path): advisory exclusive lock (fcntl.flock on <path>.lock) held
+  around every read-modify-write, so two workers saving at once cannot
+  lose each other's changes.
+- atomic_write_json(path, data): write to a temp file and rename it over
+  the target, so readers never see a half-written file.
+- file_stamp(path): (inode, mtime, size). Every atomic write creates a new
+  inode, so a changed stamp means some worker really rewrote the file;
+  in-memory caches compare stamps (one cheap stat) instead of re-reading.
+
+On systems without fcntl (Windows) the lock only covers threads of this process.
+"""
+import json
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+from storage import perf
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Per-path state: an RLock for threads in this process, plus how deeply the
+# owning thread has re-entered, so only the outermost entry takes the flock.
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+def file_stamp(path):
+    """Return (inode, mtime_ns, size) for path, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive lock for `path` across threads and processes (re-entrant)."""
+    with _locks_guard:
+        state = _locks.setdefault(os.path.abspath(path), {"lock": threading.RLock(), "depth": 0})
+    with state["lock"]:
+        state["depth"] += 1
+        try:
+            if fcntl is None or state["depth"] > 1:
+                yield
+                return
+            with open(path + ".lock", "a") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        finally:
+            state["depth"] -= 1
+
+
+def atomic_write_json(path, data, indent=4):
+    """Replace `path` with `data` as JSON in one rename."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=indent)
+            perf.add_bytes_written(f.tell())
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates 0600 files; keep the permissions the file had before
+        os.chmod(tmp, os.stat(path).st_mode & 0o777 if os.path.exists(path) else 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
@@ -0,0 +1,233 @@
+"""
+Streaming export of attendance, assessments and timetable slots to CSV or Parquet.
+
+Rows are produced one at a time straight from the store (SQLite cursors,
+the attendance journal, or the JSON files) and written in chunks of
+CHUNK_ROWS, so the flattened table never exists in memory as a whole.
+Exports can be narrowed to one teacher's students, one stage, and a date
+range (attendance day / assessment recording time).
+
+Run from the app folder, e.g. for a nightly job:
+    python -m storage.export attendance --format parquet --start 2026-01-01 -o attendance.parquet
+"""
+import argparse
+import csv
+import io
+import json
+import os
+from datetime import date, datetime, time
+from itertools import islice
+
+from storage import attendance_journal, sqlite_store
+from storage.assessment_scores import to_series
+from storage.timetable_slots import read_file as read_timetable
+from storage.user_store import students_by_stage, students_of
+
+ATTENDANCE_FILE = "attendance.json"
+ASSESSMENT_FILE = "assessments.json"
+TIMETABLE_FILE = "timetable.json"
+
+CHUNK_ROWS = 10_000
+
+COLUMNS = {
+    "attendance": ["student", "date", "status"],
+    "assessments": ["student", "type", "score", "recorded_at"],
+    "timetable": ["student", "teacher", "day", "time"],
+}
+FORMATS = ["csv", "parquet"]
+
+
+def _read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def _student_filter(teacher=None, stage=None):
+    """Set of student names allowed by the teacher/stage filters, or None for everyone."""
+    allowed = None
+    if teacher:
+        allowed = set(students_of(teacher))
+    if stage:
+        in_stage = set(students_by_stage().get(stage, []))
+        allowed = in_stage if allowed is None else allowed & in_stage
+    return allowed
+
+
+# --- Row sources ---
+def _query_rows(query, params=()):
+    """Stream rows from a SQLite query without fetching them all."""
+    cursor = sqlite_store.connect().execute(query, params)
+    while True:
+        rows = cursor.fetchmany(CHUNK_ROWS)
+        if not rows:
+            return
+        yield from rows
+
+
+def _assessment_records(assessments):
+    for student, kinds in assessments.items():
+        for kind, value in kinds.items():
+            series = to_series(value)  # also reads files not yet migrated to the typed format
+            yield from ((student, kind, score, at) for score, at in zip(series["scores"], series["at"]))
+
+
+def iter_attendance(students=None, start=None, end=None):
+    """Yield (student, date, status); start/end are inclusive ISO dates."""
+    start, end = (str(start) if start else None), (str(end) if end else None)
+    if sqlite_store.enabled():
+        query, params = "SELECT student, day, status FROM attendance WHERE 1=1", []
+        if start:
+            query, params = query + " AND day >= ?", params + [start]
+        if end:
+            query, params = query + " AND day <= ?", params + [end]
+        records = _query_rows(query + " ORDER BY student, day", params)
+    else:
+        attendance = attendance_journal.load() if attendance_journal.enabled() else _read_json(ATTENDANCE_FILE, {})
+        records = (
+            (student, day, status)
+            for student, days in attendance.items()
+            for day, status in days.items()
+        )
+
+    for student, day, status in records:
+        if students is not None and student not in students:
+            continue
+        if (start and day < start) or (end and day > end):
+            continue
+        yield student, day, status
+
+
+def iter_assessments(students=None, start=None, end=None):
+    """Yield (student, type, score, recorded_at); recorded_at is an ISO timestamp or None."""
+    low = datetime.combine(start, time.min).timestamp() if start else None
+    high = datetime.combine(end, time.max).timestamp() if end else None
+    if sqlite_store.enabled():
+        records = _query_rows("SELECT student, kind, score, recorded_at FROM assessments ORDER BY id")
+    else:
+        records = _assessment_records(_read_json(ASSESSMENT_FILE, {}))
+
+    for student, kind, score, at in records:
+        if students is not None and student not in students:
+            continue
+        if low is not None or high is not None:
+            # A date range only matches scores that know when they were recorded
+            if at is None or (low is not None and at < low) or (high is not None and at > high):
+                continue
+        recorded_at = datetime.fromtimestamp(at).isoformat(timespec="seconds") if at is not None else None
+        yield student, kind, score, recorded_at
+
+
+def iter_timetable(students=None, teacher=None):
+    """Yield (student, teacher, day, time), one row per slot."""
+    if sqlite_store.enabled():
+        records = _query_rows("SELECT student, teacher, day, time FROM timetable ORDER BY id")
+    else:
+        records = (
+            (slot["student"], slot["teacher"], slot["day"], slot["time"])
+            for slot in read_timetable(TIMETABLE_FILE)
+        )
+
+    for row in records:
+        if students is not None and row[0] not in students:
+            continue
+        if teacher and row[1] != teacher:
+            continue
+        yield row
+
+
+def iter_rows(kind, teacher=None, stage=None, start=None, end=None):
+    """Rows of one dataset ("attendance", "assessments" or "timetable") after filtering."""
+    if kind == "timetable":
+        # Slots carry their teacher, so match it directly instead of via the roster
+        return iter_timetable(_student_filter(stage=stage), teacher)
+    students = _student_filter(teacher, stage)
+    if kind == "attendance":
+        return iter_attendance(students, start, end)
+    if kind == "assessments":
+        return iter_assessments(students, start, end)
+    raise ValueError(f"Unknown dataset: {kind}")
+
+
+def _chunks(rows):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, CHUNK_ROWS))
+        if not chunk:
+            return
+        yield chunk
+
+
+# --- Writers ---
+def write_csv(kind, rows, out):
+    """Write rows as CSV to a binary file object; returns the row count."""
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="")
+    writer = csv.writer(text)
+    writer.writerow(COLUMNS[kind])
+    count = 0
+    for chunk in _chunks(rows):
+        writer.writerows(chunk)
+        count += len(chunk)
+    text.flush()
+    text.detach()  # hand the binary file back to the caller, still open
+    return count
+
+
+def write_parquet(kind, rows, out):
+    """Write rows as Parquet (one row group per chunk) to a binary file object; returns the row count."""
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ValueError("Parquet export needs the pyarrow package; use CSV instead.")
+
+    types = {"score": pa.int64()}
+    schema = pa.schema([(name, types.get(name, pa.string())) for name in COLUMNS[kind]])
+    count = 0
+    with pq.ParquetWriter(out, schema) as writer:
+        for chunk in _chunks(rows):
+            columns = list(zip(*chunk))
+            writer.write_table(pa.Table.from_arrays(
+                [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+                schema=schema,
+            ))
+            count += len(chunk)
+    return count
+
+
+def export(kind, fmt, out, teacher=None, stage=None, start=None, end=None):
+    """
+    Stream one filtered dataset to `out` (a path or binary file object).
+
+    Returns:
+        int: number of rows written
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt}")
+    rows = iter_rows(kind, teacher, stage, start, end)
+    write = write_parquet if fmt == "parquet" else write_csv
+    if isinstance(out, (str, os.PathLike)):
+        with open(out, "wb") as f:
+            return write(kind, rows, f)
+    return write(kind, rows, out)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export RSS data to CSV or Parquet.")
+    parser.add_argument("dataset", choices=list(COLUMNS))
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--teacher", help="only this teacher's students (full name)")
+    parser.add_argument("--stage", help="only students in this stage")
+    parser.add_argument("--start", type=date.fromisoformat, help="first date, YYYY-MM-DD")
+    parser.add_argument("--end", type=date.fromisoformat, help="last date, YYYY-MM-DD")
+    parser.add_argument("-o", "--output", help="output file (default: <dataset>.<format>)")
+    args = parser.parse_args()
+
+    output = args.output or f"{args.dataset}.{args.format}"
+    count = export(args.dataset, args.format, output, args.teacher, args.stage, args.start, args.end)
+    print(f"✅ Exported {count} {args.dataset} rows to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+One-shot migration of users.json, attendance.json, assessments.json and
+timetable.json into the SQLite database used when RSS_BACKEND=sqlite.
+
+Run from the app folder:
+    python -m storage.migrate_json [--db school.db]
+"""
+import argparse
+import json
+import os
+from storage import sqlite_store
+from storage.assessment_scores import to_series
+from storage.timetable_slots import FIELDS as SLOT_FIELDS, SlotTable
+
+
+def _read_json(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, "r") as f:
+        try:
+            return json.load(f)
+        except json.JSONDecodeError:
+            return default
+
+
+def migrate(users_file="users.json", attendance_file="attendance.json",
+            assessments_file="assessments.json", timetable_file="timetable.json"):
+    """Copy every JSON store into the database and return row counts per table."""
+    conn = sqlite_store.connect()
+    counts = {}
+
+    users = _read_json(users_file, {})
+    sqlite_store.replace_users(users)
+    counts["users"] = len(users)
+
+    attendance = _read_json(attendance_file, {})
+    rows = [
+        (student, day, status)
+        for student, records in attendance.items()
+        for day, status in records.items()
+    ]
+    with conn:
+        conn.execute("DELETE FROM attendance")
+        conn.executemany("INSERT INTO attendance (student, day, status) VALUES (?, ?, ?)", rows)
+        sqlite_store._bump(conn, "attendance")
+    counts["attendance"] = len(rows)
+
+    assessments = _read_json(assessments_file, {})
+    rows = []
+    for student, records in assessments.items():
+        for kind, value in records.items():
+            series = to_series(value)
+            rows.extend(
+                (student, kind, score, recorded_at)
+                for score, recorded_at in zip(series["scores"], series["at"])
+            )
+    with conn:
+        conn.execute("DELETE FROM assessments")
+        conn.executemany(
+            "INSERT INTO assessments (student, kind, score, recorded_at) VALUES (?, ?, ?, ?)", rows
+        )
+        sqlite_store._bump(conn, "assessments")
+    counts["assessments"] = len(rows)
+
+    # One row per slot (files still in the old two-view layout are de-duplicated)
+    table = SlotTable.from_json(_read_json(timetable_file, {}))
+    rows = [tuple(slot[field] for field in SLOT_FIELDS) for slot in table]
+    with conn:
+        conn.execute("DELETE FROM timetable")
+        conn.executemany("INSERT INTO timetable (student, teacher, day, time) VALUES (?, ?, ?, ?)", rows)
+        sqlite_store._bump(conn, "timetable")
+    counts["timetable"] = len(rows)
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate the JSON data files into SQLite.")
+    parser.add_argument("--db", default=sqlite_store.DB_FILE, help="database file to create or overwrite")
+    args = parser.parse_args()
+
+    sqlite_store.DB_FILE = args.db
+    counts = migrate()
+    for table, count in counts.items():
+        print(f"✅ {table}: {count} row(s)")
+    print(f"Done. Start the app with RSS_BACKEND=sqlite RSS_DB_FILE={args.db}")
+
+
+if __name__ == "__main__":
+    main()
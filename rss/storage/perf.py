@@ -0,0 +1,158 @@
+"""
+Timing of menu actions and store loads/saves.
+
+    with perf.timed("action", "Attendance Summary"):
+        ...
+
+records wall time, bytes read and written and DataFrame rows shown while
+the block runs. Stores report their I/O with add_bytes_read() /
+add_bytes_written() and pages with count_rows(); the numbers go to the
+innermost open block and are added to the enclosing ones when it ends,
+so an action's totals include the store loads it triggered.
+
+Each (kind, name) keeps its last WINDOW samples in memory, enough for
+percentiles and a latency histogram without growing over time. Set
+RSS_PERF_TRACE to a file path to also append every sample to it as one
+JSON line.
+
+Streamlit runs every session's script in its own thread, so the open
+blocks are tracked per thread.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+
+WINDOW = 500  # samples kept per action/store
+BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+TRACE_FILE = os.environ.get("RSS_PERF_TRACE") or None
+
+_samples = {}  # (kind, name) -> deque of (ms, bytes read, bytes written, rows)
+_counts = {}   # (kind, name) -> samples ever recorded
+_lock = threading.Lock()
+_trace_lock = threading.Lock()
+_local = threading.local()
+
+
+def _open_blocks():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+@contextmanager
+def timed(kind, name):
+    """Time the block and record it under (kind, name); yields the live sample dict."""
+    sample = {"kind": kind, "name": name, "bytes_read": 0, "bytes_written": 0, "rows": 0}
+    stack = _open_blocks()
+    stack.append(sample)
+    start = time.perf_counter()
+    try:
+        yield sample
+    finally:
+        sample["ms"] = (time.perf_counter() - start) * 1000
+        stack.pop()
+        if stack:
+            parent = stack[-1]
+            for key in ("bytes_read", "bytes_written", "rows"):
+                parent[key] += sample[key]
+        _record(sample)
+
+
+def measured(kind, name):
+    """Decorator form of timed()."""
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(kind, name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _add(key, amount):
+    stack = _open_blocks()
+    if stack:
+        stack[-1][key] += amount
+
+
+def add_bytes_read(amount):
+    _add("bytes_read", amount)
+
+
+def add_bytes_written(amount):
+    _add("bytes_written", amount)
+
+
+def count_rows(df):
+    """Count a DataFrame's rows towards the open action and return it unchanged."""
+    _add("rows", len(df))
+    return df
+
+
+def _record(sample):
+    key = (sample["kind"], sample["name"])
+    with _lock:
+        if key not in _samples:
+            _samples[key] = deque(maxlen=WINDOW)
+        _samples[key].append((sample["ms"], sample["bytes_read"], sample["bytes_written"], sample["rows"]))
+        _counts[key] = _counts.get(key, 0) + 1
+    if TRACE_FILE:
+        line = json.dumps(dict(sample, ts=round(time.time(), 3), ms=round(sample["ms"], 3)))
+        with _trace_lock, open(TRACE_FILE, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+
+
+def _percentile(ordered, pct):
+    return ordered[min(int(pct / 100 * len(ordered)), len(ordered) - 1)]
+
+
+def summary(kind=None):
+    """
+    One dict per action/store over its rolling window, slowest p95 first.
+
+    Keys: kind, name, count (ever), p50_ms, p95_ms, max_ms, and the mean
+    bytes_read, bytes_written and rows per call.
+    """
+    with _lock:
+        series = {key: list(values) for key, values in _samples.items() if kind is None or key[0] == kind}
+        counts = dict(_counts)
+
+    rows = []
+    for (series_kind, name), values in series.items():
+        times = sorted(v[0] for v in values)
+        n = len(values)
+        rows.append({
+            "kind": series_kind,
+            "name": name,
+            "count": counts[(series_kind, name)],
+            "p50_ms": _percentile(times, 50),
+            "p95_ms": _percentile(times, 95),
+            "max_ms": times[-1],
+            "bytes_read": sum(v[1] for v in values) / n,
+            "bytes_written": sum(v[2] for v in values) / n,
+            "rows": sum(v[3] for v in values) / n,
+        })
+    rows.sort(key=lambda r: r["p95_ms"], reverse=True)
+    return rows
+
+
+def histogram(kind, name):
+    """[(bucket label, samples)] for the rolling window of one action/store."""
+    with _lock:
+        times = [v[0] for v in _samples.get((kind, name), ())]
+    labels = [f"< {limit} ms" for limit in BUCKETS_MS] + [f"≥ {BUCKETS_MS[-1]} ms"]
+    counts = [0] * len(labels)
+    for ms in times:
+        index = next((i for i, limit in enumerate(BUCKETS_MS) if ms < limit), len(BUCKETS_MS))
+        counts[index] += 1
+    return list(zip(labels, counts))
+
+
+def reset():
+    with _lock:
+        _samples.clear()
+        _counts.clear()
@@ -0,0 +1,268 @@
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+from storage.timetable_slots import FIELDS as SLOT_FIELDS, SlotTable
+from storage.user_records import UserRecord
+
+# Set RSS_BACKEND=sqlite to keep school data in SQLite instead of the JSON files.
+BACKEND = os.environ.get("RSS_BACKEND", "json").lower()
+DB_FILE = os.environ.get("RSS_DB_FILE", "school.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    full_name TEXT PRIMARY KEY,
+    username  TEXT NOT NULL,
+    password  TEXT NOT NULL,
+    role      TEXT NOT NULL,
+    stage     TEXT,
+    teacher   TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
+CREATE INDEX IF NOT EXISTS idx_users_teacher ON users(teacher);
+
+CREATE TABLE IF NOT EXISTS attendance (
+    student TEXT NOT NULL,
+    day     TEXT NOT NULL,
+    status  TEXT NOT NULL,
+    PRIMARY KEY (student, day)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_attendance_day ON attendance(day);
+
+CREATE TABLE IF NOT EXISTS assessments (
+    id      INTEGER PRIMARY KEY,
+    student TEXT NOT NULL,
+    kind    TEXT NOT NULL,
+    score   INTEGER NOT NULL,
+    recorded_at INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_assessments_student ON assessments(student, kind);
+
+CREATE TABLE IF NOT EXISTS timetable (
+    id      INTEGER PRIMARY KEY,
+    student TEXT NOT NULL,
+    teacher TEXT NOT NULL,
+    day     TEXT NOT NULL,
+    time    TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_timetable_student ON timetable(student);
+CREATE INDEX IF NOT EXISTS idx_timetable_teacher ON timetable(teacher);
+
+CREATE TABLE IF NOT EXISTS versions (
+    store   TEXT PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+"""
+
+# One connection per thread; Streamlit runs each session in its own thread.
+_local = threading.local()
+
+
+def enabled():
+    """True when the app is configured to use the SQLite backend."""
+    return BACKEND == "sqlite"
+
+
+def connect():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_FILE, timeout=30)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        columns = [row[1] for row in conn.execute("PRAGMA table_info(assessments)")]
+        if "recorded_at" not in columns:  # databases created before typed scores
+            conn.execute("ALTER TABLE assessments ADD COLUMN recorded_at INTEGER")
+        _local.conn = conn
+    return conn
+
+
+def _bump(conn, store):
+    conn.execute(
+        "INSERT INTO versions (store, version) VALUES (?, 1) "
+        "ON CONFLICT(store) DO UPDATE SET version = version + 1",
+        (store,),
+    )
+
+
+def data_version(store):
+    """Return the write counter of a store ("users", "attendance", ...)."""
+    row = connect().execute("SELECT version FROM versions WHERE store = ?", (store,)).fetchone()
+    return row[0] if row else 0
+
+
+# --- Users ---
+def _user_row(full_name, info):
+    return (
+        full_name,
+        info.get("username", ""),
+        info.get("password", ""),
+        info.get("role", ""),
+        info.get("stage"),
+        info.get("teacher"),
+    )
+
+
+def load_users():
+    users = {}
+    rows = connect().execute("SELECT full_name, username, password, role, stage, teacher FROM users")
+    for full_name, username, password, role, stage, teacher in rows:
+        users[sys.intern(full_name)] = UserRecord(username, password, role, stage, teacher)
+    return users
+
+
+def upsert_users(records):
+    """Insert or replace only the given {full_name: info} records."""
+    conn = connect()
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO users (full_name, username, password, role, stage, teacher) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [_user_row(name, info) for name, info in records.items()],
+        )
+        _bump(conn, "users")
+
+
+def delete_users(full_names):
+    conn = connect()
+    with conn:
+        conn.executemany("DELETE FROM users WHERE full_name = ?", [(name,) for name in full_names])
+        _bump(conn, "users")
+
+
+def replace_users(users):
+    """Make the users table match the given dict exactly."""
+    conn = connect()
+    with conn:
+        conn.execute("DELETE FROM users")
+        conn.executemany(
+            "INSERT INTO users (full_name, username, password, role, stage, teacher) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [_user_row(name, info) for name, info in users.items()],
+        )
+        _bump(conn, "users")
+
+
+# --- Attendance ---
+def load_attendance():
+    attendance = {}
+    for student, day, status in connect().execute(
+        "SELECT student, day, status FROM attendance ORDER BY student, day"
+    ):
+        attendance.setdefault(student, {})[day] = status
+    return attendance
+
+
+def save_attendance_day(day, statuses):
+    """Write one day's {student: status} marks, touching only those rows."""
+    save_attendance_days([(day, statuses)])
+
+
+def save_attendance_days(submissions):
+    """Write several (day, {student: status}) submissions in one transaction."""
+    conn = connect()
+    with conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO attendance (student, day, status) VALUES (?, ?, ?)",
+            [
+                (student, day, status)
+                for day, statuses in submissions
+                for student, status in statuses.items()
+            ],
+        )
+        _bump(conn, "attendance")
+
+
+# --- Assessments ---
+def load_assessments():
+    assessments = {}
+    for student, kind, score, recorded_at in connect().execute(
+        "SELECT student, kind, score, recorded_at FROM assessments ORDER BY id"
+    ):
+        series = assessments.setdefault(student, {}).setdefault(kind, {"scores": [], "at": []})
+        series["scores"].append(score)
+        series["at"].append(recorded_at)
+    return assessments
+
+
+def add_assessment(student, kind, score):
+    add_assessments([(student, kind, score)])
+
+
+def add_assessments(entries):
+    """Insert several (student, kind, score) rows in one transaction."""
+    now = int(time.time())
+    conn = connect()
+    with conn:
+        conn.executemany(
+            "INSERT INTO assessments (student, kind, score, recorded_at) VALUES (?, ?, ?, ?)",
+            [(student, kind, int(score), now) for student, kind, score in entries],
+        )
+        _bump(conn, "assessments")
+
+
+# --- Timetable ---
+def load_timetable():
+    return SlotTable.from_rows(
+        connect().execute("SELECT id, student, teacher, day, time FROM timetable ORDER BY id")
+    )
+
+
+def _timetable_slot(conn, slot_id):
+    row = conn.execute("SELECT id, student, teacher, day, time FROM timetable WHERE id = ?", (slot_id,)).fetchone()
+    return dict(zip(("id",) + SLOT_FIELDS, row)) if row else None
+
+
+def get_timetable_slot(slot_id):
+    """One slot by id (a primary-key lookup), or None."""
+    return _timetable_slot(connect(), slot_id)
+
+
+def add_timetable_slot(student, teacher, day, time):
+    """Insert one slot and return its id."""
+    conn = connect()
+    with conn:
+        cursor = conn.execute(
+            "INSERT INTO timetable (student, teacher, day, time) VALUES (?, ?, ?, ?)",
+            (student, teacher, day, time),
+        )
+        _bump(conn, "timetable")
+    return cursor.lastrowid
+
+
+def replace_timetable(rows):
+    """Replace every slot with (student, teacher, day, time) rows in one transaction."""
+    conn = connect()
+    with conn:
+        conn.execute("DELETE FROM timetable")
+        conn.executemany("INSERT INTO timetable (student, teacher, day, time) VALUES (?, ?, ?, ?)", rows)
+        _bump(conn, "timetable")
+
+
+def delete_timetable_slot(slot_id):
+    """Delete one slot by id; returns the deleted slot, or None."""
+    conn = connect()
+    with conn:
+        slot = _timetable_slot(conn, slot_id)
+        if slot:
+            conn.execute("DELETE FROM timetable WHERE id = ?", (slot_id,))
+            _bump(conn, "timetable")
+    return slot
+
+
+def update_timetable_slot(slot_id, **changes):
+    """Change some of a slot's fields; returns (old slot, new slot), or (None, None)."""
+    conn = connect()
+    with conn:
+        old = _timetable_slot(conn, slot_id)
+        if not old:
+            return None, None
+        new = dict(old, **{k: v for k, v in changes.items() if k in SLOT_FIELDS})
+        conn.execute(
+            "UPDATE timetable SET student = ?, teacher = ?, day = ?, time = ? WHERE id = ?",
+            tuple(new[k] for k in SLOT_FIELDS) + (slot_id,),
+        )
+        _bump(conn, "timetable")
+    return old, new
@@ -0,0 +1,186 @@
+"""
+Structured time slots and per-person interval indexes for the timetable.
+
+Slots are stored as text ("4:30 PM - 6:00 PM"); parse_slot() turns them
+into (start, end) minutes after midnight. TimetableIndex keeps, for every
+(teacher, day) and (student, day), the booked intervals sorted by start
+together with a running maximum of their ends, so an overlap check or a
+"who is free at Friday 17:00" lookup is one bisect per person instead of a
+scan of the whole timetable.
+"""
+import re
+from bisect import bisect_left, bisect_right
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+_TIME = r"(\d{1,2})(?:[:.](\d{2}))?\s*([AaPp]\.?[Mm]\.?)?"
+_SLOT_RE = re.compile(rf"^\s*{_TIME}\s*(?:-|–|—|to)\s*{_TIME}\s*$")
+
+
+def _minutes(hour, minute, meridiem):
+    hour, minute = int(hour), int(minute or 0)
+    if minute > 59:
+        raise ValueError("minutes must be below 60")
+    if meridiem:
+        if not 1 <= hour <= 12:
+            raise ValueError("12-hour times must use hours 1-12")
+        hour = hour % 12 + (12 if meridiem[0].lower() == "p" else 0)
+    elif hour > 24 or (hour == 24 and minute):
+        raise ValueError("hours must be 0-24")
+    return hour * 60 + minute
+
+
+def parse_slot(text):
+    """
+    Parse "4:30 PM - 6:00 PM", "16:30-18:00", "4pm to 6pm", ... into minutes.
+
+    A missing AM/PM on the start is taken from the end ("4 - 6 PM"), and
+    a slot ending at midnight ("10 PM - 12 AM", "22:00-24:00") ends at 1440.
+
+    Returns:
+        (start, end): minutes after midnight, start < end
+
+    Raises:
+        ValueError: if the text is not a time range
+    """
+    match = _SLOT_RE.match(text or "")
+    if not match:
+        raise ValueError(f"'{text}' is not a time range like 10:00 AM - 11:00 AM")
+    h1, m1, ap1, h2, m2, ap2 = match.groups()
+    end = _minutes(h2, m2, ap2)
+    if end == 0:
+        end = 24 * 60  # nothing can end at the midnight that starts the day
+    start = _minutes(h1, m1, ap1 or ap2)
+    if ap2 and not ap1 and start >= end:
+        start = _minutes(h1, m1, "AM" if ap2[0].lower() == "p" else "PM")  # "11 - 1 PM"
+    if start >= end:
+        raise ValueError(f"'{text}' ends before it starts")
+    return start, end
+
+
+def format_minutes(minutes):
+    """540 -> "9:00 AM"."""
+    hour, minute = divmod(minutes % (24 * 60), 60)
+    return f"{hour % 12 or 12}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+def format_slot(start, end):
+    """Canonical text for a slot: "4:30 PM - 6:00 PM"."""
+    return f"{format_minutes(start)} - {format_minutes(end)}"
+
+
+class IntervalList:
+    """One person's bookings on one day, sorted by start."""
+
+    __slots__ = ("starts", "ends", "max_end", "labels")
+
+    def __init__(self):
+        self.starts = []
+        self.ends = []
+        self.max_end = []  # max_end[i] = max(ends[:i + 1])
+        self.labels = []
+
+    def overlaps(self, start, end):
+        """Labels of bookings overlapping [start, end)."""
+        hi = bisect_left(self.starts, end)  # only bookings starting before `end` can overlap
+        if not hi or self.max_end[hi - 1] <= start:
+            return []
+        return [self.labels[i] for i in range(hi) if self.ends[i] > start]
+
+    def is_busy(self, minute):
+        hi = bisect_right(self.starts, minute)
+        return bool(hi) and self.max_end[hi - 1] > minute
+
+    def add(self, start, end, label):
+        i = bisect_right(self.starts, start)
+        self.starts.insert(i, start)
+        self.ends.insert(i, end)
+        self.labels.insert(i, label)
+        self.max_end.insert(i, max(end, self.max_end[i - 1]) if i else end)
+        for j in range(i + 1, len(self.max_end)):
+            if self.max_end[j] >= self.max_end[j - 1]:
+                break
+            self.max_end[j] = self.max_end[j - 1]
+
+    def remove(self, start, end, label):
+        """Drop one booking; does nothing if it is not there."""
+        i = bisect_left(self.starts, start)
+        while i < len(self.starts) and self.starts[i] == start:
+            if self.ends[i] == end and self.labels[i] == label:
+                for name in self.__slots__:
+                    del getattr(self, name)[i]
+                for j in range(i, len(self.max_end)):
+                    self.max_end[j] = max(self.ends[j], self.max_end[j - 1]) if j else self.ends[j]
+                return
+            i += 1
+
+    def copy(self):
+        other = IntervalList()
+        for name in self.__slots__:
+            setattr(other, name, list(getattr(self, name)))
+        return other
+
+    def __len__(self):
+        return len(self.starts)
+
+
+class TimetableIndex:
+    def __init__(self):
+        self.teachers = {}  # (teacher, day) -> IntervalList of booked students
+        self.students = {}  # (student, day) -> IntervalList of teachers
+        self.unparsed = []  # (student, teacher, day, time) rows whose time could not be read
+
+    @classmethod
+    def from_timetable(cls, table):
+        """Build from a SlotTable (or any iterable of slot dicts)."""
+        index = cls()
+        for slot in table:
+            index.add_text(slot["student"], slot["teacher"], slot["day"], slot["time"])
+        return index
+
+    def add_text(self, student, teacher, day, time_text):
+        try:
+            start, end = parse_slot(time_text)
+        except ValueError:
+            self.unparsed.append((student, teacher, day, time_text))
+            return
+        self.add(student, teacher, day, start, end)
+
+    def add(self, student, teacher, day, start, end):
+        self.teachers.setdefault((teacher, day), IntervalList()).add(start, end, (start, end, student))
+        self.students.setdefault((student, day), IntervalList()).add(start, end, (start, end, teacher))
+
+    def subset(self, student, teacher, day):
+        """A new index holding copies of just this student's and teacher's bookings on `day`."""
+        index = TimetableIndex()
+        for table, copy, key in ((self.teachers, index.teachers, (teacher, day)), (self.students, index.students, (student, day))):
+            if key in table:
+                copy[key] = table[key].copy()
+        return index
+
+    def remove(self, student, teacher, day, start, end):
+        for table, key, label in (
+            (self.teachers, (teacher, day), (start, end, student)),
+            (self.students, (student, day), (start, end, teacher)),
+        ):
+            if key in table:
+                table[key].remove(start, end, label)
+
+    def conflicts(self, student, teacher, day, start, end):
+        """Human-readable clashes the slot would create, or [] if it fits."""
+        problems = []
+        bookings = self.teachers.get((teacher, day))
+        for s, e, other in bookings.overlaps(start, end) if bookings else []:
+            problems.append(f"{teacher} already teaches {other} on {day} at {format_slot(s, e)}")
+        bookings = self.students.get((student, day))
+        for s, e, other in bookings.overlaps(start, end) if bookings else []:
+            problems.append(f"{student} already has {other} on {day} at {format_slot(s, e)}")
+        return problems
+
+    def free(self, people, day, minute, role="teacher"):
+        """Those of `people` (teachers or students) with nothing booked at `minute` on `day`."""
+        table = self.teachers if role == "teacher" else self.students
+        return [
+            name for name in people
+            if (name, day) not in table or not table[(name, day)].is_busy(minute)
+        ]
@@ -0,0 +1,152 @@
+"""
+Normalized timetable: one record per slot, indexed by student and by teacher.
+
+timetable.json used to keep every slot twice (under "students" and under
+"teachers"), and nothing kept the two copies in step. It now holds
+
+    {"slots": [{"id": 1, "student": ..., "teacher": ..., "day": ..., "time": ...}],
+     "next_id": 2}
+
+and the per-student and per-teacher views are derived through the
+by_student / by_teacher indexes, so adding, editing or deleting a slot
+touches one record. Files in the old two-view layout are converted with
+from_legacy() on first read (python -m storage.timetable_slots does it
+up front).
+"""
+import json
+import os
+from collections import Counter
+
+from storage.coordination import atomic_write_json, file_lock
+
+FIELDS = ("student", "teacher", "day", "time")
+
+
+class SlotTable:
+    def __init__(self):
+        self.slots = {}       # id -> {"id", "student", "teacher", "day", "time"}
+        self.by_student = {}  # student -> {id: None} (dicts keep insertion order)
+        self.by_teacher = {}  # teacher -> {id: None}
+        self.next_id = 1
+
+    # --- Building ---
+    @classmethod
+    def from_rows(cls, rows, next_id=None):
+        """Build from (id, student, teacher, day, time) rows or slot dicts."""
+        table = cls()
+        for row in rows:
+            slot = dict(row) if isinstance(row, dict) else dict(zip(("id",) + FIELDS, row))
+            table._insert(slot)
+        table.next_id = max(next_id or 1, max(table.slots, default=0) + 1)
+        return table
+
+    @classmethod
+    def from_json(cls, data):
+        """Build from the file contents, converting the old two-view layout if needed."""
+        if is_legacy(data):
+            return cls.from_legacy(data)
+        return cls.from_rows(data.get("slots", []), data.get("next_id"))
+
+    @classmethod
+    def from_legacy(cls, timetable):
+        """
+        Convert {"students": {...}, "teachers": {...}}: one slot per student-side
+        entry, plus any teacher-side entries that have no student-side copy.
+        """
+        rows = [
+            (student, slot.get("teacher", ""), slot.get("day", ""), slot.get("time", ""))
+            for student, slots in timetable.get("students", {}).items()
+            for slot in slots
+        ]
+        seen = Counter(rows)
+        for teacher, slots in timetable.get("teachers", {}).items():
+            for slot in slots:
+                row = (slot.get("student", ""), teacher, slot.get("day", ""), slot.get("time", ""))
+                if seen[row]:
+                    seen[row] -= 1
+                else:
+                    rows.append(row)
+        return cls.from_rows((i,) + row for i, row in enumerate(rows, start=1))
+
+    def to_json(self):
+        return {"slots": list(self.slots.values()), "next_id": self.next_id}
+
+    # --- Updates ---
+    def _insert(self, slot):
+        self.slots[slot["id"]] = slot
+        self.by_student.setdefault(slot["student"], {})[slot["id"]] = None
+        self.by_teacher.setdefault(slot["teacher"], {})[slot["id"]] = None
+
+    def _unindex(self, slot):
+        for index, key in ((self.by_student, slot["student"]), (self.by_teacher, slot["teacher"])):
+            ids = index.get(key)
+            if ids is not None:
+                ids.pop(slot["id"], None)
+                if not ids:
+                    del index[key]
+
+    def add(self, student, teacher, day, time, slot_id=None):
+        """Add a slot and return it (slot_id is given when the database assigned it)."""
+        slot_id = slot_id or self.next_id
+        self.next_id = max(self.next_id, slot_id + 1)
+        slot = {"id": slot_id, "student": student, "teacher": teacher, "day": day, "time": time}
+        self._insert(slot)
+        return slot
+
+    def remove(self, slot_id):
+        """Delete a slot by id and return it (KeyError if there is none)."""
+        slot = self.slots.pop(slot_id)
+        self._unindex(slot)
+        return slot
+
+    def update(self, slot_id, **changes):
+        """Change some of a slot's fields; returns the new slot."""
+        old = self.slots[slot_id]
+        self._unindex(old)
+        slot = dict(old, **{k: v for k, v in changes.items() if k in FIELDS})
+        self._insert(slot)
+        return slot
+
+    # --- Views ---
+    def for_student(self, student):
+        return [self.slots[i] for i in self.by_student.get(student, {})]
+
+    def for_teacher(self, teacher):
+        return [self.slots[i] for i in self.by_teacher.get(teacher, {})]
+
+    def __iter__(self):
+        return iter(self.slots.values())
+
+    def __len__(self):
+        return len(self.slots)
+
+
+def is_legacy(data):
+    return "slots" not in data and ("students" in data or "teachers" in data)
+
+
+def read_file(path):
+    """Load a SlotTable from a JSON file (empty if the file does not exist)."""
+    if not os.path.exists(path):
+        return SlotTable()
+    with open(path, "r") as f:
+        return SlotTable.from_json(json.load(f))
+
+
+def migrate_file(path="timetable.json"):
+    """Rewrite a two-view timetable file in the normalized layout; returns the slot count or None."""
+    with file_lock(path):
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            data = json.load(f)
+        if not is_legacy(data):
+            return None
+        table = SlotTable.from_legacy(data)
+        atomic_write_json(path, table.to_json())
+        return len(table)
+
+
+if __name__ == "__main__":
+    count = migrate_file()
+    print("✅ timetable.json is already normalized." if count is None else f"✅ Converted {count} slot(s).")
@@ -0,0 +1,123 @@
+"""
+Compact in-memory user records.
+
+json.load gives every user a dict repeating the keys "username", "role",
+"stage" and "teacher" plus its own copy of each value string. A UserRecord
+keeps the same fields in __slots__ (no per-record dict), role and stage as
+shared Role / Stage enum members, and teacher names interned, so all the
+students of one teacher point at the same string (the user store interns
+the full-name keys too).
+
+Records are read-only Mappings: record["role"], record.get("stage") and
+dict(record, teacher=t) keep working and give plain strings, while code on
+hot paths reads attributes (record.role is Role.STUDENT). Change a user
+with record.replace(...) or by passing a plain dict to update_users().
+"""
+import sys
+from collections.abc import Mapping
+from enum import Enum
+
+
+class _Label(str, Enum):
+    """Enum whose members are also their label strings ("Student" == Role.STUDENT)."""
+    __str__ = str.__str__
+    __format__ = str.__format__
+
+    @classmethod
+    def _missing_(cls, value):
+        # "student" or "TEACHER" in older files map to the same member
+        if isinstance(value, str):
+            for member in cls:
+                if member.value.lower() == value.strip().lower():
+                    return member
+        return None
+
+
+class Role(_Label):
+    STUDENT = "Student"
+    TEACHER = "Teacher"
+    ADMIN = "Admin"
+
+
+class Stage(_Label):
+    ADVENTURER = "Adventurer"
+    CREATOR = "Creator"
+    INNOVATOR = "Innovator"
+    UNASSIGNED = "Unassigned"
+
+
+def _member(enum, value):
+    """The enum member for a label; labels the enum does not know are kept as (interned) text."""
+    if value is None or isinstance(value, enum):
+        return value
+    try:
+        return enum(value)
+    except ValueError:
+        return sys.intern(str(value))
+
+
+def label(value):
+    """Plain string for a Role / Stage member (other values pass through)."""
+    return value.value if isinstance(value, Enum) else value
+
+
+FIELDS = ("username", "password", "role", "stage", "teacher")
+
+
+class UserRecord(Mapping):
+    __slots__ = FIELDS + ("extra",)
+
+    def __init__(self, username=None, password=None, role=None, stage=None, teacher=None, extra=None):
+        self.username = username
+        self.password = password
+        self.role = _member(Role, role)
+        self.stage = _member(Stage, stage)
+        self.teacher = sys.intern(teacher) if teacher else None
+        self.extra = extra or None  # any other keys found in the file, kept for the round trip
+
+    @classmethod
+    def from_dict(cls, info):
+        if isinstance(info, cls):
+            return info
+        extra = {key: value for key, value in info.items() if key not in FIELDS}
+        return cls(**{key: info[key] for key in FIELDS if key in info}, extra=extra)
+
+    def to_dict(self):
+        return dict(self)
+
+    def replace(self, **changes):
+        """A new record with some fields changed."""
+        return UserRecord.from_dict(dict(self, **changes))
+
+    # --- Mapping view with the users.json keys ---
+    def __getitem__(self, key):
+        if key in FIELDS:
+            value = getattr(self, key)
+            if value is not None:
+                return label(value)
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __iter__(self):
+        for key in FIELDS:
+            if getattr(self, key) is not None:
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return f"UserRecord({self.to_dict()!r})"
+
+
+def from_json(users):
+    """{full name: info dict} -> {interned full name: UserRecord}."""
+    return {sys.intern(name): UserRecord.from_dict(info) for name, info in users.items()}
+
+
+def to_json(users):
+    """{full name: UserRecord} -> plain dicts for json.dump."""
+    return {name: dict(record) for name, record in users.items()}
@@ -0,0 +1,235 @@
+import json
+import os
+import threading
+from contextlib import nullcontext
+
+from storage import perf, sqlite_store, versions
+from storage.coordination import atomic_write_json, file_lock, file_stamp
+from storage.user_records import from_json, label, to_json
+
+USER_FILE = "users.json"
+
+# Parsed users ({full name: UserRecord}) and their indexes, shared by every
+# session of this server process. Streamlit reruns re-execute the page script
+# but keep imported modules, so this survives reruns and is only refreshed
+# when users.json changes. Published dicts are never changed: writers build
+# new ones and swap them in under _lock, so readers can iterate without it.
+#
+# Every index maps a key to {full name: None} in users.json order:
+#   "username": usernames can be shared, and find_full_names()[0] is the one login checks;
+#   "roster":   teacher full name -> students; students without a teacher sit under None;
+#   "role", "stage": report aggregates by lowercase role and by student stage.
+_cache = {"stamp": None, "users": {}, "indexes": {"username": {}, "roster": {}, "role": {}, "stage": {}}}
+_lock = threading.RLock()
+
+
+def init_user_file():
+    """Ensure the users file exists."""
+    if not os.path.exists(USER_FILE):
+        try:
+            with open(USER_FILE, "x") as f:  # "x": never clobber a file another worker just made
+                json.dump({}, f)
+        except FileExistsError:
+            pass
+
+
+def _file_stamp():
+    if sqlite_store.enabled():
+        return ("sqlite", sqlite_store.data_version("users"))
+    return file_stamp(USER_FILE)
+
+
+def users_stamp():
+    if not sqlite_store.enabled():
+        init_user_file()
+    return _file_stamp()
+
+
+versions.register("users", users_stamp)
+
+
+@perf.measured("store", "users.load")
+def _read_users():
+    if sqlite_store.enabled():
+        return sqlite_store.load_users()
+    with open(USER_FILE, "r") as f:
+        perf.add_bytes_read(os.fstat(f.fileno()).st_size)
+        try:
+            return from_json(json.load(f))
+        except json.JSONDecodeError:
+            return {}  # fallback if file is empty/corrupt
+
+
+def _write_users(users):
+    if sqlite_store.enabled():
+        sqlite_store.replace_users(users)
+    else:
+        atomic_write_json(USER_FILE, to_json(users))
+
+
+def _write_lock():
+    """Cross-process lock for users.json writes (SQLite does its own locking)."""
+    return nullcontext() if sqlite_store.enabled() else file_lock(USER_FILE)
+
+
+# --- Indexes (built on reload, copied and patched on every write) ---
+def _index_keys(info):
+    """The (index, key) entries a user is listed under."""
+    role = (info.role or "").lower()
+    keys = {("username", info.username), ("role", role)}
+    if role == "student":
+        keys |= {("roster", info.teacher), ("stage", label(info.stage) or "Unassigned")}
+    return keys
+
+
+def _build_indexes(users):
+    indexes = {"username": {}, "roster": {}, "role": {}, "stage": {}}
+    for full_name, info in users.items():
+        for name, key in _index_keys(info):
+            indexes[name].setdefault(key, {})[full_name] = None
+    return indexes
+
+
+def _patched_indexes(indexes, users, old_records, new_records):
+    """
+    New indexes for `users` after old_records became new_records ({full name:
+    UserRecord or None}). Only the changed member dicts are copied; every list
+    stays in dict order: unchanged entries keep their place, new users go last
+    (as in the dict), and a key an existing user moves to is rebuilt.
+    """
+    indexes = {name: dict(index) for name, index in indexes.items()}
+    copied = set()
+
+    def members(name, key):
+        if (name, key) not in copied:
+            indexes[name][key] = dict(indexes[name].get(key, {}))
+            copied.add((name, key))
+        return indexes[name].setdefault(key, {})
+
+    moved = set()
+    for full_name, old in old_records.items():
+        old_keys = _index_keys(old) if old else set()
+        new = new_records.get(full_name)
+        new_keys = _index_keys(new) if new else set()
+        for name, key in old_keys - new_keys:
+            group = members(name, key)
+            group.pop(full_name, None)
+            if not group:
+                del indexes[name][key]
+        if old:
+            moved |= new_keys - old_keys
+        else:
+            for name, key in new_keys:
+                members(name, key)[full_name] = None
+
+    for name, key in moved:
+        indexes[name][key] = {}
+        copied.add((name, key))
+    if moved:
+        for full_name, info in users.items():
+            for name, key in _index_keys(info) & moved:
+                indexes[name][key][full_name] = None
+    return indexes
+
+
+def load_users():
+    """
+    Return {full name: UserRecord}, re-parsing users.json only when its mtime or size changed.
+
+    Records read like the file's dicts (record["role"]) and have attributes
+    (record.role is Role.STUDENT). The returned dict is shared and must be
+    treated as read-only; change users through update_users() / delete_user(),
+    which publish a new dict instead of changing this one.
+    """
+    if not sqlite_store.enabled():
+        init_user_file()
+    with _lock:
+        stamp = _file_stamp()
+        if stamp != _cache["stamp"]:
+            users = _read_users()
+            _cache.update(users=users, indexes=_build_indexes(users), stamp=stamp)
+        return _cache["users"]
+
+
+def _index(name):
+    load_users()
+    return _cache["indexes"][name]
+
+
+@perf.measured("store", "users.save")
+def save_users(users):
+    """Replace the whole user base."""
+    users = from_json(users)
+    with _write_lock(), _lock:
+        _write_users(users)
+        _cache.update(users=users, indexes=_build_indexes(users), stamp=_file_stamp())
+        versions.bump("users")
+
+
+@perf.measured("store", "users.save")
+def update_users(records):
+    """
+    Add or change the given {full_name: info} records (plain dicts or UserRecords).
+
+    With the SQLite backend only those rows are written.
+    """
+    records = from_json(records)
+    # load_users() inside the lock picks up any write another worker just made
+    with _write_lock(), _lock:
+        current = load_users()
+        old_records = {full_name: current.get(full_name) for full_name in records}
+        users = dict(current, **records)
+        indexes = _patched_indexes(_cache["indexes"], users, old_records, records)
+
+        if sqlite_store.enabled():
+            sqlite_store.upsert_users(records)
+        else:
+            _write_users(users)
+        _cache.update(users=users, indexes=indexes, stamp=_file_stamp())
+        versions.bump("users")
+
+
+def delete_user(full_name):
+    delete_users([full_name])
+
+
+@perf.measured("store", "users.save")
+def delete_users(full_names):
+    """Remove several users with a single write."""
+    with _write_lock(), _lock:
+        current = load_users()
+        old_records = {full_name: current[full_name] for full_name in full_names if full_name in current}
+        users = {full_name: info for full_name, info in current.items() if full_name not in old_records}
+        indexes = _patched_indexes(_cache["indexes"], users, old_records, {})
+
+        if sqlite_store.enabled():
+            sqlite_store.delete_users(full_names)
+        else:
+            _write_users(users)
+        _cache.update(users=users, indexes=indexes, stamp=_file_stamp())
+        versions.bump("users")
+
+
+def find_full_names(username):
+    """Return the full names registered under a username (O(1) lookup)."""
+    return list(_index("username").get(username, {}))
+
+
+def students_of(teacher_name):
+    """Return the full names of students assigned to a teacher, without scanning users."""
+    return list(_index("roster").get(teacher_name, {}))
+
+
+def unassigned_students():
+    """Return the full names of students that have no teacher yet."""
+    return list(_index("roster").get(None, {}))
+
+
+def users_with_role(role):
+    """Return the full names of every user with a role ("Teacher", "Admin", ...)."""
+    return list(_index("role").get(role.lower(), {}))
+
+
+def students_by_stage():
+    """Return {stage: [student full names]} for every stage that has students."""
+    return {stage: list(members) for stage, members in _index("stage").items()}
@@ -0,0 +1,52 @@
+"""
+Per-store version numbers used as cache keys.
+
+A store's version is (local write counter, on-disk stamp). Every save path
+calls bump() so our own writes always change the version, even when the
+file's mtime and size happen to stay the same; the stamp (file mtime/size,
+journal size or SQLite write counter) catches writes from other processes.
+
+cached(store) keeps a no-argument function's result until that store's
+version changes, for derived data (parsed stores, frames) that readers share.
+"""
+import threading
+from functools import wraps
+
+_counters = {}
+_stampers = {}
+_lock = threading.Lock()
+
+
+def register(store, stamp):
+    """Tell the registry how to fingerprint a store ("users", "attendance", ...) on disk."""
+    _stampers[store] = stamp
+
+
+def bump(store):
+    with _lock:
+        _counters[store] = _counters.get(store, 0) + 1
+
+
+def version(store):
+    stamp = _stampers.get(store)
+    return (_counters.get(store, 0), stamp() if stamp else None)
+
+
+def cached(store):
+    """Decorator: reuse a no-argument function's result while `store` keeps the same version."""
+    def decorate(func):
+        memo = {"version": None, "value": None}
+        memo_lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper():
+            current = version(store)
+            with memo_lock:
+                if memo["version"] == current:
+                    return memo["value"]
+            value = func()
+            with memo_lock:
+                memo["version"], memo["value"] = current, value
+            return value
+        return wrapper
+    return decorate
@@ -0,0 +1,89 @@
+"""
+Group commit for bursty writes.
+
+Streamlit serves every session from a thread of the same process, so when
+many teachers press "Save" in the same moment their writes can share one
+read-modify-write of the file. The first caller to arrive becomes the
+leader: it waits WINDOW_SECONDS for others to queue up, then hands the
+whole batch to `flush` (which persists it once). Writes that queued up
+meanwhile are not the leader's job: leadership passes to the oldest
+waiting caller, who flushes the next batch, so nobody stays blocked
+writing other sessions' changes after their own are on disk. Every caller
+returns only after the batch holding its change has been written, and
+sees the batch's exception if it failed.
+
+Set RSS_WRITE_WINDOW_MS=0 to flush immediately (writes arriving during a
+flush are still grouped into the next one).
+"""
+import os
+import threading
+import time
+
+WINDOW_SECONDS = float(os.environ.get("RSS_WRITE_WINDOW_MS", "50")) / 1000
+
+
+class _Ticket:
+    __slots__ = ("wake", "done", "error")
+
+    def __init__(self):
+        self.wake = threading.Event()  # set when written, or when promoted to leader
+        self.done = False
+        self.error = None
+
+
+class WriteCoalescer:
+    def __init__(self, flush, window=None):
+        """
+        Args:
+            flush (callable): takes a list of queued mutations and writes them durably in one go
+            window (float): seconds the leader waits to collect a batch (default WINDOW_SECONDS)
+        """
+        self._flush = flush
+        self._window = WINDOW_SECONDS if window is None else window
+        self._lock = threading.Lock()
+        self._pending = []
+        self._leader_active = False
+        self.batches = 0  # flush count, for diagnostics
+        self.mutations = 0
+
+    def submit(self, mutation):
+        """Queue one mutation and block until it is durably written."""
+        ticket = _Ticket()
+        with self._lock:
+            self._pending.append((mutation, ticket))
+            lead = not self._leader_active
+            self._leader_active = True
+
+        if lead:
+            if self._window > 0:
+                time.sleep(self._window)
+            self._flush_batch()
+        else:
+            ticket.wake.wait()
+            if not ticket.done:  # promoted: our write is in the queue we now flush
+                self._flush_batch()
+
+        if ticket.error is not None:
+            raise ticket.error
+
+    def _flush_batch(self):
+        """Write everything queued (including the caller's own ticket), then pass leadership on."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        error = None
+        try:
+            self._flush([mutation for mutation, _ in batch])
+        except Exception as e:  # hand the failure to every caller in the batch
+            error = e
+        self.batches += 1
+        self.mutations += len(batch)
+        for _, ticket in batch:
+            ticket.error = error
+            ticket.done = True
+            ticket.wake.set()
+
+        with self._lock:
+            if self._pending:
+                self._pending[0][1].wake.set()  # oldest waiter leads the next batch
+            else:
+                self._leader_active = False
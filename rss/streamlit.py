@@ -1,5 +1,6 @@
 import streamlit as st
 from authentication import signup, login , reset_password
+from storage import perf
 
 st.set_page_config(page_title="School Management System", layout="centered")
 
@@ -76,6 +77,7 @@ def dashboard(user):
     - Handles special cases:
         * Profile → show user info
         * Logout → clear session + rerun app
+    - Times every other action (see storage/perf.py and the Admin "Performance" page).
     
     Args:
         user (User): The logged-in user object with attributes `name`, `role`, 
@@ -94,7 +96,8 @@ def dashboard(user):
         st.success("👋 You have been logged out.")
         st.rerun()
     else:
-        user.action(choice)
+        with perf.timed("action", choice):
+            user.action(choice)
 
 if __name__ == "__main__":
     main()
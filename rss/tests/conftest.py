@@ -0,0 +1,11 @@
+import pytest
+
+from storage import user_store
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Run the test in an empty data folder (the stores use paths relative to the cwd)."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setitem(user_store._cache, "stamp", None)
+    return tmp_path
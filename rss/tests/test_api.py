@@ -0,0 +1,98 @@
+import asyncio
+import base64
+
+import pytest
+
+from api import server
+from ciper import caesar_encrypt
+from services.accounts import SHIFT
+from services.schedule import add_timetable_slot
+from storage.user_store import save_users, update_users
+
+
+def _auth(username, password):
+    return "Basic " + base64.b64encode(f"{username}:{password}".encode()).decode()
+
+
+ADA = {"authorization": _auth("ada", "pw-ada")}
+TEACHER = {"authorization": _auth("t", "pw-t")}
+
+
+def _account(username, role, **info):
+    return dict(username=username, password=caesar_encrypt(f"pw-{username}", SHIFT), role=role, **info)
+
+
+@pytest.fixture
+def school(data_dir, monkeypatch):
+    monkeypatch.setattr(server, "_logins", {"version": None, "users": {}})
+    save_users({
+        "Mr T": _account("t", "Teacher"),
+        "Ada": _account("ada", "Student", teacher="Mr T"),
+        "Bob": _account("bob", "Student"),
+    })
+    add_timetable_slot("Ada", "Mr T", "Monday", "9:00 AM - 10:00 AM")
+    return data_dir
+
+
+def _respond(target, headers):
+    try:
+        return asyncio.run(server.respond("GET", target, headers))
+    except server.HTTPError as e:
+        return e.status, e.headers, str(e)
+
+
+def test_etag_gives_304_until_the_store_changes(school):
+    status, extra, payload = _respond("/api/timetable", ADA)
+    assert status == 200
+    assert [slot["day"] for slot in payload["slots"]] == ["Monday"]
+
+    cached = dict(ADA, **{"if-none-match": extra["ETag"]})
+    assert _respond("/api/timetable", cached) == (304, extra, None)
+
+    add_timetable_slot("Ada", "Mr T", "Tuesday", "9:00 AM - 10:00 AM")
+    status, changed, payload = _respond("/api/timetable", cached)
+    assert status == 200
+    assert changed["ETag"] != extra["ETag"]
+    assert len(payload["slots"]) == 2
+
+
+def test_who_may_see_whom(school):
+    assert _respond("/api/attendance?student=Bob", ADA)[0] == 403
+    assert _respond("/api/attendance?student=Ada", TEACHER)[0] == 200
+    assert _respond("/api/attendance?student=Bob", TEACHER)[0] == 403
+    assert _respond("/api/attendance", TEACHER)[0] == 400
+    assert _respond("/api/me", {"authorization": _auth("ada", "wrong")})[0] == 401
+    assert _respond("/api/me", {"authorization": "Basic not*base64"})[0] == 401
+
+
+def test_bad_requests_get_an_answer(school, monkeypatch):
+    def broken(student):
+        raise RuntimeError("boom")
+
+    monkeypatch.setitem(server.ROUTES, "/api/broken", ("users", broken))
+    monkeypatch.setattr(server.traceback, "print_exc", lambda: None)
+
+    async def exchange(raw):
+        listener = await asyncio.start_server(server.handle, "127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        async with listener:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(raw)
+            await writer.drain()
+            status_line = await reader.readline()
+            writer.close()
+            return status_line.split(b" ", 2)[1]
+
+    auth = TEACHER["authorization"].encode()
+    assert asyncio.run(exchange(b"GET //[ HTTP/1.1\r\n\r\n")) == b"400"
+    assert asyncio.run(exchange(b"GET /api/health HTTP/1.1\r\nContent-Length: -1\r\n\r\n")) == b"400"
+    assert asyncio.run(exchange(b"GET /api/broken?student=Ada HTTP/1.1\r\nAuthorization: " + auth + b"\r\n\r\n")) == b"500"
+
+
+def test_admins_can_list_users(school):
+    update_users({"Boss": _account("boss", "Admin")})
+    admin = {"authorization": _auth("boss", "pw-boss")}
+
+    status, _, payload = _respond("/api/users?role=Student", admin)
+    assert (status, payload) == (200, {"users": ["Ada", "Bob"]})
+    assert _respond("/api/users", TEACHER)[0] == 403
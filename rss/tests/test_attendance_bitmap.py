@@ -0,0 +1,62 @@
+from datetime import date
+
+from storage.attendance_bitmap import AttendanceBitmap
+
+RECORDS = {
+    "Ada": {"2026-03-02": "Present", "2026-03-03": "Absent", "2026-03-04": "Present"},
+    "Bob": {"2026-03-03": "Present"},
+}
+
+
+def _counts(bitmap, start=None, end=None):
+    total, present = bitmap.counts(start, end)
+    return dict(zip(bitmap.students, zip(total.tolist(), present.tolist())))
+
+
+def test_counts_over_all_days_and_a_range():
+    bitmap = AttendanceBitmap.from_records(RECORDS)
+    assert _counts(bitmap) == {"Ada": (3, 2), "Bob": (1, 1)}
+    assert _counts(bitmap, "2026-03-03", "2026-03-03") == {"Ada": (1, 0), "Bob": (1, 1)}
+    assert bitmap.rates().tolist() == [200 / 3, 100.0]
+    assert bitmap.recorded_range() == (date(2026, 3, 2), date(2026, 3, 4))
+
+
+def test_set_day_matches_a_rebuild():
+    bitmap = AttendanceBitmap.from_records(RECORDS)
+    bitmap.set_day("2026-03-03", {"Ada": "Present", "Cy": "Absent"})  # overwrite + new student
+    bitmap.set_day("2026-02-20", {"Bob": "Absent"})  # before the axis starts
+    bitmap.set_day("2026-09-01", {"Ada": "Absent"})  # past the slack
+
+    expected = {name: dict(days) for name, days in RECORDS.items()}
+    expected["Ada"].update({"2026-03-03": "Present", "2026-09-01": "Absent"})
+    expected["Bob"]["2026-02-20"] = "Absent"
+    expected["Cy"] = {"2026-03-03": "Absent"}
+    rebuilt = AttendanceBitmap.from_records(expected)
+
+    assert _counts(bitmap) == _counts(rebuilt) == {"Ada": (4, 3), "Bob": (2, 1), "Cy": (1, 0)}
+    assert _counts(bitmap, "2026-03-01", "2026-03-31") == _counts(rebuilt, "2026-03-01", "2026-03-31")
+    assert bitmap.recorded_range() == (date(2026, 2, 20), date(2026, 9, 1))
+
+
+def test_copy_is_independent():
+    bitmap = AttendanceBitmap.from_records(RECORDS)
+    patched = bitmap.copy()
+    patched.set_day("2026-01-01", {"Ada": "Present", "Cy": "Present"})
+
+    assert _counts(bitmap) == {"Ada": (3, 2), "Bob": (1, 1)}
+    assert bitmap.start == date(2026, 3, 2)
+    assert _counts(patched) == {"Ada": (4, 3), "Bob": (1, 1), "Cy": (1, 1)}
+
+
+def test_saving_publishes_a_new_bitmap(data_dir, monkeypatch):
+    from services import attendance
+
+    monkeypatch.setattr(attendance, "_bitmap_cache", {"stamp": None, "bitmap": None})
+    attendance.save_attendance(RECORDS)
+    before = attendance.load_attendance_bitmap()
+    attendance.save_attendance_day("2026-03-05", {"Ada": "Absent", "Cy": "Present"})
+
+    after = attendance.load_attendance_bitmap()
+    assert after is not before
+    assert _counts(before) == {"Ada": (3, 2), "Bob": (1, 1)}
+    assert _counts(after) == {"Ada": (4, 2), "Bob": (1, 1), "Cy": (1, 1)}
@@ -0,0 +1,65 @@
+import json
+import os
+
+import pytest
+
+from storage import attendance_journal as journal
+
+
+@pytest.fixture
+def fresh_journal(data_dir, monkeypatch):
+    monkeypatch.setattr(journal, "_state", {"snapshot": None, "offset": 0, "attendance": {}})
+    return data_dir
+
+
+def test_replay_reads_snapshot_plus_log(fresh_journal):
+    journal.write_snapshot({"Ada": {"2026-01-05": "Present"}})
+    journal.append("2026-01-06", {"Ada": "Absent", "Bob": "Present"})
+
+    assert journal.load() == {
+        "Ada": {"2026-01-05": "Present", "2026-01-06": "Absent"},
+        "Bob": {"2026-01-06": "Present"},
+    }
+    with open(journal.JOURNAL_FILE) as f:
+        assert [json.loads(line) for line in f] == [["Ada", "2026-01-06", "A"], ["Bob", "2026-01-06", "P"]]
+
+
+def test_replay_leaves_published_state_untouched(fresh_journal):
+    journal.append("2026-01-05", {"Ada": "Present"})
+    before = journal.load()
+    ada_before = before["Ada"]
+    journal.append("2026-01-06", {"Ada": "Absent", "Bob": "Present"})
+
+    after = journal.load()
+    assert after is not before
+    assert before == {"Ada": {"2026-01-05": "Present"}}
+    assert ada_before == {"2026-01-05": "Present"}
+    assert after["Ada"] == {"2026-01-05": "Present", "2026-01-06": "Absent"}
+
+
+def test_half_written_tail_waits_for_the_rest(fresh_journal):
+    journal.append("2026-01-05", {"Ada": "Present"})
+    with open(journal.JOURNAL_FILE, "a") as f:
+        f.write('["Bob","2026-01-05",')
+    assert journal.load() == {"Ada": {"2026-01-05": "Present"}}
+
+    with open(journal.JOURNAL_FILE, "a") as f:
+        f.write('"A"]\n')
+    assert journal.load()["Bob"] == {"2026-01-05": "Absent"}
+
+
+def test_compaction_folds_the_log_into_the_snapshot(fresh_journal, monkeypatch):
+    monkeypatch.setattr(journal, "COMPACT_BYTES", 200)
+    for day in range(1, 11):
+        journal.append(f"2026-01-{day:02d}", {"Ada": "Present", "Bob": "Absent"})
+
+    assert os.path.getsize(journal.JOURNAL_FILE) < 200
+    with open(journal.SNAPSHOT_FILE) as f:
+        snapshot = json.load(f)
+    state = journal.load()
+    assert len(state["Ada"]) == len(state["Bob"]) == 10
+    assert set(snapshot["Ada"]) <= set(state["Ada"])
+
+    # Another process starting from the files sees the same state
+    monkeypatch.setattr(journal, "_state", {"snapshot": None, "offset": 0, "attendance": {}})
+    assert journal.load() == state
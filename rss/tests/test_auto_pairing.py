@@ -0,0 +1,64 @@
+from collections import Counter
+
+from services.auto_pairing import pair_students
+
+
+def test_capacity_is_never_exceeded_and_load_is_balanced():
+    students = {f"S{i}": "Creator" for i in range(10)}
+    teachers = {"A": (6, None, 2), "B": (6, None, 0), "C": (2, None, 0)}
+    assignments, unmet = pair_students(students, teachers)
+
+    per_teacher = Counter(assignments.values())
+    assert len(assignments) == 10 and unmet == []
+    assert all(per_teacher[name] + current <= cap for name, (cap, _, current) in teachers.items())
+    # A already had 2 students, so B takes more of the new ones
+    assert per_teacher["B"] > per_teacher["A"]
+
+
+def test_full_teachers_leave_students_unmet():
+    assignments, unmet = pair_students({"S1": None, "S2": None}, {"A": (3, None, 2)})
+    assert len(assignments) == 1
+    assert [reason for _, reason in unmet] == ["all teachers for this stage are full"]
+
+
+def test_stage_limits_are_respected():
+    students = {"Ada": "Adventurer", "Bob": "Innovator", "Cy": "Creator", "Di": None}
+    teachers = {"A": (5, {"Adventurer"}, 0), "I": (5, {"Innovator"}, 0)}
+    assignments, unmet = pair_students(students, teachers)
+
+    assert assignments["Ada"] == "A"
+    assert assignments["Bob"] == "I"
+    assert "Di" in assignments  # no stage: anyone may take them
+    assert unmet == [("Cy", "no teacher takes this stage")]
+
+
+def test_scarce_stages_are_paired_first():
+    # T1 is the only teacher for Innovators; Creators could also use T2
+    students = {"C1": "Creator", "C2": "Creator", "I1": "Innovator", "I2": "Innovator"}
+    teachers = {"T1": (2, {"Creator", "Innovator"}, 0), "T2": (2, {"Creator"}, 0)}
+    assignments, unmet = pair_students(students, teachers)
+
+    assert unmet == []
+    assert assignments["I1"] == assignments["I2"] == "T1"
+    assert assignments["C1"] == assignments["C2"] == "T2"
+
+
+def test_plan_pairing_uses_stored_class_sizes(data_dir):
+    from services.roster import assign_teachers, pairing_setup, plan_pairing
+    from storage.user_store import save_users
+
+    save_users({
+        "Mr T": {"username": "t", "role": "Teacher"},
+        "Ms U": {"username": "u", "role": "Teacher"},
+        "Old": {"username": "old", "role": "Student", "stage": "Creator", "teacher": "Mr T"},
+        **{f"New {i}": {"username": f"n{i}", "role": "Student", "stage": "Creator"} for i in range(3)},
+    })
+    teachers, students, stages, current, capacity = pairing_setup()
+    assert (teachers, current, capacity) == (["Mr T", "Ms U"], {"Mr T": 1, "Ms U": 0}, 2)
+    assert stages[:3] == ["Adventurer", "Creator", "Innovator"]
+
+    assignments, unmet = plan_pairing(students, {"Mr T": (2, ["Creator"]), "Ms U": (2, ["Creator"])})
+    assert unmet == []
+    assert Counter(assignments.values()) == {"Mr T": 1, "Ms U": 2}
+    assert assign_teachers(assignments) == 3
+    assert pairing_setup()[1] == []
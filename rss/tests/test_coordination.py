@@ -0,0 +1,92 @@
+import json
+import multiprocessing
+import os
+import stat
+
+import pytest
+
+from storage import coordination
+from storage.coordination import atomic_write_json, file_lock, file_stamp
+
+needs_fork = pytest.mark.skipif(
+    coordination.fcntl is None or "fork" not in multiprocessing.get_all_start_methods(),
+    reason="cross-process locking needs fcntl and fork",
+)
+
+
+def _count_up(path, times):
+    for _ in range(times):
+        with file_lock(path):
+            with open(path) as f:
+                value = json.load(f)["count"]
+            atomic_write_json(path, {"count": value + 1})
+
+
+def _add_users(prefix, count):
+    from storage.user_store import update_users
+
+    for i in range(count):
+        update_users({f"{prefix} {i}": {"username": f"{prefix}{i}", "role": "Student"}})
+
+
+def _run_in_processes(target, args_list):
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=target, args=args) for args in args_list]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+    assert [process.exitcode for process in processes] == [0] * len(processes)
+
+
+@needs_fork
+def test_lock_serializes_read_modify_write_across_processes(tmp_path):
+    path = str(tmp_path / "counter.json")
+    atomic_write_json(path, {"count": 0})
+    _run_in_processes(_count_up, [(path, 50)] * 4)
+
+    with open(path) as f:
+        assert json.load(f) == {"count": 200}
+
+
+@needs_fork
+def test_user_writes_from_several_workers_are_all_kept(data_dir):
+    from storage.user_store import load_users, save_users
+
+    save_users({})
+    _run_in_processes(_add_users, [("A", 15), ("B", 15), ("C", 15)])
+
+    assert len(load_users()) == 45
+
+
+def test_lock_is_reentrant_in_one_thread(tmp_path):
+    path = str(tmp_path / "data.json")
+    with file_lock(path):
+        with file_lock(path):
+            atomic_write_json(path, [1])
+    with open(path) as f:
+        assert json.load(f) == [1]
+
+
+def test_atomic_write_keeps_permissions_and_leaves_no_temp_files(tmp_path):
+    path = str(tmp_path / "data.json")
+    atomic_write_json(path, {"a": 1})
+    os.chmod(path, 0o640)
+    before = file_stamp(path)
+    atomic_write_json(path, {"a": 2})
+
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+    assert file_stamp(path) != before
+    assert os.listdir(tmp_path) == ["data.json"]
+
+
+def test_failed_write_leaves_the_old_file(tmp_path):
+    path = str(tmp_path / "data.json")
+    atomic_write_json(path, {"a": 1})
+    with pytest.raises(TypeError):
+        atomic_write_json(path, {"a": object()})
+
+    with open(path) as f:
+        assert json.load(f) == {"a": 1}
+    assert os.listdir(tmp_path) == ["data.json"]
+    assert file_stamp(str(tmp_path / "missing.json")) is None
@@ -0,0 +1,63 @@
+import pytest
+
+from services import schedule
+from storage.user_store import save_users
+
+
+@pytest.fixture
+def timetable(data_dir, monkeypatch):
+    monkeypatch.setattr(schedule, "_index_cache", {"stamp": None, "index": None})
+    save_users({
+        "Mr T": {"username": "t", "role": "Teacher"},
+        "Ada": {"username": "ada", "role": "Student", "teacher": "Mr T"},
+        "Bob": {"username": "bob", "role": "Student", "teacher": "Mr T"},
+    })
+    first = schedule.add_timetable_slot("Ada", "Mr T", "Monday", "9:00 AM - 10:00 AM")
+    schedule.add_timetable_slot("Bob", "Mr T", "Monday", "10:00 AM - 11:00 AM")
+    return first
+
+
+def _bookings(teacher, day):
+    bookings = schedule.load_timetable_index().teachers[(teacher, day)]
+    return list(zip(bookings.starts, bookings.ends))
+
+
+def test_moving_a_slot_over_itself_is_not_a_clash(timetable):
+    moved = schedule.update_timetable_slot(timetable, time_slot="8:30 AM - 9:30 AM")
+
+    assert moved["time"] == "8:30 AM - 9:30 AM"
+    assert _bookings("Mr T", "Monday") == [(510, 570), (600, 660)]
+    assert schedule.free_at("Monday", 9 * 60 + 45) == (["Mr T"], ["Ada", "Bob"], 0)
+
+
+def test_a_rejected_move_leaves_the_index_alone(timetable):
+    with pytest.raises(schedule.ScheduleConflict):
+        schedule.update_timetable_slot(timetable, time_slot="10:30 AM - 11:30 AM")
+
+    assert _bookings("Mr T", "Monday") == [(540, 600), (600, 660)]
+    assert schedule.free_at("Monday", 9 * 60 + 30) == ([], ["Bob"], 0)
+
+
+def test_moving_a_deleted_slot_returns_none(timetable):
+    schedule.delete_timetable_slot(timetable)
+    assert schedule.update_timetable_slot(timetable, day="Friday") is None
+
+
+def test_build_availability_applies_overrides():
+    overrides = [
+        ("Mr T", "Monday", "9:00 AM - 10:00 AM"),
+        ("Mr T", "Monday", "2:00 PM - 3:00 PM"),
+        ("Ms U", "Tuesday", ""),
+        ("Ms U", "Wednesday", float("nan")),  # an empty editor cell
+    ]
+    availability = schedule.build_availability(["Mr T", "Ms U"], ["Monday", "Tuesday"], (960, 1140), overrides)
+
+    assert availability["Mr T"] == {"Monday": [(540, 600), (840, 900)], "Tuesday": [(960, 1140)]}
+    assert availability["Ms U"] == {"Monday": [(960, 1140)], "Tuesday": [], "Wednesday": []}
+
+
+def test_build_availability_rejects_bad_hours():
+    with pytest.raises(ValueError, match="end before they start"):
+        schedule.build_availability(["Mr T"], ["Monday"], (1140, 960))
+    with pytest.raises(ValueError, match="Mr T, Monday"):
+        schedule.build_availability(["Mr T"], ["Monday"], (960, 1140), [("Mr T", "Monday", "soon")])
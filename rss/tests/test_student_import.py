@@ -0,0 +1,69 @@
+import io
+
+import pytest
+
+from services.student_import import import_students, iter_rows, validate_rows
+from storage.user_store import find_full_names, load_users, save_users
+
+
+def _csv(text):
+    return io.BytesIO(text.encode("utf-8"))
+
+
+@pytest.fixture
+def school(data_dir):
+    save_users({
+        "Mr T": {"username": "teach", "role": "Teacher"},
+        "Old Pupil": {"username": "old", "role": "Student"},
+    })
+    return data_dir
+
+
+def test_iter_rows_maps_headers_and_skips_blank_lines():
+    rows = list(iter_rows(_csv("Name,User Name,Age\nAda A,ada,9\n,,\nBob B,bob,12\n"), "intake.csv"))
+    assert rows == [
+        (2, {"full_name": "Ada A", "username": "ada", "age": "9"}),
+        (4, {"full_name": "Bob B", "username": "bob", "age": "12"}),
+    ]
+
+
+def test_iter_rows_needs_the_required_columns():
+    with pytest.raises(ValueError, match="age"):
+        list(iter_rows(_csv("full_name,username\nAda A,ada\n"), "intake.csv"))
+
+
+def test_validate_rows_checks_each_row(school):
+    rows = iter_rows(_csv(
+        "full_name,username,age,teacher,password\n"
+        "ada lovelace,ada,9,mr t,secret\n"
+        "Old Pupil,other,9,,\n"
+        "Bob B,old,9,,\n"
+        "Cy C,ada,9,,\n"
+        "Di D,di,4,,\n"
+        "Ed E,ed,nine,,\n"
+        "Flo F,flo,15,Ms Nobody,\n"
+        "Gus G,gus,15,,\n"
+    ), "intake.csv")
+    records, errors, generated = validate_rows(rows)
+
+    assert list(records) == ["Ada Lovelace", "Gus G"]
+    assert records["Ada Lovelace"]["teacher"] == "Mr T"
+    assert records["Ada Lovelace"]["stage"] == "Creator"
+    assert records["Gus G"]["stage"] == "Innovator"
+    assert [(number, message) for number, _, message in errors] == [
+        (3, "full name already exists"),
+        (4, "username 'old' is already taken"),
+        (5, "username 'ada' is already taken"),
+        (6, "age must be a whole number from 5 to 18"),
+        (7, "age 'nine' is not a number"),
+        (8, "teacher 'Ms Nobody' not found"),
+    ]
+    assert [(name, username) for name, username, _ in generated] == [("Gus G", "gus")]
+
+
+def test_import_students_saves_in_one_go(school):
+    records, errors, _ = validate_rows(iter_rows(_csv("full_name,username,age\nAda A,ada,9\nBob B,bob,10\n"), "a.csv"))
+    assert errors == []
+    assert import_students(records) == 2
+    assert find_full_names("bob") == ["Bob B"]
+    assert list(load_users()) == ["Mr T", "Old Pupil", "Ada A", "Bob B"]
@@ -0,0 +1,44 @@
+import pytest
+
+from storage.timeslots import TimetableIndex, format_slot, parse_slot
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("4:30 PM - 6:00 PM", (990, 1080)),
+    ("16:30-18:00", (990, 1080)),
+    ("4pm to 6pm", (960, 1080)),
+    ("11 - 1 PM", (660, 780)),
+    ("22:00-24:00", (1320, 1440)),
+    ("10:00 PM - 12:00 AM", (1320, 1440)),
+    ("12:00 AM - 1:00 AM", (0, 60)),
+])
+def test_parse_slot(text, expected):
+    assert parse_slot(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "soon", "6 PM - 4 PM", "24:30-25:00", "13 PM - 2 PM"])
+def test_parse_slot_rejects(text):
+    with pytest.raises(ValueError):
+        parse_slot(text)
+
+
+@pytest.mark.parametrize("start, end", [(0, 60), (540, 600), (690, 750), (1320, 1440), (1380, 1440)])
+def test_format_slot_round_trip(start, end):
+    assert parse_slot(format_slot(start, end)) == (start, end)
+
+
+def test_subset_copies_only_the_bookings_involved():
+    index = TimetableIndex()
+    index.add("Ada", "Mr T", "Monday", 540, 600)
+    index.add("Bob", "Mr T", "Monday", 600, 660)
+    index.add("Ada", "Ms U", "Tuesday", 540, 600)
+
+    local = index.subset("Ada", "Mr T", "Monday")
+    local.remove("Ada", "Mr T", "Monday", 540, 600)
+
+    assert local.conflicts("Ada", "Mr T", "Monday", 570, 630) == [
+        "Mr T already teaches Bob on Monday at 10:00 AM - 11:00 AM"
+    ]
+    assert set(local.teachers) == {("Mr T", "Monday")}
+    assert len(index.teachers[("Mr T", "Monday")]) == 2
+    assert len(index.students[("Ada", "Monday")]) == 1
@@ -0,0 +1,33 @@
+from services.timetable_generator import GRID, _window_mask, generate
+
+
+def test_window_mask_rounds_availability_inward():
+    assert _window_mask([(0, 2 * GRID)]) == 0b11
+    assert _window_mask([(5, 2 * GRID + 5)]) == 0b10  # only 0:15-0:30 is wholly free
+    assert _window_mask([(5, GRID + 5)]) == 0  # no whole tick inside
+    assert _window_mask([(0, GRID), (2 * GRID, 3 * GRID)]) == 0b101
+
+
+def test_generate_keeps_sessions_inside_the_window():
+    slots, unmet = generate({"S": "T"}, {"T": {"Monday": [(970, 1025)]}}, {"S": (1, 60)})
+    assert slots == []
+    assert [(student, teacher) for student, teacher, _ in unmet] == [("S", "T")]
+
+    slots, unmet = generate({"S": "T"}, {"T": {"Monday": [(970, 1035)]}}, {"S": (1, 60)})
+    assert slots == [("S", "T", "Monday", "4:15 PM - 5:15 PM")]
+    assert unmet == []
+
+
+def test_generate_reports_non_positive_lengths():
+    availability = {"T": {"Monday": [(540, 720)]}}
+    for minutes in (0, -30):
+        slots, unmet = generate({"S": "T"}, availability, {"S": (1, minutes)})
+        assert slots == []
+        assert unmet == [("S", "T", "session length must be positive")]
+
+
+def test_generate_spreads_a_students_sessions_over_days():
+    availability = {"T": {day: [(540, 720)] for day in ("Monday", "Tuesday")}}
+    slots, unmet = generate({"S": "T"}, availability, {"S": (2, 60)})
+    assert unmet == []
+    assert sorted(day for _, _, day, _ in slots) == ["Monday", "Tuesday"]
@@ -0,0 +1,110 @@
+import sys
+import threading
+
+from storage import user_store
+from storage.user_store import (
+    delete_users, find_full_names, load_users, save_users, students_by_stage, students_of,
+    unassigned_students, update_users, users_with_role,
+)
+
+
+def _student(username, teacher=None, stage="Creator", password="x"):
+    return {"username": username, "password": password, "role": "Student", "stage": stage, "teacher": teacher}
+
+
+def _reloaded():
+    """The indexes as a fresh read of the file builds them."""
+    user_store._cache["stamp"] = None
+    load_users()
+    return {name: {key: list(members) for key, members in index.items()} for name, index in user_store._cache["indexes"].items()}
+
+
+def _patched():
+    return {name: {key: list(members) for key, members in index.items()} for name, index in user_store._cache["indexes"].items()}
+
+
+def test_shared_username_keeps_file_order_after_update(data_dir):
+    save_users({"Ada A": _student("kid"), "Bob B": _student("kid")})
+    update_users({"Ada A": load_users()["Ada A"].replace(password="new")})
+
+    assert find_full_names("kid") == ["Ada A", "Bob B"]
+    assert list(load_users()) == ["Ada A", "Bob B"]
+
+
+def test_moved_users_are_indexed_in_file_order(data_dir):
+    save_users({
+        "T One": {"username": "t1", "role": "Teacher"},
+        "S1": _student("s1"), "S2": _student("s2", teacher="T One"), "S3": _student("s3"),
+    })
+    update_users({"S3": _student("s3", teacher="T One"), "S1": _student("s1", teacher="T One", stage="Innovator")})
+    update_users({"S4": _student("s2")})
+
+    assert students_of("T One") == ["S1", "S2", "S3"]
+    assert find_full_names("s2") == ["S2", "S4"]
+    assert _patched() == _reloaded()
+
+
+def test_delete_users_updates_indexes(data_dir):
+    save_users({"T": {"username": "t", "role": "Teacher"}, "S1": _student("s1"), "S2": _student("s2", stage="Innovator")})
+    delete_users(["S2", "T", "missing"])
+
+    assert list(load_users()) == ["S1"]
+    assert users_with_role("Teacher") == []
+    assert unassigned_students() == ["S1"]
+    assert students_by_stage() == {"Creator": ["S1"]}
+    assert _patched() == _reloaded()
+
+
+def test_writes_leave_published_users_untouched(data_dir):
+    save_users({"S1": _student("s1")})
+    before, indexes = load_users(), user_store._cache["indexes"]
+    update_users({"S2": _student("s2")})
+    delete_users(["S1"])
+
+    assert list(before) == ["S1"]
+    assert find_full_names("s1") == []
+    assert list(indexes["username"]) == ["s1"]
+    assert list(load_users()) == ["S2"]
+
+
+def test_readers_can_iterate_while_users_are_added(data_dir):
+    save_users({f"S{i}": _student(f"s{i}") for i in range(2000)})
+    errors, done = [], threading.Event()
+
+    def read():
+        try:
+            while not done.is_set():
+                for _name, info in load_users().items():
+                    info.username
+        except RuntimeError as e:  # "dictionary changed size during iteration"
+            errors.append(e)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)  # switch threads as often as possible
+    readers = [threading.Thread(target=read) for _ in range(2)]
+    try:
+        for thread in readers:
+            thread.start()
+        for i in range(2000, 2050):
+            update_users({f"S{i}": _student(f"s{i}")})
+    finally:
+        done.set()
+        for thread in readers:
+            thread.join()
+        sys.setswitchinterval(interval)
+    assert errors == []
+    assert len(load_users()) == 2050
+
+
+def test_filter_users_by_role_stage_and_search(data_dir):
+    from services.accounts import filter_users
+
+    save_users({
+        "Mr T": {"username": "teach", "role": "Teacher"},
+        "Ada A": _student("ada"), "Bob B": _student("bobby", stage="Innovator"),
+    })
+    assert filter_users() == ["Mr T", "Ada A", "Bob B"]
+    assert filter_users(role="Student") == ["Ada A", "Bob B"]
+    assert filter_users(stage="Innovator") == ["Bob B"]
+    assert filter_users(search="BOB") == ["Bob B"]
+    assert filter_users(role="Student", search="teach") == []
@@ -0,0 +1,102 @@
+import threading
+import time
+
+import pytest
+
+from storage.write_coalescer import WriteCoalescer
+
+
+class Store:
+    """A flush target that records every batch and can be told to fail."""
+
+    def __init__(self, delay=0.0, fail_on=None):
+        self.batches = []
+        self.delay = delay
+        self.fail_on = fail_on
+        self.lock = threading.Lock()
+
+    def flush(self, batch):
+        time.sleep(self.delay)
+        if self.fail_on in batch:
+            raise OSError("disk full")
+        with self.lock:
+            self.batches.append(list(batch))
+
+    @property
+    def written(self):
+        return [item for batch in self.batches for item in batch]
+
+
+def _submit_all(coalescer, items):
+    """Submit every item from its own thread; returns {item: exception or None}."""
+    results = {}
+
+    def submit(item):
+        try:
+            coalescer.submit(item)
+        except OSError as e:
+            results[item] = e
+        else:
+            results[item] = None
+
+    threads = [threading.Thread(target=submit, args=(item,)) for item in items]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    return results
+
+
+def test_single_write_is_flushed_before_submit_returns():
+    store = Store()
+    coalescer = WriteCoalescer(store.flush, window=0)
+    coalescer.submit("a")
+    assert store.batches == [["a"]]
+    assert (coalescer.batches, coalescer.mutations) == (1, 1)
+
+
+def test_concurrent_writes_share_batches_and_are_written_once():
+    store = Store(delay=0.01)
+    coalescer = WriteCoalescer(store.flush, window=0.02)
+    seen_after_submit = {}
+
+    def submit(item):
+        coalescer.submit(item)
+        seen_after_submit[item] = item in store.written  # durable before submit returned
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(40)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert sorted(store.written) == list(range(40))
+    assert all(seen_after_submit.values()) and len(seen_after_submit) == 40
+    assert len(store.batches) < 40
+    assert coalescer.mutations == 40
+
+
+def test_a_failed_batch_raises_in_every_caller_of_that_batch():
+    store = Store(fail_on="bad")
+    coalescer = WriteCoalescer(store.flush, window=0.05)
+    results = _submit_all(coalescer, ["bad", "x", "y"])
+
+    # All three arrive inside one window, so they share the failing batch
+    assert store.batches == []
+    assert all(isinstance(results[item], OSError) for item in ("bad", "x", "y"))
+
+    coalescer.submit("after")  # the coalescer keeps working
+    assert store.batches == [["after"]]
+
+
+def test_failures_do_not_leak_into_later_batches():
+    store = Store(delay=0.02, fail_on="bad")
+    coalescer = WriteCoalescer(store.flush, window=0)
+    first = threading.Thread(target=lambda: pytest.raises(OSError, coalescer.submit, "bad"))
+    first.start()
+    time.sleep(0.005)  # "bad" is being flushed; these queue for the next batch
+    results = _submit_all(coalescer, ["p", "q"])
+    first.join(timeout=10)
+
+    assert results == {"p": None, "q": None}
+    assert sorted(store.written) == ["p", "q"]
@@ -1,12 +1,6 @@
 import sys
 sys.path.append(r'C:\Users\user\Documents\python')
 from users.user import User
-from operations.assessment import assessment_summary
-from operations.attendance import attendance_summary
-from operations.manage_users import manage_users
-from operations.schedule import add_timetable_entry,view_all_schedules
-from operations.pairing import assign_teacher
-from operations.system_report import system_report
 
 class Admin(User):
     def __init__(self, username, name):
@@ -17,27 +11,51 @@ class Admin(User):
         return [
             "Profile",
             "Manage Users",
+            "Import Students",
             "Pair Teacher-Students",
             "Create Schedules",
+            "Generate Timetable",
             "View All Schedules",
             "Assessment Summary",
             "Attendance Summary",
             "System Report",
+            "Export Data",
+            "Performance",
             "Logout"
         ]
 
     def action(self, choice):
+        # Operations (and pandas) are imported on first use, not at login
         if choice == "Manage Users":
+            from operations.manage_users import manage_users
             manage_users()
+        elif choice == "Import Students":
+            from operations.student_import import student_import
+            student_import()
         elif choice == "Pair Teacher-Students":
+            from operations.pairing import assign_teacher
             assign_teacher()
         elif choice == "Create Schedules":
+            from operations.schedule import add_timetable_entry
             add_timetable_entry()
+        elif choice == "Generate Timetable":
+            from operations.schedule import generate_timetable
+            generate_timetable()
         elif choice == "View All Schedules":
+            from operations.schedule import view_all_schedules
             view_all_schedules()    
         elif choice == "Assessment Summary":
+            from operations.assessment import assessment_summary
             assessment_summary()
         elif choice == "Attendance Summary":
+            from operations.attendance import attendance_summary
             attendance_summary()
         elif choice == "System Report":
+            from operations.system_report import system_report
             system_report()
+        elif choice == "Export Data":
+            from operations.export import export_data
+            export_data()
+        elif choice == "Performance":
+            from operations.performance import performance
+            performance()
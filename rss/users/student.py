@@ -1,10 +1,6 @@
 import sys
 sys.path.append(r'C:\Users\user\Documents\python')
 from users.user import User
-from operations.attendance import view_my_attendance
-from operations.schedule import view_student_timetable
-from operations.pairing import assigned_teacher
-from operations.assessment import view_my_assessments
 import streamlit as st
 
 
@@ -25,14 +21,19 @@ class Student(User):
         ]
 
     def action(self, choice):
+        # Operations (and pandas) are imported on first use, not at login
         if choice == "My Teacher":
+            from operations.pairing import assigned_teacher
             assigned_teacher(self.name)
 
         elif choice == "View Time Table":
+            from operations.schedule import view_student_timetable
             view_student_timetable(self.name)   # ✅ full name is key in timetable
 
         elif choice == "View My Attendance":
+            from operations.attendance import view_my_attendance
             view_my_attendance(self.name)      # ✅ full name is key in attendance
 
         elif choice == "View My Assessment":
+            from operations.assessment import view_my_assessments
             view_my_assessments(self.name)  # ✅ username + full name
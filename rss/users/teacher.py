@@ -1,16 +1,14 @@
 import streamlit as st
 from users.user import User
-from operations.assessment import record_assessment, view_assessments
-from operations.attendance import view_attendance, record_attendance
-from operations.schedule import view_teacher_schedule
-from operations.pairing import assigned_students, load_users   # ✅ make sure this points to your user utils
+from storage.user_records import Role
+from storage.user_store import load_users, find_full_names
 
 
 def get_fullname_from_username(username):
     """Return the FULL NAME of a teacher given their username."""
     users = load_users()
-    for fullname, info in users.items():
-        if info.get("username") == username and info.get("role", "").lower() == "teacher":
+    for fullname in find_full_names(username):
+        if users[fullname].role is Role.TEACHER:
             return fullname
     return username  # fallback if not found
 
@@ -33,15 +31,22 @@ class Teacher(User):
         ]
 
     def action(self, choice):
+        # Operations (and pandas) are imported on first use, not at login
         if choice == "View Schedule":
+            from operations.schedule import view_teacher_schedule
             view_teacher_schedule(self.name)   # ✅ full name like "Okenla Qahar"
         elif choice == "My Students":    
+            from operations.pairing import assigned_students
             assigned_students(self.name)       # ✅ full name
         elif choice == "Record Assessment":
+            from operations.assessment import record_assessment
             record_assessment(self.name)
         elif choice == "View Assessment":
+            from operations.assessment import view_assessments
             view_assessments()
         elif choice == "Record Attendance":
+            from operations.attendance import record_attendance
             record_attendance(self.name)       # ✅ matches student["teacher"]
         elif choice == "View Attendance":
+            from operations.attendance import view_attendance
             view_attendance()